@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from logging import getLogger
 
 from fastapi import FastAPI
@@ -5,8 +7,12 @@ from uvicorn import run
 
 from web.config import DefaultSettings
 from web.config.utils import get_settings
+from web.db.connection import SessionManager
 from web.endpoints import list_of_routes
+from web.tasks.worker_pool import get_worker_pools
+from web.utils.events import get_event_broker
 from web.utils.common import get_hostname
+from web.utils.response_cache import get_summary_response_cache
 
 
 logger = getLogger(__name__)
@@ -20,6 +26,27 @@ def bind_routes(application: FastAPI, setting: DefaultSettings) -> None:
         application.include_router(route, prefix=setting.PATH_PREFIX)
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    Start the worker pools with the application and stop them gracefully on shutdown.
+    """
+    session_manager = SessionManager()
+    await session_manager.wait_ready()
+    await get_event_broker().start()
+    worker_pools = get_worker_pools().values()
+    for worker_pool in worker_pools:
+        worker_pool.start()
+    yield
+    timeout = application.state.settings.WORKER_SHUTDOWN_TIMEOUT
+    await asyncio.gather(
+        *(asyncio.to_thread(pool.shutdown, timeout) for pool in worker_pools)
+    )
+    await get_event_broker().stop()
+    await get_summary_response_cache().close()
+    await session_manager.dispose()
+
+
 def get_app() -> FastAPI:
     """
     Creates application and all dependable objects.
@@ -32,6 +59,7 @@ def get_app() -> FastAPI:
         docs_url="/swagger",
         openapi_url="/openapi",
         version="1.0.0",
+        lifespan=lifespan,
     )
     settings = get_settings()
     bind_routes(application, settings)
@@ -21,10 +21,127 @@ class DefaultSettings(BaseSettings):
     POSTGRES_USER: str = environ.get("POSTGRES_USER", "user")
     POSTGRES_PORT: int = int(environ.get("POSTGRES_PORT", "5432")[-4:])
     POSTGRES_PASSWORD: str = environ.get("POSTGRES_PASSWORD", "hackme")
-    DB_CONNECT_RETRY: int = environ.get("DB_CONNECT_RETRY", 20)
-    DB_POOL_SIZE: int = environ.get("DB_POOL_SIZE", 15)
+    DB_CONNECT_RETRY: int = int(environ.get("DB_CONNECT_RETRY", 20))
+    DB_CONNECT_TIMEOUT: float = float(environ.get("DB_CONNECT_TIMEOUT", 10))
+    DB_POOL_SIZE: int = int(environ.get("DB_POOL_SIZE", 15))
+    DB_MAX_OVERFLOW: int = int(environ.get("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT: float = float(environ.get("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(environ.get("DB_POOL_RECYCLE", 1800))
+    DB_STATEMENT_TIMEOUT_MS: int = int(environ.get("DB_STATEMENT_TIMEOUT_MS", 30000))
+    BULK_COPY_MIN_ROWS: int = int(environ.get("BULK_COPY_MIN_ROWS", 200))
+    DB_ECHO: bool = environ.get("DB_ECHO", "false").lower() == "true"
 
     GROQ_API_KEY: str = environ.get("GROQ_API_KEY", "")
+    GROQ_BASE_URL: str = environ.get("GROQ_BASE_URL", "")
+    SUMMARY_MODEL: str = environ.get("SUMMARY_MODEL", "gemma2-9b-it")
+    SUMMARY_POLICY: str = environ.get("SUMMARY_POLICY", "root")  # root, levels, all
+    SUMMARY_MAX_LEVEL: int = int(environ.get("SUMMARY_MAX_LEVEL", 0))
+    SUMMARY_CONCURRENCY: int = int(environ.get("SUMMARY_CONCURRENCY", 4))
+    SUMMARY_CHUNK_TOKENS: int = int(environ.get("SUMMARY_CHUNK_TOKENS", 6000))
+    SUMMARY_REQUESTS_PER_MINUTE: float = float(
+        environ.get("SUMMARY_REQUESTS_PER_MINUTE", 30)
+    )
+    SUMMARY_TOKENS_PER_MINUTE: float = float(
+        environ.get("SUMMARY_TOKENS_PER_MINUTE", 15000)
+    )
+    SUMMARY_TIMEOUT: float = float(environ.get("SUMMARY_TIMEOUT", 60))
+    SUMMARY_MAX_RETRIES: int = int(environ.get("SUMMARY_MAX_RETRIES", 5))
+    SUMMARY_RETRY_BACKOFF: float = float(environ.get("SUMMARY_RETRY_BACKOFF", 1))
+    SUMMARY_RETRY_BACKOFF_MAX: float = float(
+        environ.get("SUMMARY_RETRY_BACKOFF_MAX", 60)
+    )
+    CONTENT_COMPRESSION_LEVEL: int = int(environ.get("CONTENT_COMPRESSION_LEVEL", 6))
+    CONTENT_ZSTD_DICTIONARY: str = environ.get("CONTENT_ZSTD_DICTIONARY", "")
+    CONTENT_ZSTD_DICTIONARY_DIR: str = environ.get("CONTENT_ZSTD_DICTIONARY_DIR", "")
+
+    SUMMARY_RESPONSE_CACHE_SIZE: int = int(
+        environ.get("SUMMARY_RESPONSE_CACHE_SIZE", 10000)
+    )
+    SUMMARY_RESPONSE_CACHE_TTL: float = float(
+        environ.get("SUMMARY_RESPONSE_CACHE_TTL", 3600)
+    )
+    # Memory tier TTL when the Redis tier is shared by replicas
+    SUMMARY_RESPONSE_MEMORY_TTL: float = float(
+        environ.get("SUMMARY_RESPONSE_MEMORY_TTL", 5)
+    )
+    SUMMARY_MAX_AGE: int = int(environ.get("SUMMARY_MAX_AGE", 60))
+    REDIS_URL: str = environ.get("REDIS_URL", "")
+
+    SUMMARY_CACHE_SIZE: int = int(environ.get("SUMMARY_CACHE_SIZE", 1024))
+    SUMMARY_CACHE_TTL: float = float(environ.get("SUMMARY_CACHE_TTL", 30 * 24 * 3600))
+    SUMMARY_CACHE_PURGE_INTERVAL: float = float(
+        environ.get("SUMMARY_CACHE_PURGE_INTERVAL", 3600)
+    )
+
+    WIKI_FETCH_CONCURRENCY: int = int(environ.get("WIKI_FETCH_CONCURRENCY", 10))
+    WIKI_RATE_LIMIT_PER_HOST: float = float(
+        environ.get("WIKI_RATE_LIMIT_PER_HOST", 20)
+    )
+
+    CRAWL_MAX_DEPTH: int = int(environ.get("CRAWL_MAX_DEPTH", 5))
+    CRAWL_MAX_LINKS: int = int(environ.get("CRAWL_MAX_LINKS", 5))
+    CRAWL_CONCURRENCY: int = int(environ.get("CRAWL_CONCURRENCY", 10))
+    CRAWL_SOURCE: str = environ.get("CRAWL_SOURCE", "api")  # api, dump
+    CANONICAL_CACHE_SIZE: int = int(environ.get("CANONICAL_CACHE_SIZE", 100000))
+    CANONICAL_CACHE_TTL: float = float(environ.get("CANONICAL_CACHE_TTL", 24 * 3600))
+
+    DUMP_BATCH_SIZE: int = int(environ.get("DUMP_BATCH_SIZE", 500))
+    DUMP_PROCESSES: int = int(environ.get("DUMP_PROCESSES", 0))  # 0: cpu count
+
+    WORKER_COUNT: int = int(environ.get("WORKER_COUNT", 4))
+    SUMMARY_WORKER_COUNT: int = int(environ.get("SUMMARY_WORKER_COUNT", 2))
+    WORKER_SHUTDOWN_TIMEOUT: float = float(environ.get("WORKER_SHUTDOWN_TIMEOUT", 30))
+    WORKER_POLL_INTERVAL: float = float(environ.get("WORKER_POLL_INTERVAL", 1))
+
+    SEARCH_MAX_CHARS: int = int(environ.get("SEARCH_MAX_CHARS", 20000))
+    SEARCH_HEADLINE_CHARS: int = int(environ.get("SEARCH_HEADLINE_CHARS", 5000))
+    SEARCH_PAGE_SIZE: int = int(environ.get("SEARCH_PAGE_SIZE", 20))
+    SEARCH_PAGE_SIZE_MAX: int = int(environ.get("SEARCH_PAGE_SIZE_MAX", 100))
+
+    # Comma separated: prominence, popularity; order keeps the page order
+    LINK_SCORERS: str = environ.get("LINK_SCORERS", "prominence,popularity")
+    LINK_LEAD_WEIGHT: float = float(environ.get("LINK_LEAD_WEIGHT", 2))
+    LINK_FREQUENCY_WEIGHT: float = float(environ.get("LINK_FREQUENCY_WEIGHT", 1))
+    LINK_POPULARITY_WEIGHT: float = float(environ.get("LINK_POPULARITY_WEIGHT", 0.5))
+    LINK_TEXT_CHARS: int = int(environ.get("LINK_TEXT_CHARS", 20000))
+    LINK_POPULARITY_CAP: int = int(environ.get("LINK_POPULARITY_CAP", 1000))
+    LINK_POPULARITY_CACHE_SIZE: int = int(
+        environ.get("LINK_POPULARITY_CACHE_SIZE", 100000)
+    )
+    LINK_POPULARITY_CACHE_TTL: float = float(
+        environ.get("LINK_POPULARITY_CACHE_TTL", 3600)
+    )
+
+    GRAPH_CHECK_INTERVAL: float = float(environ.get("GRAPH_CHECK_INTERVAL", 30))
+    GRAPH_PAGERANK_DAMPING: float = float(environ.get("GRAPH_PAGERANK_DAMPING", 0.85))
+    GRAPH_PAGERANK_TOLERANCE: float = float(
+        environ.get("GRAPH_PAGERANK_TOLERANCE", 1e-6)
+    )
+    GRAPH_PAGERANK_MAX_ITERATIONS: int = int(
+        environ.get("GRAPH_PAGERANK_MAX_ITERATIONS", 100)
+    )
+
+    TREE_PAGE_SIZE: int = int(environ.get("TREE_PAGE_SIZE", 1000))
+    TREE_PAGE_SIZE_MAX: int = int(environ.get("TREE_PAGE_SIZE_MAX", 10000))
+    TREE_QUERY: str = environ.get("TREE_QUERY", "cte")  # cte, path
+
+    EVENTS_BACKEND: str = environ.get("EVENTS_BACKEND", "memory")  # memory, postgres
+    EVENTS_QUEUE_SIZE: int = int(environ.get("EVENTS_QUEUE_SIZE", 1000))
+    EVENTS_KEEPALIVE: float = float(environ.get("EVENTS_KEEPALIVE", 15))
+    EVENTS_LISTEN_CHECK_INTERVAL: float = float(
+        environ.get("EVENTS_LISTEN_CHECK_INTERVAL", 10)
+    )
+    EVENTS_RECONNECT_MAX: float = float(environ.get("EVENTS_RECONNECT_MAX", 30))
+
+    PARSE_BATCH_MAX_URLS: int = int(environ.get("PARSE_BATCH_MAX_URLS", 10000))
+    PARSE_BATCH_PROGRESS_INTERVAL: float = float(
+        environ.get("PARSE_BATCH_PROGRESS_INTERVAL", 2)
+    )
+
+    TASK_MAX_ATTEMPTS: int = int(environ.get("TASK_MAX_ATTEMPTS", 5))
+    TASK_LEASE_SECONDS: float = float(environ.get("TASK_LEASE_SECONDS", 60))
+    TASK_RETRY_BACKOFF: float = float(environ.get("TASK_RETRY_BACKOFF", 10))
+    TASK_RETRY_BACKOFF_MAX: float = float(environ.get("TASK_RETRY_BACKOFF_MAX", 600))
 
     @property
     def database_settings(self) -> dict:
@@ -0,0 +1,57 @@
+"""unique article links
+
+Revision ID: 157735dde7af
+Revises: d7a30db39ba5
+Create Date: 2026-10-18 17:54:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "157735dde7af"
+down_revision: Union[str, Sequence[str], None] = "d7a30db39ba5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Links stored twice before the constraint existed, one row is kept
+    op.execute(
+        "DELETE FROM article_links AS link USING article_links AS kept "
+        "WHERE link.source_article_id = kept.source_article_id "
+        "AND link.target_url = kept.target_url AND link.ctid > kept.ctid"
+    )
+    op.create_unique_constraint(
+        op.f("uq__article_links__source_article_id_target_url"),
+        "article_links",
+        ["source_article_id", "target_url"],
+    )
+    op.alter_column(
+        "articles",
+        "status",
+        comment="pending, processing, completed, failed, imported",
+        existing_comment="pending, processing, completed, failed",
+        existing_type=sa.TEXT(),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "articles",
+        "status",
+        comment="pending, processing, completed, failed",
+        existing_comment="pending, processing, completed, failed, imported",
+        existing_type=sa.TEXT(),
+        existing_nullable=True,
+    )
+    op.drop_constraint(
+        op.f("uq__article_links__source_article_id_target_url"),
+        "article_links",
+        type_="unique",
+    )
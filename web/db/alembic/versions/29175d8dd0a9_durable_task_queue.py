@@ -0,0 +1,67 @@
+"""durable task queue
+
+Revision ID: 29175d8dd0a9
+Revises: 5a4b0340146a
+Create Date: 2026-10-18 17:43:24.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "29175d8dd0a9"
+down_revision: Union[str, Sequence[str], None] = "5a4b0340146a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "payload",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("attempts", sa.INTEGER(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("max_attempts", sa.INTEGER(), server_default="5", nullable=False),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "run_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column("tasks", sa.Column("locked_by", sa.TEXT(), nullable=True))
+    op.add_column(
+        "tasks",
+        sa.Column("lease_expires_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix__tasks__status_run_at", "tasks", ["status", "run_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__tasks__status_run_at", table_name="tasks")
+    op.drop_column("tasks", "lease_expires_at")
+    op.drop_column("tasks", "locked_by")
+    op.drop_column("tasks", "run_at")
+    op.drop_column("tasks", "max_attempts")
+    op.drop_column("tasks", "attempts")
+    op.drop_column("tasks", "payload")
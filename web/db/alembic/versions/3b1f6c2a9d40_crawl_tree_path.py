@@ -0,0 +1,41 @@
+"""crawl tree path
+
+Keeps the id of the former initial schema, which ended with these changes,
+so databases created from it stay on the chain. `path` of existing articles
+is filled by `python -m web.db.repositories.tree`.
+
+Revision ID: 3b1f6c2a9d40
+Revises: 66a0b50db392
+Create Date: 2026-10-18 18:05:19.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3b1f6c2a9d40"
+down_revision: Union[str, Sequence[str], None] = "66a0b50db392"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "articles",
+        sa.Column("path", postgresql.ARRAY(sa.UUID(as_uuid=True)), nullable=True),
+    )
+    op.create_index(
+        op.f("ix__articles__parent_id"), "articles", ["parent_id"], unique=False
+    )
+    op.create_index("ix__articles__path", "articles", ["path"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__articles__path", table_name="articles")
+    op.drop_index(op.f("ix__articles__parent_id"), table_name="articles")
+    op.drop_column("articles", "path")
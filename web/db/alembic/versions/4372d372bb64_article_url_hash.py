@@ -0,0 +1,39 @@
+"""article url hash
+
+Revision ID: 4372d372bb64
+Revises: 45fd2b7c4015
+Create Date: 2026-10-18 18:00:51.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4372d372bb64"
+down_revision: Union[str, Sequence[str], None] = "45fd2b7c4015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "articles",
+        sa.Column(
+            "url_hash",
+            sa.BIGINT(),
+            sa.Computed("hashtextextended(url, 0)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        op.f("ix__articles__url_hash"), "articles", ["url_hash"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix__articles__url_hash"), table_name="articles")
+    op.drop_column("articles", "url_hash")
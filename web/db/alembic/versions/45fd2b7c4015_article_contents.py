@@ -0,0 +1,118 @@
+"""compressed article contents
+
+Bodies move from articles.content to article_contents. They are compressed
+here with plain zstd, or zlib without the zstd extra, both of which every
+ContentCodec reads.
+
+Revision ID: 45fd2b7c4015
+Revises: 157735dde7af
+Create Date: 2026-10-18 17:56:55.000000
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from web.config.utils import get_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = "45fd2b7c4015"
+down_revision: Union[str, Sequence[str], None] = "157735dde7af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_contents",
+        sa.Column("article_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("codec", sa.TEXT(), nullable=False, comment="zstd, zstd-dict, zlib"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("raw_size", sa.INTEGER(), nullable=False),
+        sa.Column("stored_size", sa.INTEGER(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk__article_contents__article_id__articles"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("article_id", name=op.f("pk__article_contents")),
+    )
+
+    level = get_settings().CONTENT_COMPRESSION_LEVEL
+    if zstandard is not None:
+        codec, compress = "zstd", zstandard.ZstdCompressor(level=level).compress
+    else:
+        codec, compress = "zlib", lambda data: zlib.compress(data, min(level, 9))
+
+    connection = op.get_bind()
+    select_batch = sa.text(
+        "SELECT id, content FROM articles WHERE id > :after ORDER BY id LIMIT :limit"
+    )
+    insert_contents = sa.text(
+        "INSERT INTO article_contents "
+        "(article_id, codec, data, raw_size, stored_size) "
+        "VALUES (:article_id, :codec, :data, :raw_size, :stored_size)"
+    )
+    after, moved = "00000000-0000-0000-0000-000000000000", 0
+    while True:
+        rows = connection.execute(
+            select_batch, {"after": after, "limit": BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        contents = []
+        for article_id, content in rows:
+            raw = content.encode("utf-8")
+            data = compress(raw)
+            contents.append(
+                {
+                    "article_id": article_id,
+                    "codec": codec,
+                    "data": data,
+                    "raw_size": len(raw),
+                    "stored_size": len(data),
+                }
+            )
+        connection.execute(insert_contents, contents)
+        after, moved = rows[-1][0], moved + len(rows)
+    print(f"Moved the content of {moved} articles to article_contents ({codec})")
+
+    op.drop_column("articles", "content")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from web.utils.compression import get_codec
+
+    op.add_column("articles", sa.Column("content", sa.TEXT(), nullable=True))
+    codec = get_codec()
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT article_id, codec, data FROM article_contents")
+    )
+    update_content = sa.text("UPDATE articles SET content = :content WHERE id = :id")
+    for article_id, name, data in rows.all():
+        connection.execute(
+            update_content, {"id": article_id, "content": codec.decompress(name, data)}
+        )
+    op.execute("UPDATE articles SET content = '' WHERE content IS NULL")
+    op.alter_column("articles", "content", nullable=False)
+    op.drop_table("article_contents")
@@ -0,0 +1,178 @@
+"""baseline
+
+The tables as the models created them before the history was kept in
+migrations. A database created then is brought on the chain with
+`alembic stamp 5a4b0340146a` and upgraded from there.
+
+Revision ID: 5a4b0340146a
+Revises:
+Create Date: 2026-10-18 17:26:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5a4b0340146a"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "articles",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("url", sa.TEXT(), nullable=False),
+        sa.Column("title", sa.TEXT(), nullable=False),
+        sa.Column("content", sa.TEXT(), nullable=False),
+        sa.Column(
+            "status",
+            sa.TEXT(),
+            nullable=True,
+            comment="pending, processing, completed, failed",
+        ),
+        sa.Column("level", sa.INTEGER(), nullable=True, comment="Level of the article"),
+        sa.Column("parent_id", sa.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["parent_id"],
+            ["articles.id"],
+            name=op.f("fk__articles__parent_id__articles"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk__articles")),
+        sa.UniqueConstraint("id", name=op.f("uq__articles__id")),
+    )
+    op.create_index(op.f("ix__articles__url"), "articles", ["url"], unique=True)
+
+    op.create_table(
+        "article_summaries",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("article_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("text", sa.TEXT(), nullable=False, comment="Summary of the article"),
+        sa.Column("model_used", sa.TEXT(), nullable=False, comment="deepseek, chatgpt"),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk__article_summaries__article_id__articles"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk__article_summaries")),
+        sa.UniqueConstraint(
+            "article_id", name=op.f("uq__article_summaries__article_id")
+        ),
+        sa.UniqueConstraint("id", name=op.f("uq__article_summaries__id")),
+    )
+
+    op.create_table(
+        "article_links",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("source_article_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("target_url", sa.TEXT(), nullable=False),
+        sa.Column("target_title", sa.TEXT(), nullable=True),
+        sa.Column("link_text", sa.TEXT(), nullable=True),
+        sa.Column("is_parsed", sa.BOOLEAN(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["source_article_id"],
+            ["articles.id"],
+            name=op.f("fk__article_links__source_article_id__articles"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk__article_links")),
+        sa.UniqueConstraint("id", name=op.f("uq__article_links__id")),
+    )
+
+    op.create_table(
+        "tasks",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.TEXT(), nullable=False),
+        sa.Column(
+            "task_type",
+            sa.TEXT(),
+            nullable=False,
+            comment="parse, generate_summary",
+        ),
+        sa.Column("article_id", sa.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "status",
+            sa.TEXT(),
+            nullable=True,
+            comment="pending, running, completed, failed",
+        ),
+        sa.Column("result", sa.TEXT(), nullable=True),
+        sa.Column("error", sa.TEXT(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk__tasks__article_id__articles"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk__tasks")),
+        sa.UniqueConstraint("id", name=op.f("uq__tasks__id")),
+    )
+    op.create_index(op.f("ix__tasks__task_id"), "tasks", ["task_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix__tasks__task_id"), table_name="tasks")
+    op.drop_table("tasks")
+    op.drop_table("article_links")
+    op.drop_table("article_summaries")
+    op.drop_index(op.f("ix__articles__url"), table_name="articles")
+    op.drop_table("articles")
@@ -0,0 +1,29 @@
+"""task groups
+
+Revision ID: 66a0b50db392
+Revises: 4372d372bb64
+Create Date: 2026-10-18 18:02:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "66a0b50db392"
+down_revision: Union[str, Sequence[str], None] = "4372d372bb64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tasks", sa.Column("group_id", sa.TEXT(), nullable=True))
+    op.create_index("ix__tasks__group_id", "tasks", ["group_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__tasks__group_id", table_name="tasks")
+    op.drop_column("tasks", "group_id")
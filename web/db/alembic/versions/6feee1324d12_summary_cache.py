@@ -0,0 +1,48 @@
+"""summary cache
+
+Revision ID: 6feee1324d12
+Revises: 29175d8dd0a9
+Create Date: 2026-10-18 17:46:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6feee1324d12"
+down_revision: Union[str, Sequence[str], None] = "29175d8dd0a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "summary_cache",
+        sa.Column("key", sa.TEXT(), nullable=False),
+        sa.Column("model_used", sa.TEXT(), nullable=False),
+        sa.Column("text", sa.TEXT(), nullable=False),
+        sa.Column("hits", sa.INTEGER(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("last_hit_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk__summary_cache")),
+    )
+    op.create_index(
+        op.f("ix__summary_cache__created_at"),
+        "summary_cache",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix__summary_cache__created_at"), table_name="summary_cache")
+    op.drop_table("summary_cache")
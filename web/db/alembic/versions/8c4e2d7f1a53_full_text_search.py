@@ -0,0 +1,81 @@
+"""full-text search
+
+Revision ID: 8c4e2d7f1a53
+Revises: 3b1f6c2a9d40
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2d7f1a53"
+down_revision: Union[str, Sequence[str], None] = "3b1f6c2a9d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "articles",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "article_summaries",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("setweight(to_tsvector('english', text), 'B')", persisted=True),
+            nullable=True,
+        ),
+    )
+    # Bodies are compressed: the vector is written by the application, see
+    # save_contents. Existing bodies are indexed when they are saved again
+    op.add_column(
+        "article_contents",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+
+    op.create_index(
+        "ix__articles__search_vector",
+        "articles",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix__article_summaries__search_vector",
+        "article_summaries",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix__article_contents__search_vector",
+        "article_contents",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__article_contents__search_vector", table_name="article_contents")
+    op.drop_index(
+        "ix__article_summaries__search_vector", table_name="article_summaries"
+    )
+    op.drop_index("ix__articles__search_vector", table_name="articles")
+    op.drop_column("article_contents", "search_vector")
+    op.drop_column("article_summaries", "search_vector")
+    op.drop_column("articles", "search_vector")
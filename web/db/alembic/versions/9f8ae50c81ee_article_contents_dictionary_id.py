@@ -0,0 +1,62 @@
+"""article_contents dictionary id
+
+zstd-dict rows name their dictionary, read back from the frame headers of
+the rows stored before.
+
+Revision ID: 9f8ae50c81ee
+Revises: d5a7e3b9c162
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f8ae50c81ee"
+down_revision: Union[str, Sequence[str], None] = "d5a7e3b9c162"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "article_contents",
+        sa.Column("dictionary_id", sa.BIGINT(), nullable=True),
+    )
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT article_id, substring(data from 1 for 18) FROM article_contents "
+            "WHERE codec = 'zstd-dict'"
+        )
+    ).all()
+    if rows and zstandard is None:
+        raise RuntimeError(
+            "Reading the dictionary ids of zstd-dict rows needs zstandard"
+        )
+    for article_id, header in rows:
+        connection.execute(
+            sa.text(
+                "UPDATE article_contents SET dictionary_id = :dictionary_id "
+                "WHERE article_id = :article_id"
+            ),
+            {
+                "article_id": article_id,
+                "dictionary_id": zstandard.get_frame_parameters(header).dict_id,
+            },
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("article_contents", "dictionary_id")
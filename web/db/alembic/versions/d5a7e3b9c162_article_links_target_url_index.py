@@ -0,0 +1,29 @@
+"""article_links target_url index
+
+Revision ID: d5a7e3b9c162
+Revises: 8c4e2d7f1a53
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a7e3b9c162"
+down_revision: Union[str, Sequence[str], None] = "8c4e2d7f1a53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix__article_links__target_url", "article_links", ["target_url"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix__article_links__target_url", table_name="article_links")
@@ -0,0 +1,32 @@
+"""article revision ids
+
+Revision ID: d7a30db39ba5
+Revises: 6feee1324d12
+Create Date: 2026-10-18 17:50:18.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a30db39ba5"
+down_revision: Union[str, Sequence[str], None] = "6feee1324d12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("articles", sa.Column("revision_id", sa.BIGINT(), nullable=True))
+    op.add_column(
+        "articles",
+        sa.Column("last_modified", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("articles", "last_modified")
+    op.drop_column("articles", "revision_id")
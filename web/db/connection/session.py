@@ -1,30 +1,161 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 
 from web.config import get_settings
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that measures how long callers wait for a connection.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    def stats(self) -> dict:
+        capacity = self.size() + self._max_overflow
+        checked_out = self.checkedout()
+        wait_avg = self.checkout_wait_total / self.checkouts if self.checkouts else 0.0
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "idle": self.checkedin(),
+            "saturation": round(checked_out / capacity, 4) if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_avg_ms": round(1000 * wait_avg, 3),
+            "checkout_wait_max_ms": round(1000 * self.checkout_wait_max, 3),
+        }
+
+
 class SessionManager:
     """
     A class that implements the necessary functionality for working with the database:
     issuing sessions, storing and updating connection settings.
+
+    asyncpg connections are bound to the event loop that opened them, so one
+    engine and one sessionmaker are built per event loop (the API loop and every
+    worker loop) and reused for the lifetime of that loop.
     """
 
     def __init__(self) -> None:
-        self.refresh()
+        if not hasattr(self, "_engines"):
+            self._lock = threading.Lock()
+            self.refresh()
 
     def __new__(cls):
         if not hasattr(cls, "instance"):
             cls.instance = super(SessionManager, cls).__new__(cls)
         return cls.instance  # noqa
 
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _get(self) -> Tuple[AsyncEngine, sessionmaker]:
+        loop = self._current_loop()
+        with self._lock:
+            cached = self._engines.get(loop) if loop else self._default
+            if cached is None:
+                engine = self._create_engine()
+                cached = (
+                    engine,
+                    sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+                )
+                if loop:
+                    self._engines[loop] = cached
+                else:
+                    self._default = cached
+            return cached
+
+    @staticmethod
+    def _create_engine() -> AsyncEngine:
+        settings = get_settings()
+        return create_async_engine(
+            settings.database_uri,
+            echo=settings.DB_ECHO,
+            future=True,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            connect_args={
+                "timeout": settings.DB_CONNECT_TIMEOUT,
+                "server_settings": {
+                    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                },
+            },
+        )
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._get()[0]
+
     def get_session_maker(self) -> sessionmaker:
-        return sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        return self._get()[1]
 
     def refresh(self) -> None:
-        self.engine = create_async_engine(
-            get_settings().database_uri, echo=True, future=True
-        )
+        """Forget cached engines; new ones are built on the next use"""
+        self._engines: Dict[asyncio.AbstractEventLoop, Tuple] = WeakKeyDictionary()
+        self._default: Optional[Tuple[AsyncEngine, sessionmaker]] = None
+
+    async def wait_ready(self) -> None:
+        """Wait for the database, trying DB_CONNECT_RETRY times"""
+        retries = get_settings().DB_CONNECT_RETRY
+        for attempt in range(1, retries + 1):
+            try:
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+                return
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                print(f"Database is not ready (attempt {attempt}/{retries}): {e}")
+                await asyncio.sleep(1)
+
+    async def dispose(self) -> None:
+        """Close the pool of the running event loop"""
+        loop = self._current_loop()
+        with self._lock:
+            cached = self._engines.pop(loop, None) if loop else None
+        if cached is not None:
+            await cached[0].dispose()
+
+    def stats(self) -> list:
+        with self._lock:
+            engines = list(self._engines.values())
+        return [engine.pool.stats() for engine, _ in engines]
 
 
 async def get_session() -> AsyncSession:
@@ -1,14 +1,18 @@
 from web.db.models.article import (
     ArticleStorage,
+    ArticleContentStorage,
     ArticleSummaryStorage,
     ArticleLinkStorage,
 )
+from web.db.models.summary_cache import SummaryCacheStorage
 from web.db.models.task import TaskStorage
 
 
 __all__ = [
     "ArticleStorage",
+    "ArticleContentStorage",
     "ArticleSummaryStorage",
     "ArticleLinkStorage",
+    "SummaryCacheStorage",
     "TaskStorage",
 ]
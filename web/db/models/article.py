@@ -3,20 +3,36 @@ from sqlalchemy import (
     UUID,
     TEXT,
     INTEGER,
+    BIGINT,
     TIMESTAMP,
     ForeignKey,
     BOOLEAN,
+    Computed,
+    Index,
+    LargeBinary,
+    UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from web.db import DeclarativeBase
 
 
+# Text search configuration of the search vectors and of search queries
+SEARCH_CONFIG = "english"
+
+
 class ArticleStorage(DeclarativeBase):
     """Модель для хранения статей Wikipedia"""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix__articles__path", "path", postgresql_using="gin"),
+        Index(
+            "ix__articles__search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -32,13 +48,26 @@ class ArticleStorage(DeclarativeBase):
         index=True,
         doc="URL of the article",
     )
+    url_hash = Column(
+        BIGINT,
+        Computed("hashtextextended(url, 0)", persisted=True),
+        index=True,
+        doc="64-bit hash of the canonical URL for compact lookups",
+    )
     title = Column(TEXT, nullable=False, doc="Title of the article")
-    content = Column(TEXT, nullable=False, doc="Content of the article")
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')",
+            persisted=True,
+        ),
+        doc="Full-text vector of the title",
+    )
     status = Column(
         TEXT,
         default="pending",
         doc="Status of the article",
-        comment="pending, processing, completed, failed",
+        comment="pending, processing, completed, failed, imported",
     )
     level = Column(
         INTEGER,
@@ -50,8 +79,24 @@ class ArticleStorage(DeclarativeBase):
         UUID(as_uuid=True),
         ForeignKey("articles.id"),
         nullable=True,
+        index=True,
         doc="Link to the parent article",
     )
+    path = Column(
+        ARRAY(UUID(as_uuid=True)),
+        nullable=True,
+        doc="Ids of the ancestors from the crawl root, set by crawls",
+    )
+    revision_id = Column(
+        BIGINT,
+        nullable=True,
+        doc="MediaWiki revision id of the stored content",
+    )
+    last_modified = Column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        doc="Date and time the page was last touched on Wikipedia",
+    )
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
@@ -65,16 +110,77 @@ class ArticleStorage(DeclarativeBase):
     )
 
     parent = relationship("ArticleStorage", remote_side=[id], backref="children")
+    # The body is never loaded implicitly: read it with load_content
+    body = relationship(
+        "ArticleContentStorage", back_populates="article", uselist=False, lazy="raise"
+    )
     summary = relationship(
         "ArticleSummaryStorage", back_populates="article", uselist=False
     )
     links = relationship("ArticleLinkStorage", back_populates="source_article")
 
 
+class ArticleContentStorage(DeclarativeBase):
+    """
+    Модель для хранения сжатого текста статей отдельно от метаданных,
+    чтобы запросы к articles не читали тело статьи
+    """
+
+    __tablename__ = "article_contents"
+    __table_args__ = (
+        Index(
+            "ix__article_contents__search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+
+    article_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        primary_key=True,
+        doc="Link to the article",
+    )
+    codec = Column(
+        TEXT,
+        nullable=False,
+        doc="Compression codec",
+        comment="zstd, zstd-dict, zlib",
+    )
+    dictionary_id = Column(
+        BIGINT,
+        nullable=True,
+        doc="Id of the zstd dictionary of zstd-dict data",
+    )
+    data = Column(LargeBinary, nullable=False, doc="Compressed content of the article")
+    raw_size = Column(INTEGER, nullable=False, doc="Size of the UTF-8 content, bytes")
+    stored_size = Column(INTEGER, nullable=False, doc="Size of the compressed data")
+    search_vector = Column(
+        TSVECTOR,
+        nullable=True,
+        doc="Full-text vector of the lead of the content, written with the body",
+    )
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        doc="Date and time of last update",
+    )
+
+    article = relationship("ArticleStorage", back_populates="body")
+
+
 class ArticleSummaryStorage(DeclarativeBase):
     """Модель для хранения summary статей"""
 
     __tablename__ = "article_summaries"
+    __table_args__ = (
+        Index(
+            "ix__article_summaries__search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -96,6 +202,13 @@ class ArticleSummaryStorage(DeclarativeBase):
         doc="Summary of the article",
         comment="Summary of the article",
     )
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', text), 'B')", persisted=True
+        ),
+        doc="Full-text vector of the summary",
+    )
     model_used = Column(
         TEXT,
         nullable=False,
@@ -115,6 +228,10 @@ class ArticleLinkStorage(DeclarativeBase):
     """Модель для хранения связей между статьями (для рекурсивного парсинга)"""
 
     __tablename__ = "article_links"
+    __table_args__ = (
+        UniqueConstraint("source_article_id", "target_url"),
+        Index("ix__article_links__target_url", "target_url"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    Column,
+    INTEGER,
+    TEXT,
+    TIMESTAMP,
+    func,
+)
+
+from web.db import DeclarativeBase
+
+
+class SummaryCacheStorage(DeclarativeBase):
+    """Модель для кэша summary по хэшу нормализованного текста и модели"""
+
+    __tablename__ = "summary_cache"
+
+    key = Column(
+        TEXT,
+        primary_key=True,
+        doc="sha256 of the model name and the normalized content",
+    )
+    model_used = Column(TEXT, nullable=False, doc="Model used to generate the summary")
+    text = Column(TEXT, nullable=False, doc="Cached summary")
+    hits = Column(INTEGER, nullable=False, server_default="0", doc="Number of hits")
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        index=True,
+        doc="Date and time of creation",
+    )
+    last_hit_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        doc="Date and time of the last hit",
+    )
@@ -1,19 +1,26 @@
 from sqlalchemy import (
     Column,
     TEXT,
+    INTEGER,
     ForeignKey,
+    Index,
     TIMESTAMP,
     UUID,
     func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 
 from web.db import DeclarativeBase
 
 
 class TaskStorage(DeclarativeBase):
-    """Модель для отслеживания celery-задач"""
+    """Модель для durable-очереди фоновых задач"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix__tasks__status_run_at", "status", "run_at"),
+        Index("ix__tasks__group_id", "group_id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -32,12 +39,39 @@ class TaskStorage(DeclarativeBase):
         TEXT, nullable=False, doc="Type of the task", comment="parse, generate_summary"
     )
     article_id = Column(UUID(as_uuid=True), ForeignKey("articles.id"), nullable=True)
+    group_id = Column(
+        TEXT, nullable=True, doc="Job group of tasks submitted in one batch"
+    )
     status = Column(
         TEXT,
         default="pending",
         doc="Status of the task",
         comment="pending, running, completed, failed",
     )
+    payload = Column(
+        JSONB,
+        nullable=False,
+        server_default="{}",
+        doc="Keyword arguments of the task handler",
+    )
+    attempts = Column(
+        INTEGER, nullable=False, server_default="0", doc="Number of started attempts"
+    )
+    max_attempts = Column(
+        INTEGER, nullable=False, server_default="5", doc="Attempts before giving up"
+    )
+    run_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        doc="The task can not be claimed before this time",
+    )
+    locked_by = Column(TEXT, nullable=True, doc="Worker that holds the lease")
+    lease_expires_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        doc="A running task with an expired lease can be claimed again",
+    )
     result = Column(TEXT, nullable=True, doc="Result of the task")
     error = Column(TEXT, nullable=True, doc="Error of the task")
     created_at = Column(
@@ -0,0 +1,50 @@
+from web.db.repositories.article import (
+    count_inbound_links,
+    delete_summaries,
+    get_existing_urls,
+    insert_articles,
+    insert_links,
+    mark_links_parsed,
+    update_article_pages,
+    url_matches,
+)
+from web.db.repositories.bulk import BulkLoader, bulk_load_stats
+from web.db.repositories.content import (
+    content_storage_stats,
+    load_content,
+    load_contents,
+    save_contents,
+)
+from web.db.repositories.search import get_headlines, search_articles
+from web.db.repositories.tree import (
+    TREE_COLUMNS,
+    backfill_paths,
+    get_article_tree,
+    get_subtree_page,
+    subtree_cte,
+)
+
+
+__all__ = [
+    "BulkLoader",
+    "TREE_COLUMNS",
+    "backfill_paths",
+    "bulk_load_stats",
+    "content_storage_stats",
+    "count_inbound_links",
+    "delete_summaries",
+    "get_article_tree",
+    "get_existing_urls",
+    "get_headlines",
+    "get_subtree_page",
+    "insert_articles",
+    "insert_links",
+    "load_content",
+    "load_contents",
+    "mark_links_parsed",
+    "save_contents",
+    "search_articles",
+    "subtree_cte",
+    "update_article_pages",
+    "url_matches",
+]
@@ -0,0 +1,188 @@
+from typing import Dict, Iterable, List, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    TEXT,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.db.models import ArticleStorage, ArticleLinkStorage, ArticleSummaryStorage
+from web.db.repositories.bulk import BulkLoader, use_copy
+
+
+INSERT_CHUNK_SIZE = 1000
+
+ARTICLE_COLUMNS = (
+    "url",
+    "title",
+    "revision_id",
+    "last_modified",
+    "status",
+    "level",
+    "parent_id",
+    "path",
+)
+LINK_COLUMNS = ("source_article_id", "target_url", "target_title", "is_parsed")
+
+# Crawled articles are kept, articles imported from a dump are adopted
+articles_loader = BulkLoader(
+    ArticleStorage.__table__,
+    columns=ARTICLE_COLUMNS,
+    conflict=["url"],
+    update=[column for column in ARTICLE_COLUMNS if column != "url"],
+    where="articles.status = 'imported'",
+    returning=["id", "url"],
+)
+# An existing edge keeps its parsed flag
+links_loader = BulkLoader(
+    ArticleLinkStorage.__table__,
+    columns=LINK_COLUMNS,
+    conflict=["source_article_id", "target_url"],
+    update={"is_parsed": "article_links.is_parsed OR excluded.is_parsed"},
+)
+
+
+def url_matches(url: str):
+    """
+    Filter on a canonical url that is answered from the compact `url_hash`
+    index; the url comparison guards against hash collisions.
+    """
+    return and_(
+        ArticleStorage.url_hash == func.hashtextextended(url, 0),
+        ArticleStorage.url == url,
+    )
+
+
+async def get_existing_urls(session: AsyncSession, urls: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of urls already stored by a crawl, in one
+    `url = ANY(:urls)` query. Articles imported from a dump are not counted,
+    crawls adopt them.
+    """
+    urls = list(set(urls))
+    if not urls:
+        return set()
+    query = select(ArticleStorage.url).where(
+        ArticleStorage.url == any_(bindparam("urls", urls, type_=ARRAY(TEXT))),
+        ArticleStorage.status != "imported",
+    )
+    return set(await session.scalars(query))
+
+
+async def insert_articles(session: AsyncSession, rows: List[dict]) -> Dict[str, UUID]:
+    """
+    Insert articles and return ids of the rows that were actually inserted,
+    keyed by url. Existing crawled articles are left alone, articles imported
+    from a dump are adopted by the crawl.
+    """
+    if use_copy(rows):
+        loaded = await articles_loader.load(
+            session,
+            (tuple(row.get(column) for column in ARTICLE_COLUMNS) for row in rows),
+        )
+        return {url: article_id for article_id, url in loaded}
+
+    inserted = {}
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        query = insert(ArticleStorage).values(rows[start : start + INSERT_CHUNK_SIZE])
+        query = query.on_conflict_do_update(
+            index_elements=[ArticleStorage.url],
+            set_={
+                column: query.excluded[column]
+                for column in rows[start]
+                if column != "url"
+            },
+            where=ArticleStorage.status == "imported",
+        ).returning(ArticleStorage.id, ArticleStorage.url)
+        for article_id, url in await session.execute(query):
+            inserted[url] = article_id
+    return inserted
+
+
+async def update_article_pages(session: AsyncSession, rows: List[dict]) -> None:
+    """Bulk update title and revision by primary key"""
+    if rows:
+        await session.execute(update(ArticleStorage), rows)
+
+
+async def delete_summaries(session: AsyncSession, article_ids: List[UUID]) -> None:
+    """Drop the summaries of articles whose content changed"""
+    if article_ids:
+        await session.execute(
+            delete(ArticleSummaryStorage).where(
+                ArticleSummaryStorage.article_id.in_(article_ids)
+            )
+        )
+
+
+async def insert_links(session: AsyncSession, rows: List[dict]) -> None:
+    """Insert edges, an existing (source, target) edge keeps its parsed flag"""
+    if use_copy(rows):
+        await links_loader.load(
+            session,
+            (tuple(row.get(column) for column in LINK_COLUMNS) for row in rows),
+        )
+        return
+
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        query = insert(ArticleLinkStorage).values(
+            rows[start : start + INSERT_CHUNK_SIZE]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[
+                ArticleLinkStorage.source_article_id,
+                ArticleLinkStorage.target_url,
+            ],
+            set_={"is_parsed": ArticleLinkStorage.is_parsed | query.excluded.is_parsed},
+        )
+        await session.execute(query)
+
+
+async def mark_links_parsed(
+    session: AsyncSession, edges: List[Tuple[UUID, str]]
+) -> None:
+    """Mark (source_article_id, target_url) edges as parsed"""
+    if not edges:
+        return
+    update_query = (
+        update(ArticleLinkStorage)
+        .where(
+            tuple_(
+                ArticleLinkStorage.source_article_id, ArticleLinkStorage.target_url
+            ).in_(edges)
+        )
+        .values(is_parsed=True)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(update_query)
+
+
+async def count_inbound_links(
+    session: AsyncSession, urls: Iterable[str], cap: int
+) -> Dict[str, int]:
+    """
+    Number of stored links pointing to each url, counted up to cap. Every
+    url reads at most cap entries of the target_url index, so hubs linked
+    from most of the graph cost no more than rare pages.
+    """
+    urls = list(set(urls))
+    if not urls:
+        return {}
+    statement = text(
+        "SELECT target.url, inbound.count FROM unnest(:urls) AS target(url) "
+        "CROSS JOIN LATERAL (SELECT count(*) AS count FROM ("
+        "SELECT 1 FROM article_links WHERE target_url = target.url LIMIT :cap"
+        ") AS capped) AS inbound"
+    ).bindparams(bindparam("urls", type_=ARRAY(TEXT)))
+    rows = await session.execute(statement, {"urls": urls, "cap": cap})
+    return dict(rows.all())
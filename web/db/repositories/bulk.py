@@ -0,0 +1,132 @@
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import Row, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.utils import get_settings
+
+
+def use_copy(rows: Sequence) -> bool:
+    """COPY pays off for large batches, small ones use INSERT ... VALUES"""
+    return len(rows) >= get_settings().BULK_COPY_MIN_ROWS
+
+
+class BulkLoader:
+    """
+    Bulk writes through a staging table.
+
+    Rows are sent with asyncpg `copy_records_to_table` into a temporary table
+    of the same column types, then merged into the target table with one
+    `INSERT ... SELECT ... ON CONFLICT` statement. No ORM objects are built,
+    so hundreds of thousands of rows cost one COPY and one statement.
+
+    `update` lists the columns overwritten on conflict, or maps columns to
+    SQL expressions; without it conflicting rows are skipped.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        columns: Sequence[str],
+        conflict: Sequence[str],
+        update: Union[Sequence[str], Dict[str, str]] = (),
+        where: Optional[str] = None,
+        returning: Sequence[str] = (),
+    ) -> None:
+        self.table = table
+        self.columns = list(columns)
+        self.conflict = list(conflict)
+        if not isinstance(update, dict):
+            update = {column: f"excluded.{column}" for column in update}
+        self.update = update
+        self.where = where
+        self.returning = list(returning)
+        # Temporary tables live as long as the pooled connection, so loaders
+        # of the same table with other columns need their own staging table
+        suffix = zlib.crc32(",".join(self.columns).encode())
+        self.staging_table = f"staging_{table.name}_{suffix:08x}"
+
+    def _merge_query(self) -> str:
+        columns = ", ".join(self.columns)
+        conflict = ", ".join(self.conflict)
+        query = (
+            f"INSERT INTO {self.table.name} ({columns}) "
+            f"SELECT DISTINCT ON ({conflict}) {columns} FROM {self.staging_table} "
+            f"ON CONFLICT ({conflict}) "
+        )
+        if self.update:
+            assignments = ", ".join(
+                f"{column} = {value}" for column, value in self.update.items()
+            )
+            query += f"DO UPDATE SET {assignments} "
+            if self.where:
+                query += f"WHERE {self.where} "
+        else:
+            query += "DO NOTHING "
+        if self.returning:
+            query += f"RETURNING {', '.join(self.returning)}"
+        return query
+
+    async def load(self, session: AsyncSession, records: Iterable[tuple]) -> List[Row]:
+        """
+        Write records (tuples in `columns` order) in the session transaction,
+        return the `returning` columns of the inserted or updated rows.
+        """
+        records = list(records)
+        if not records:
+            return []
+
+        started_at = time.perf_counter()
+        # The asyncpg adapter sends BEGIN with the first statement of the
+        # session, not on checkout. The staging table is created through the
+        # session, so the COPY below never runs in autocommit mode, where
+        # ON COMMIT DELETE ROWS would drop the rows before the merge
+        await session.execute(
+            text(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {self.staging_table} "
+                f"ON COMMIT DELETE ROWS AS "
+                f"SELECT {', '.join(self.columns)} FROM {self.table.name} "
+                f"WITH NO DATA"
+            )
+        )
+        connection = await (await session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(
+            self.staging_table, records=records, columns=self.columns
+        )
+        result = await session.execute(text(self._merge_query()))
+        rows = result.all() if self.returning else []
+        await session.execute(text(f"TRUNCATE {self.staging_table}"))
+
+        _record(self.table.name, len(records), time.perf_counter() - started_at)
+        return rows
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _record(table: str, rows: int, seconds: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(table, {"rows": 0, "seconds": 0.0, "loads": 0})
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+        stats["loads"] += 1
+
+
+def bulk_load_stats() -> List[dict]:
+    """Rows written and throughput of the bulk loader per table"""
+    with _stats_lock:
+        return [
+            {
+                "table": table,
+                "loads": int(stats["loads"]),
+                "rows": int(stats["rows"]),
+                "rows_per_second": round(
+                    stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0, 1
+                ),
+            }
+            for table, stats in _stats.items()
+        ]
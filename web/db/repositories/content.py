@@ -0,0 +1,157 @@
+import asyncio
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import TEXT, UUID as SQL_UUID, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.utils import get_settings
+from web.db.models import ArticleContentStorage
+from web.db.models.article import SEARCH_CONFIG
+from web.db.repositories.bulk import BulkLoader, use_copy
+from web.utils.compression import get_codec
+
+
+CONTENT_COLUMNS = (
+    "article_id",
+    "codec",
+    "dictionary_id",
+    "data",
+    "raw_size",
+    "stored_size",
+)
+
+contents_loader = BulkLoader(
+    ArticleContentStorage.__table__,
+    columns=CONTENT_COLUMNS,
+    conflict=["article_id"],
+    update=[column for column in CONTENT_COLUMNS if column != "article_id"],
+)
+
+
+def _compress(contents: Dict[UUID, str]) -> list:
+    codec = get_codec()
+    rows = []
+    for article_id, content in contents.items():
+        data = codec.compress(content)
+        rows.append(
+            (
+                article_id,
+                codec.name,
+                codec.dictionary_id,
+                data,
+                len(content.encode("utf-8")),
+                len(data),
+            )
+        )
+    return rows
+
+
+async def save_contents(session: AsyncSession, contents: Dict[UUID, str]) -> None:
+    """
+    Compress article bodies in a thread and upsert them by article id,
+    then write their search vectors
+    """
+    if not contents:
+        return
+    rows = await asyncio.to_thread(_compress, contents)
+    if use_copy(rows):
+        await contents_loader.load(session, rows)
+    else:
+        query = insert(ArticleContentStorage).values(
+            [dict(zip(CONTENT_COLUMNS, row)) for row in rows]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[ArticleContentStorage.article_id],
+            set_={column: query.excluded[column] for column in CONTENT_COLUMNS[1:]},
+        )
+        await session.execute(query)
+    await _update_search_vectors(session, contents)
+
+
+async def _update_search_vectors(
+    session: AsyncSession, contents: Dict[UUID, str]
+) -> None:
+    """
+    The body is stored compressed, so a generated column can not index it:
+    the vector of the first SEARCH_MAX_CHARS characters is computed from the
+    plain text in one UPDATE for the whole batch. SEARCH_MAX_CHARS=0 turns
+    body indexing off.
+    """
+    max_chars = get_settings().SEARCH_MAX_CHARS
+    if max_chars <= 0:
+        return
+    query = text(
+        "UPDATE article_contents SET search_vector = "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', body.text), 'C') "
+        "FROM unnest(:ids, :texts) AS body(article_id, text) "
+        "WHERE article_contents.article_id = body.article_id"
+    ).bindparams(
+        bindparam("ids", type_=ARRAY(SQL_UUID(as_uuid=True))),
+        bindparam("texts", type_=ARRAY(TEXT)),
+    )
+    await session.execute(
+        query,
+        {
+            "ids": list(contents),
+            "texts": [content[:max_chars] for content in contents.values()],
+        },
+    )
+
+
+async def load_content(session: AsyncSession, article_id: UUID) -> Optional[str]:
+    """Read and decompress the body of one article"""
+    query = select(
+        ArticleContentStorage.codec,
+        ArticleContentStorage.data,
+        ArticleContentStorage.dictionary_id,
+    ).where(ArticleContentStorage.article_id == article_id)
+    row = (await session.execute(query)).first()
+    return get_codec().decompress(*row) if row else None
+
+
+async def load_contents(
+    session: AsyncSession, article_ids: Iterable[UUID]
+) -> Dict[UUID, str]:
+    """Read and decompress the bodies of many articles in one query"""
+    query = select(
+        ArticleContentStorage.article_id,
+        ArticleContentStorage.codec,
+        ArticleContentStorage.data,
+        ArticleContentStorage.dictionary_id,
+    ).where(ArticleContentStorage.article_id.in_(list(article_ids)))
+    codec = get_codec()
+    return {
+        article_id: codec.decompress(name, data, dictionary_id)
+        for article_id, name, data, dictionary_id in await session.execute(query)
+    }
+
+
+async def content_storage_stats(session: AsyncSession) -> dict:
+    """Stored bodies, raw and compressed bytes per codec"""
+    query = select(
+        ArticleContentStorage.codec,
+        func.count(),
+        func.sum(ArticleContentStorage.raw_size),
+        func.sum(ArticleContentStorage.stored_size),
+    ).group_by(ArticleContentStorage.codec)
+    codecs = [
+        {
+            "codec": codec,
+            "articles": count,
+            "raw_bytes": int(raw_bytes or 0),
+            "stored_bytes": int(stored_bytes or 0),
+        }
+        for codec, count, raw_bytes, stored_bytes in await session.execute(query)
+    ]
+    raw_bytes = sum(codec["raw_bytes"] for codec in codecs)
+    stored_bytes = sum(codec["stored_bytes"] for codec in codecs)
+    return {
+        "articles": sum(codec["articles"] for codec in codecs),
+        "raw_bytes": raw_bytes,
+        "stored_bytes": stored_bytes,
+        "ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+        "savings": round(1 - stored_bytes / raw_bytes, 4) if raw_bytes else 0.0,
+        "codecs": codecs,
+    }
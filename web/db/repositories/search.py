@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    TEXT,
+    UUID as SQL_UUID,
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.db.models import ArticleContentStorage, ArticleStorage, ArticleSummaryStorage
+from web.db.models.article import SEARCH_CONFIG
+
+
+HEADLINE_OPTIONS = "MaxWords=35, MinWords=15, MaxFragments=2"
+
+_config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def _matches(article_id, search_vector, tsquery):
+    """Rank of the rows of one vector column that match, uses its GIN index"""
+    # Normalization 1 divides by the log of the length: long bodies do not win
+    return select(
+        article_id.label("article_id"),
+        func.ts_rank_cd(search_vector, tsquery, 1).label("rank"),
+    ).where(search_vector.op("@@")(tsquery))
+
+
+async def search_articles(
+    session: AsyncSession,
+    query: str,
+    limit: int,
+    after: Optional[Tuple[float, UUID]] = None,
+) -> List:
+    """
+    One page of articles matching a web search style query (quoted phrases,
+    `or`, `-word`), best first: article_id, url, title, rank and a
+    highlighted fragment of the summary.
+
+    Title, body and summary vectors are matched separately, each through
+    its own GIN index, and the ranks of an article are summed. `after` is
+    the (rank, article_id) key of the last row of the previous page.
+    """
+    tsquery = func.websearch_to_tsquery(_config, query)
+    matches = union_all(
+        _matches(ArticleStorage.id, ArticleStorage.search_vector, tsquery),
+        _matches(
+            ArticleContentStorage.article_id,
+            ArticleContentStorage.search_vector,
+            tsquery,
+        ),
+        _matches(
+            ArticleSummaryStorage.article_id,
+            ArticleSummaryStorage.search_vector,
+            tsquery,
+        ),
+    ).subquery("matches")
+    ranked = (
+        select(matches.c.article_id, func.sum(matches.c.rank).label("rank"))
+        .group_by(matches.c.article_id)
+        .subquery("ranked")
+    )
+
+    page_query = (
+        select(
+            ranked.c.article_id,
+            ranked.c.rank,
+            ArticleStorage.url,
+            ArticleStorage.title,
+            func.ts_headline(
+                _config, ArticleSummaryStorage.text, tsquery, HEADLINE_OPTIONS
+            ).label("summary_headline"),
+        )
+        .join(ArticleStorage, ArticleStorage.id == ranked.c.article_id)
+        .outerjoin(
+            ArticleSummaryStorage,
+            ArticleSummaryStorage.article_id == ranked.c.article_id,
+        )
+        .order_by(ranked.c.rank.desc(), ranked.c.article_id)
+        .limit(limit)
+    )
+    if after is not None:
+        rank, article_id = after
+        page_query = page_query.where(
+            or_(
+                ranked.c.rank < rank,
+                and_(ranked.c.rank == rank, ranked.c.article_id > article_id),
+            )
+        )
+    return (await session.execute(page_query)).all()
+
+
+async def get_headlines(
+    session: AsyncSession, query: str, contents: Dict[UUID, str]
+) -> Dict[UUID, str]:
+    """
+    Highlighted fragments of article bodies. Bodies are stored compressed,
+    so the caller passes the decompressed text of the page rows only.
+    """
+    if not contents:
+        return {}
+    statement = text(
+        f"SELECT body.article_id, ts_headline('{SEARCH_CONFIG}', body.text, "
+        f"websearch_to_tsquery('{SEARCH_CONFIG}', :query), :options) "
+        "FROM unnest(:ids, :texts) AS body(article_id, text)"
+    ).bindparams(
+        bindparam("ids", type_=ARRAY(SQL_UUID(as_uuid=True))),
+        bindparam("texts", type_=ARRAY(TEXT)),
+    )
+    rows = await session.execute(
+        statement,
+        {
+            "query": query,
+            "options": HEADLINE_OPTIONS,
+            "ids": list(contents),
+            "texts": list(contents.values()),
+        },
+    )
+    return dict(rows.all())
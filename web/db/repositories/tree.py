@@ -0,0 +1,126 @@
+import asyncio
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleStorage
+
+
+TREE_COLUMNS = (
+    ArticleStorage.id,
+    ArticleStorage.parent_id,
+    ArticleStorage.url,
+    ArticleStorage.title,
+    ArticleStorage.status,
+    ArticleStorage.level,
+)
+
+
+def subtree_cte(root_id: UUID, columns: Sequence, max_level: Optional[int] = None):
+    """
+    Recursive CTE over `parent_id` with the given columns of the article and
+    every article crawled under it. Each step is an index scan on parent_id,
+    so the whole subtree costs one query instead of one per node or level.
+    """
+    child = aliased(ArticleStorage)
+    tree = (
+        select(*columns)
+        .where(ArticleStorage.id == root_id)
+        .cte("tree", recursive=True)
+    )
+    children = select(*(getattr(child, column.key) for column in columns)).join(
+        tree, child.parent_id == tree.c.id
+    )
+    if max_level is not None:
+        children = children.where(child.level <= max_level)
+    return tree.union_all(children)
+
+
+async def get_article_tree(session: AsyncSession, article_id: UUID) -> List:
+    """
+    Return (id, url, level, revision_id) of the article and all articles
+    crawled under it in one recursive query.
+    """
+    tree = subtree_cte(
+        article_id,
+        (
+            ArticleStorage.id,
+            ArticleStorage.url,
+            ArticleStorage.level,
+            ArticleStorage.revision_id,
+        ),
+    )
+    return (await session.execute(select(tree))).all()
+
+
+async def get_subtree_page(
+    session: AsyncSession,
+    root_id: UUID,
+    limit: int,
+    after: Optional[Tuple[int, UUID]] = None,
+    max_level: Optional[int] = None,
+    use_path: bool = False,
+) -> List:
+    """
+    One page of the subtree in (level, id) order, TREE_COLUMNS only.
+    `after` is the (level, id) key of the last row of the previous page.
+
+    With use_path the subtree is filtered with the GIN-indexed `path`
+    column instead of walking parent_id, which only sees articles stored
+    after `path` was introduced or backfilled.
+    """
+    if use_path:
+        query = select(*TREE_COLUMNS).where(
+            or_(
+                ArticleStorage.id == root_id,
+                ArticleStorage.path.contains([root_id]),
+            )
+        )
+        if max_level is not None:
+            query = query.where(ArticleStorage.level <= max_level)
+        tree = query.subquery("tree")
+    else:
+        tree = subtree_cte(root_id, TREE_COLUMNS, max_level)
+
+    query = select(tree).order_by(tree.c.level, tree.c.id).limit(limit)
+    if after is not None:
+        query = query.where(tuple_(tree.c.level, tree.c.id) > tuple_(*after))
+    return (await session.execute(query)).all()
+
+
+async def backfill_paths(session: AsyncSession) -> int:
+    """
+    Fill `path` of articles stored before it was maintained by crawls,
+    with one recursive UPDATE from the roots. Returns the updated row count.
+    """
+    result = await session.execute(
+        text(
+            "WITH RECURSIVE tree AS ("
+            " SELECT id, ARRAY[]::uuid[] AS path FROM articles"
+            " WHERE parent_id IS NULL"
+            " UNION ALL"
+            " SELECT articles.id, tree.path || articles.parent_id FROM articles"
+            " JOIN tree ON articles.parent_id = tree.id"
+            ") "
+            "UPDATE articles SET path = tree.path FROM tree "
+            "WHERE articles.id = tree.id AND articles.path IS DISTINCT FROM tree.path"
+        )
+    )
+    return result.rowcount
+
+
+async def _backfill() -> None:
+    session_maker = SessionManager().get_session_maker()
+    async with session_maker() as session:
+        updated = await backfill_paths(session)
+        await session.commit()
+    await SessionManager().dispose()
+    print(f"Backfilled the path of {updated} articles")
+
+
+if __name__ == "__main__":
+    asyncio.run(_backfill())
@@ -1,10 +1,20 @@
+from web.endpoints.articles import api_router as articles_router
+from web.endpoints.graph import api_router as graph_router
 from web.endpoints.parse import api_router as parse_router
+from web.endpoints.search import api_router as search_router
+from web.endpoints.stats import api_router as stats_router
 from web.endpoints.summary import api_router as summary_router
+from web.endpoints.tasks import api_router as tasks_router
 
 
 list_of_routes = [
     parse_router,
+    articles_router,
+    search_router,
+    graph_router,
     summary_router,
+    stats_router,
+    tasks_router,
 ]
 
 
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+import json
+from typing import AsyncIterator, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from web.config.utils import get_settings
 from web.db.connection import get_session
 from web.db.models import ArticleStorage
-from web.schemas import ArticleStatusResponse
+from web.db.repositories import get_subtree_page
+from web.schemas import ArticleStatusResponse, ArticleTreeResponse, TreeNode
+from web.utils.events import get_event_broker
 
 api_router = APIRouter()
 
@@ -17,14 +25,22 @@ api_router = APIRouter()
     responses={status.HTTP_404_NOT_FOUND: {"description": "Article not found"}},
 )
 async def get_article_status(
-    article_id: int = Path(..., description="Article ID"),
+    article_id: UUID = Path(..., description="Article ID"),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Получить статус парсинга статьи по article_id
     """
-    article_query = select(ArticleStorage).where(ArticleStorage.id == article_id)
-    article = await session.scalar(article_query)
+    article_query = select(
+        ArticleStorage.id,
+        ArticleStorage.url,
+        ArticleStorage.title,
+        ArticleStorage.status,
+        ArticleStorage.level,
+        ArticleStorage.created_at,
+        ArticleStorage.updated_at,
+    ).where(ArticleStorage.id == article_id)
+    article = (await session.execute(article_query)).first()
 
     if not article:
         raise HTTPException(
@@ -41,3 +57,115 @@ async def get_article_status(
         created_at=article.created_at,
         updated_at=article.updated_at,
     )
+
+
+@api_router.get(
+    "/articles/{article_id}/tree",
+    response_model=ArticleTreeResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
+        status.HTTP_404_NOT_FOUND: {"description": "Article not found"},
+    },
+)
+async def get_article_tree(
+    article_id: UUID = Path(..., description="Root article ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size"),
+    max_level: Optional[int] = Query(None, ge=0, description="Deepest level"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Получить дерево обхода с корнем article_id постранично, в порядке (level, id).
+    Все поддерево читается одним рекурсивным CTE без ленивых загрузок ORM,
+    только нужные колонки; страницы листаются по ключу, а не по OFFSET.
+    С TREE_QUERY=path поддерево фильтруется по GIN-индексу колонки path.
+    """
+    settings = get_settings()
+    limit = min(limit or settings.TREE_PAGE_SIZE, settings.TREE_PAGE_SIZE_MAX)
+    rows = await get_subtree_page(
+        session,
+        article_id,
+        limit=limit + 1,
+        after=_parse_cursor(cursor),
+        max_level=max_level,
+        use_path=settings.TREE_QUERY == "path",
+    )
+    if not rows and cursor is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Article with id {article_id} not found",
+        )
+
+    page = rows[:limit]
+    return ArticleTreeResponse(
+        root_id=article_id,
+        nodes=[
+            TreeNode(
+                article_id=row.id,
+                parent_id=row.parent_id,
+                url=row.url,
+                title=row.title,
+                status=row.status,
+                level=row.level,
+            )
+            for row in page
+        ],
+        next_cursor=f"{page[-1].level}:{page[-1].id}" if len(rows) > limit else None,
+    )
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, UUID]]:
+    if cursor is None:
+        return None
+    try:
+        level, article_id = cursor.split(":", 1)
+        return int(level), UUID(article_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor '{cursor}'",
+        )
+
+
+@api_router.get(
+    "/articles/{article_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-Sent Events: fetched, stored, summarized, "
+            "failed, completed",
+        },
+    },
+)
+async def stream_article_events(
+    request: Request,
+    article_id: UUID = Path(..., description="Root article ID"),
+):
+    """
+    Поток событий прогресса дерева статей с корнем article_id (Server-Sent Events)
+    вместо опроса /articles/{article_id}/status. События публикуют воркеры обхода
+    и summary; подписка не делает запросов к БД.
+    """
+    return StreamingResponse(
+        _event_stream(request, article_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(request: Request, root_id: UUID) -> AsyncIterator[str]:
+    broker = get_event_broker()
+    keepalive = get_settings().EVENTS_KEEPALIVE
+    subscription = broker.subscribe(root_id)
+    try:
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
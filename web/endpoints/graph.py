@@ -0,0 +1,84 @@
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from starlette import status
+
+from web.schemas import GraphNode, GraphPathResponse, GraphTopResponse
+from web.utils.canonical import canonicalize_url
+from web.utils.graph import get_link_graph_cache
+
+
+api_router = APIRouter()
+
+
+@api_router.get(
+    "/graph/top",
+    response_model=GraphTopResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_top_articles(
+    metric: Literal["pagerank", "in_degree"] = Query(
+        "pagerank", description="Ranking metric"
+    ),
+    limit: int = Query(20, ge=1, le=1000, description="Number of articles"),
+):
+    """
+    Получить самые важные статьи графа ссылок по PageRank или числу входящих ссылок.
+    Граф строится в памяти и перестраивается только после изменения article_links
+    """
+    graph = await get_link_graph_cache().get()
+    scores = getattr(graph, metric)
+    return GraphTopResponse(
+        metric=metric,
+        nodes=[
+            GraphNode(**graph.node_stats(node)) for node in graph.top(scores, limit)
+        ],
+    )
+
+
+@api_router.get(
+    "/graph/node",
+    response_model=GraphNode,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Article not in graph"}},
+)
+async def get_graph_node(url: str = Query(..., description="URL of the article")):
+    """
+    Получить число входящих и исходящих ссылок и PageRank статьи
+    """
+    graph = await get_link_graph_cache().get()
+    node = graph.node_ids.get(canonicalize_url(url) or url)
+    if node is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Article with URL '{url}' is not in the link graph",
+        )
+    return GraphNode(**graph.node_stats(node))
+
+
+@api_router.get(
+    "/graph/path",
+    response_model=GraphPathResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "No path found"}},
+)
+async def get_shortest_path(
+    source: str = Query(..., description="URL of the first article"),
+    target: str = Query(..., description="URL of the last article"),
+):
+    """
+    Найти кратчайшую цепочку ссылок между двумя статьями
+    """
+    source = canonicalize_url(source) or source
+    target = canonicalize_url(target) or target
+    graph = await get_link_graph_cache().get()
+    path = await asyncio.to_thread(graph.shortest_path, source, target)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No path of links from '{source}' to '{target}'",
+        )
+    return GraphPathResponse(
+        source=source, target=target, length=len(path) - 1, path=path
+    )
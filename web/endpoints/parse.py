@@ -1,13 +1,33 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, BackgroundTasks
+import asyncio
+import json
+from typing import AsyncIterator, List
+from uuid import uuid4
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from web.db.connection import get_session
+from web.config.utils import get_settings
+from web.db.connection import SessionManager, get_session
 from web.db.models import ArticleStorage
-from web.schemas import ParseRequest, ParseResponse
-from web.tasks.background_tasks import parse_article_background_sync
+from web.db.repositories import insert_articles, url_matches
+from web.schemas import (
+    GroupProgressResponse,
+    ParseBatchRequest,
+    ParseBatchResponse,
+    ParseRequest,
+    ParseResponse,
+)
+from web.tasks.queue import enqueue, enqueue_many, group_progress
+from web.tasks.worker_pool import notify_workers
+from web.utils.canonical import canonicalize_url
+
 
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
 
 api_router = APIRouter()
 
@@ -18,12 +38,11 @@ api_router = APIRouter()
     status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_400_BAD_REQUEST: {
-            "description": "Invalid URL or article already exists",
+            "description": "Invalid URL, article already exists or is not parsed yet",
         },
     },
 )
 async def parse_article(
-    background_tasks: BackgroundTasks,
     model: ParseRequest = Body(
         ...,
         example={"url": "https://en.wikipedia.org/wiki/Python_(programming_language)"},
@@ -31,47 +50,292 @@ async def parse_article(
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Запуск парсинга статьи по URL. Использует FastAPI background tasks.
+    Запуск парсинга статьи по URL. Задача ставится в очередь в таблице tasks.
 
     Логика:
     1. Проверяем, что статья еще не парсилась
     2. Создаем запись в БД со статусом "pending"
-    3. Добавляем background task для парсинга
-    4. Возвращаем article_id для отслеживания
+    3. В той же транзакции ставим задачу парсинга в очередь
+    4. Возвращаем task_id и article_id для отслеживания
+
+    URL приводится к каноническому виду (язык, мобильная версия, кодировка,
+    якоря и oldid), поэтому разные ссылки на одну статью не создают дублей.
+
+    С refresh=true уже сохраненная статья и ее дерево обновляются инкрементально:
+    заново скачиваются только статьи, ревизия которых изменилась.
     """
-    existing_article_query = select(ArticleStorage).where(
-        ArticleStorage.url == str(model.url)
-    )
+    url = canonicalize_url(str(model.url))
+    if url is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="URL is not a Wikipedia article",
+        )
+
+    existing_article_query = select(ArticleStorage).where(url_matches(url))
     existing_article = await session.scalar(existing_article_query)
 
-    if existing_article:
+    if model.refresh:
+        if not existing_article or existing_article.status != "completed":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Article is not parsed yet",
+            )
+        task = enqueue(
+            session,
+            "refresh",
+            article_id=existing_article.id,
+            payload={"url": existing_article.url},
+        )
+        await session.commit()
+        notify_workers()
+        return ParseResponse(
+            task_id=task.task_id,
+            article_id=existing_article.id,
+            url=existing_article.url,
+            status="pending",
+        )
+
+    if existing_article and existing_article.status == "imported":
+        # Статья загружена из дампа: обход начинается с нее как с корня
+        new_article = existing_article
+        new_article.status = "pending"
+        new_article.level = 0
+    elif existing_article:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Article already exists in database",
         )
+    else:
+        new_article = ArticleStorage(
+            url=url,
+            title="",  # Будет заполнено после парсинга
+            status="pending",  # pending, processing, completed, failed, imported
+            level=0,  # Уровень вложенности (0 для исходной статьи)
+        )
+        session.add(new_article)
+    await session.flush()
 
-    new_article = ArticleStorage(
-        url=str(model.url),
-        title="",  # Будет заполнено после парсинга
-        content="",  # Будет заполнено после парсинга
-        status="pending",  # pending, processing, completed, failed
-        level=0,  # Уровень вложенности (0 для исходной статьи)
-    )
-    session.add(new_article)
-    await session.commit()
-    await session.refresh(new_article)
-
-    background_tasks.add_task(
-        parse_article_background_sync,
+    task = enqueue(
+        session,
+        "parse",
         article_id=new_article.id,
-        url=str(model.url),
-        parent_id=None,
-        level=0,
+        payload={"url": url, "level": 0},
     )
+    await session.commit()
+    notify_workers()
 
     return ParseResponse(
-        task_id=f"background_task_{new_article.id}",
+        task_id=task.task_id,
         article_id=new_article.id,
-        url=str(model.url),
+        url=url,
         status="pending",
     )
+
+
+@api_router.post(
+    "/parse/batch",
+    response_model=ParseBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "No URLs or a malformed line"},
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {
+            "description": "More than PARSE_BATCH_MAX_URLS URLs",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": ParseBatchRequest.model_json_schema(),
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string"},
+                    "example": '"https://en.wikipedia.org/wiki/Python"\n'
+                    '{"url": "https://en.wikipedia.org/wiki/Rust"}\n',
+                },
+            },
+        }
+    },
+)
+async def parse_articles_batch(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Пакетный запуск парсинга. Тело запроса — JSON {"urls": [...]} или
+    NDJSON-загрузка, где каждая строка — URL или объект {"url": ...}.
+
+    Логика:
+    1. URL приводятся к каноническому виду, дубли внутри пакета отбрасываются
+    2. Новые статьи вставляются одним bulk insert, уже существующие пропускаются
+    3. Задачи парсинга ставятся в очередь одной группой в той же транзакции
+    4. Возвращаем group_id для отслеживания прогресса: GET /parse/batch/{group_id}
+    """
+    limit = get_settings().PARSE_BATCH_MAX_URLS
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type in NDJSON_MEDIA_TYPES:
+        raw_urls = await _read_ndjson_urls(request, limit)
+    else:
+        raw_urls = await _read_json_urls(request, limit)
+    if not raw_urls:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No URLs to parse",
+        )
+
+    urls: List[str] = []
+    invalid: List[str] = []
+    for raw_url in raw_urls:
+        url = canonicalize_url(raw_url)
+        if url is None:
+            invalid.append(raw_url)
+        else:
+            urls.append(url)
+    unique_urls = list(dict.fromkeys(urls))
+
+    # Уже сохраненные обходом статьи не вставляются, статьи из дампа усыновляются
+    inserted = await insert_articles(
+        session,
+        [
+            {"url": url, "title": "", "status": "pending", "level": 0}
+            for url in unique_urls
+        ],
+    )
+    group_id = str(uuid4())
+    accepted = await enqueue_many(
+        session,
+        "parse",
+        (
+            (inserted[url], {"url": url, "level": 0})
+            for url in unique_urls
+            if url in inserted
+        ),
+        group_id=group_id,
+    )
+    await session.commit()
+    notify_workers()
+
+    # Группа без задач не нашлась бы в GET /parse/batch/{group_id}
+    return ParseBatchResponse(
+        group_id=group_id if accepted else None,
+        accepted=accepted,
+        duplicates=len(urls) - len(unique_urls),
+        existing=[url for url in unique_urls if url not in inserted],
+        invalid=invalid,
+        status="pending" if accepted else "completed",
+    )
+
+
+@api_router.get(
+    "/parse/batch/{group_id}",
+    response_model=GroupProgressResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Progress snapshot, or a stream of them with stream=true",
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Job group not found"},
+    },
+)
+async def get_batch_progress(
+    group_id: str = Path(..., description="Job group ID"),
+    stream: bool = Query(False, description="Stream NDJSON snapshots until done"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Агрегированный прогресс группы задач: число задач по статусам и доля
+    завершенных. С stream=true отдает NDJSON-поток снимков каждые
+    PARSE_BATCH_PROGRESS_INTERVAL секунд, пока все задачи не завершатся.
+    """
+    progress = _get_progress(group_id, await group_progress(session, group_id))
+    if not progress.total:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job group with id {group_id} not found",
+        )
+    if not stream:
+        return progress
+    return StreamingResponse(
+        _stream_progress(progress), media_type="application/x-ndjson"
+    )
+
+
+async def _read_json_urls(request: Request, limit: int) -> List[str]:
+    try:
+        model = ParseBatchRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    if len(model.urls) > limit:
+        raise _too_many_urls(limit)
+    return model.urls
+
+
+async def _read_ndjson_urls(request: Request, limit: int) -> List[str]:
+    """Read an NDJSON upload line by line, without buffering the whole body"""
+    urls: List[str] = []
+    buffer, line_number = b"", 0
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            _append_ndjson_url(urls, line, line_number, limit)
+    _append_ndjson_url(urls, buffer, line_number + 1, limit)
+    return urls
+
+
+def _append_ndjson_url(
+    urls: List[str], line: bytes, number: int, limit: int
+) -> None:
+    if not line.strip():
+        return
+    try:
+        item = json.loads(line)
+    except ValueError:
+        item = None
+    url = item.get("url") if isinstance(item, dict) else item
+    if not isinstance(url, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Line {number} is not a URL string or an object with url",
+        )
+    if len(urls) >= limit:
+        raise _too_many_urls(limit)
+    urls.append(url)
+
+
+def _too_many_urls(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"A batch can hold at most {limit} URLs",
+    )
+
+
+def _get_progress(group_id: str, counts: dict) -> GroupProgressResponse:
+    total = sum(counts.values())
+    done = counts.get("completed", 0) + counts.get("failed", 0)
+    return GroupProgressResponse(
+        group_id=group_id,
+        total=total,
+        pending=counts.get("pending", 0),
+        running=counts.get("running", 0),
+        completed=counts.get("completed", 0),
+        failed=counts.get("failed", 0),
+        progress=round(done / total, 4) if total else 1.0,
+        finished=done == total,
+    )
+
+
+async def _stream_progress(progress: GroupProgressResponse) -> AsyncIterator[str]:
+    # Сессия зависимости закрывается до отправки потока, поэтому своя на опрос
+    session_maker = SessionManager().get_session_maker()
+    interval = get_settings().PARSE_BATCH_PROGRESS_INTERVAL
+    while True:
+        yield progress.model_dump_json() + "\n"
+        if progress.finished:
+            return
+        await asyncio.sleep(interval)
+        async with session_maker() as session:
+            counts = await group_progress(session, progress.group_id)
+        progress = _get_progress(progress.group_id, counts)
@@ -0,0 +1,82 @@
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from web.config.utils import get_settings
+from web.db.connection import get_session
+from web.db.repositories import get_headlines, load_contents, search_articles
+from web.schemas import SearchResponse, SearchResult
+
+
+api_router = APIRouter()
+
+
+@api_router.get(
+    "/search",
+    response_model=SearchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"}},
+)
+async def search(
+    q: str = Query(..., min_length=1, description="Search query"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Полнотекстовый поиск по заголовкам, текстам и summary статей.
+    Поддерживается синтаксис websearch: "фраза", or, -слово.
+    Результаты отсортированы по релевантности, совпадения выделены тегами <b>;
+    страницы листаются по ключу (rank, article_id), а не по OFFSET.
+    """
+    settings = get_settings()
+    limit = min(limit or settings.SEARCH_PAGE_SIZE, settings.SEARCH_PAGE_SIZE_MAX)
+    rows = await search_articles(
+        session, q, limit=limit + 1, after=_parse_cursor(cursor)
+    )
+    page = rows[:limit]
+
+    # Тексты хранятся сжатыми: распаковываем только статьи этой страницы
+    contents = await load_contents(session, [row.article_id for row in page])
+    headlines = await get_headlines(
+        session,
+        q,
+        {
+            article_id: content[: settings.SEARCH_HEADLINE_CHARS]
+            for article_id, content in contents.items()
+        },
+    )
+
+    return SearchResponse(
+        query=q,
+        results=[
+            SearchResult(
+                article_id=row.article_id,
+                url=row.url,
+                title=row.title,
+                rank=row.rank,
+                headline=headlines.get(row.article_id),
+                summary_headline=row.summary_headline,
+            )
+            for row in page
+        ],
+        next_cursor=(
+            f"{page[-1].rank!r}:{page[-1].article_id}" if len(rows) > limit else None
+        ),
+    )
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[float, UUID]]:
+    if cursor is None:
+        return None
+    try:
+        rank, article_id = cursor.split(":", 1)
+        return float(rank), UUID(article_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor '{cursor}'",
+        )
@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from web.db.connection import SessionManager, get_session
+from web.db.repositories import bulk_load_stats, content_storage_stats
+from web.schemas import (
+    ContentStorageStatsResponse,
+    DatabaseStatsResponse,
+    EventStatsResponse,
+    GraphStatsResponse,
+    ResponseCacheStatsResponse,
+    SummaryCacheStatsResponse,
+    WorkerPoolStatsResponse,
+)
+from web.tasks.queue import queue_depth
+from web.tasks.worker_pool import get_worker_pools
+from web.utils.events import get_event_broker
+from web.utils.graph import get_link_graph_cache
+from web.utils.response_cache import get_summary_response_cache
+from web.utils.summary_cache import get_summary_cache
+
+
+api_router = APIRouter()
+
+
+@api_router.get(
+    "/stats/workers",
+    response_model=WorkerPoolStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_worker_stats(session: AsyncSession = Depends(get_session)):
+    """
+    Получить глубину очереди и загрузку воркеров этой реплики по стадиям
+    """
+    pools = []
+    for pool in get_worker_pools().values():
+        stats = pool.stats()
+        stats["queue_depth"] = await queue_depth(session, stats["task_types"])
+        pools.append(stats)
+    return WorkerPoolStatsResponse(
+        queue_depth=await queue_depth(session),
+        pools=pools,
+    )
+
+
+@api_router.get(
+    "/stats/db",
+    response_model=DatabaseStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_database_stats():
+    """
+    Получить загрузку пулов соединений, время ожидания соединения
+    и скорость COPY-загрузки по таблицам
+    """
+    return DatabaseStatsResponse(
+        pools=SessionManager().stats(), bulk_loads=bulk_load_stats()
+    )
+
+
+@api_router.get(
+    "/stats/summary-cache",
+    response_model=SummaryCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_summary_cache_stats():
+    """
+    Получить hit rate кэша summary этой реплики
+    """
+    return SummaryCacheStatsResponse(**get_summary_cache().stats())
+
+
+@api_router.get(
+    "/stats/response-cache",
+    response_model=ResponseCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_response_cache_stats():
+    """
+    Получить hit rate кэша ответов GET /summary этой реплики
+    """
+    return ResponseCacheStatsResponse(**get_summary_response_cache().stats())
+
+
+@api_router.get(
+    "/stats/events",
+    response_model=EventStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_event_stats():
+    """
+    Получить число подписчиков и опубликованных событий прогресса этой реплики
+    """
+    return EventStatsResponse(**get_event_broker().stats())
+
+
+@api_router.get(
+    "/stats/graph",
+    response_model=GraphStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_graph_stats():
+    """
+    Получить размер графа ссылок этой реплики и время его последней сборки
+    """
+    return GraphStatsResponse(**get_link_graph_cache().stats())
+
+
+@api_router.get(
+    "/stats/content",
+    response_model=ContentStorageStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_content_storage_stats(session: AsyncSession = Depends(get_session)):
+    """
+    Получить объем хранимых тел статей до и после сжатия
+    """
+    return ContentStorageStatsResponse(**await content_storage_stats(session))
@@ -7,17 +7,21 @@ from fastapi import (
     Path,
     Request,
     Query,
-    BackgroundTasks,
 )
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from web.config.utils import get_settings
 from web.db.connection import get_session
 from web.db.models import ArticleStorage, ArticleSummaryStorage
+from web.db.repositories import url_matches
 from web.schemas import SummaryResponse
-from web.tasks.background_tasks import generate_summary_background_sync
+from web.tasks.queue import enqueue
+from web.tasks.worker_pool import notify_workers
+from web.utils.canonical import canonicalize_url
+from web.utils.response_cache import etag_matches, get_summary_response_cache
 
 
 api_router = APIRouter()
@@ -28,41 +32,66 @@ api_router = APIRouter()
     response_model=SummaryResponse,
     status_code=status.HTTP_200_OK,
     responses={
-        status.HTTP_404_NOT_FOUND: {"description": "Summary for this URL not found"}
+        status.HTTP_304_NOT_MODIFIED: {"description": "Summary has not changed"},
+        status.HTTP_404_NOT_FOUND: {"description": "Summary for this URL not found"},
     },
 )
 async def get_article_summary(
+    request: Request,
     url: str = Query(..., description="URL of the article"),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Получить summary для статьи по url. Если summary нет — 404.
+    Статья и summary читаются одним запросом, только нужные колонки.
+    Ответ кэшируется до записи нового summary, поддерживается If-None-Match.
+    Любая форма ссылки на статью приводится к каноническому URL.
     """
-    # Найти статью по url
-    article_query = select(ArticleStorage).where(ArticleStorage.url == url)
-    article = await session.scalar(article_query)
-    if not article:
+    url = canonicalize_url(url) or url
+    cache = get_summary_response_cache()
+    entry = await cache.get(url)
+    if entry is None:
+        entry = await cache.set(url, await _load_summary(url, session))
+
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": f"public, max-age={get_settings().SUMMARY_MAX_AGE}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(entry["body"], headers=headers)
+
+
+async def _load_summary(url: str, session: AsyncSession) -> dict:
+    summary_query = (
+        select(
+            ArticleStorage.url,
+            ArticleStorage.title,
+            ArticleSummaryStorage.text,
+            ArticleSummaryStorage.model_used,
+            ArticleSummaryStorage.created_at,
+        )
+        .outerjoin(ArticleSummaryStorage)
+        .where(url_matches(url))
+    )
+    row = (await session.execute(summary_query)).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Article with url '{url}' not found",
         )
-    # Найти summary для этой статьи
-    summary_query = select(ArticleSummaryStorage).where(
-        ArticleSummaryStorage.article_id == article.id
-    )
-    summary = await session.scalar(summary_query)
-    if not summary:
+    if row.text is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Summary for article '{url}' not found",
         )
     return SummaryResponse(
-        url=article.url,
-        title=article.title,
-        summary=summary.text,
-        model_used=summary.model_used,
-        created_at=summary.created_at,
-    )
+        url=row.url,
+        title=row.title,
+        summary=row.text,
+        model_used=row.model_used,
+        created_at=row.created_at,
+    ).model_dump(mode="json")
 
 
 @api_router.post(
@@ -74,42 +103,39 @@ async def get_article_summary(
     },
 )
 async def generate_article_summary(
-    background_tasks: BackgroundTasks,
     url: str = Query(..., description="URL of the article"),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Запустить генерацию summary для статьи по URL. Использует FastAPI background tasks.
+    Запустить генерацию summary для статьи по URL. Задача ставится в очередь в таблице tasks.
     """
-    # Найти статью по url
-    article_query = select(ArticleStorage).where(ArticleStorage.url == url)
-    article = await session.scalar(article_query)
+    # Найти статью по url и проверить, что summary еще не существует
+    url = canonicalize_url(url) or url
+    article_query = (
+        select(ArticleStorage.id, ArticleSummaryStorage.id.label("summary_id"))
+        .outerjoin(ArticleSummaryStorage)
+        .where(url_matches(url))
+    )
+    article = (await session.execute(article_query)).first()
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Article with url '{url}' not found",
         )
-
-    # Проверяем, что summary еще не существует
-    summary_query = select(ArticleSummaryStorage).where(
-        ArticleSummaryStorage.article_id == article.id
-    )
-    existing_summary = await session.scalar(summary_query)
-    if existing_summary:
+    if article.summary_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Summary for article '{url}' already exists",
         )
 
-    # Добавляем background task для генерации summary
-    background_tasks.add_task(
-        generate_summary_background_sync,
-        article_id=article.id,
-        content=article.content,
-    )
+    # Ставим генерацию summary в очередь
+    task = enqueue(session, "generate_summary", article_id=article.id)
+    await session.commit()
+    notify_workers()
 
     return {
         "message": f"Summary generation started for article '{url}'",
+        "task_id": task.task_id,
         "article_id": str(article.id),
         "status": "pending",
     }
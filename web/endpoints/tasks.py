@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from web.db.connection import get_session
+from web.db.models import TaskStorage
+from web.schemas import TaskResponse
+
+
+api_router = APIRouter()
+
+
+@api_router.get(
+    "/tasks/{task_id}",
+    response_model=TaskResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Task not found"}},
+)
+async def get_task(
+    task_id: str = Path(..., description="Task ID"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Получить состояние задачи из очереди по task_id
+    """
+    task_query = select(TaskStorage).where(TaskStorage.task_id == task_id)
+    task = await session.scalar(task_query)
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found",
+        )
+
+    return TaskResponse(
+        task_id=task.task_id,
+        task_type=task.task_type,
+        article_id=task.article_id,
+        group_id=task.group_id,
+        status=task.status,
+        attempts=task.attempts,
+        error=task.error,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+    )
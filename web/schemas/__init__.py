@@ -1,11 +1,63 @@
-from web.schemas.parse import ParseRequest, ParseResponse
+from web.schemas.article import ArticleStatusResponse, ArticleTreeResponse, TreeNode
+from web.schemas.graph import (
+    GraphNode,
+    GraphPathResponse,
+    GraphStatsResponse,
+    GraphTopResponse,
+)
+from web.schemas.parse import (
+    GroupProgressResponse,
+    ParseBatchRequest,
+    ParseBatchResponse,
+    ParseRequest,
+    ParseResponse,
+)
+from web.schemas.search import SearchResponse, SearchResult
+from web.schemas.stats import (
+    BulkLoadStats,
+    CacheStats,
+    CodecStats,
+    ContentStorageStatsResponse,
+    DatabasePoolStats,
+    DatabaseStatsResponse,
+    EventStatsResponse,
+    ResponseCacheStatsResponse,
+    SummaryCacheStatsResponse,
+    WorkerPoolStats,
+    WorkerPoolStatsResponse,
+    WorkerStats,
+)
 from web.schemas.summary import SummaryResponse
 from web.schemas.task import TaskResponse
 
 
 __all__ = [
+    "ArticleStatusResponse",
+    "ArticleTreeResponse",
+    "BulkLoadStats",
+    "CacheStats",
+    "CodecStats",
+    "ContentStorageStatsResponse",
+    "DatabasePoolStats",
+    "DatabaseStatsResponse",
+    "EventStatsResponse",
+    "GraphNode",
+    "GraphPathResponse",
+    "GraphStatsResponse",
+    "GraphTopResponse",
+    "GroupProgressResponse",
+    "ParseBatchRequest",
+    "ParseBatchResponse",
     "ParseRequest",
     "ParseResponse",
+    "ResponseCacheStatsResponse",
+    "SearchResponse",
+    "SearchResult",
+    "SummaryCacheStatsResponse",
     "SummaryResponse",
     "TaskResponse",
+    "TreeNode",
+    "WorkerPoolStats",
+    "WorkerPoolStatsResponse",
+    "WorkerStats",
 ]
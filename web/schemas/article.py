@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ArticleStatusResponse(BaseModel):
+    """Схема для ответа со статусом парсинга статьи"""
+
+    article_id: UUID = Field(
+        title="ID of the article", example="123e4567-e89b-12d3-a456-426614174000"
+    )
+    url: str = Field(
+        title="URL of the article",
+        example="https://en.wikipedia.org/wiki/Python_(programming_language)",
+    )
+    title: str = Field(
+        title="Title of the article", example="Python (programming language)"
+    )
+    status: str = Field(
+        title="Status of the article",
+        example="completed",
+        description="pending, processing, completed, failed, imported",
+    )
+    level: int = Field(title="Level of the article in its crawl tree", example=0)
+    created_at: datetime = Field(
+        title="Date and time of creation", example="2024-01-15T10:30:00Z"
+    )
+    updated_at: datetime = Field(
+        title="Date and time of last update", example="2024-01-15T10:30:00Z"
+    )
+
+
+class TreeNode(BaseModel):
+    """Схема для статьи в дереве обхода"""
+
+    article_id: UUID = Field(
+        title="ID of the article", example="123e4567-e89b-12d3-a456-426614174000"
+    )
+    parent_id: Optional[UUID] = Field(title="ID of the parent article", example=None)
+    url: str = Field(
+        title="URL of the article",
+        example="https://en.wikipedia.org/wiki/Python_(programming_language)",
+    )
+    title: str = Field(
+        title="Title of the article", example="Python (programming language)"
+    )
+    status: Optional[str] = Field(title="Status of the article", example="completed")
+    level: int = Field(title="Level of the article in its crawl tree", example=0)
+
+
+class ArticleTreeResponse(BaseModel):
+    """Схема для ответа со страницей дерева обхода"""
+
+    root_id: UUID = Field(
+        title="ID of the root article", example="123e4567-e89b-12d3-a456-426614174000"
+    )
+    nodes: List[TreeNode] = Field(title="Articles of the page in (level, id) order")
+    next_cursor: Optional[str] = Field(
+        title="Cursor of the next page, null on the last page",
+        example="1:5f0c2a1e-3b4d-4c6e-8f9a-0b1c2d3e4f5a",
+    )
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class GraphNode(BaseModel):
+    """Схема для статьи в графе ссылок"""
+
+    url: str = Field(
+        title="URL of the article",
+        example="https://en.wikipedia.org/wiki/Python_(programming_language)",
+    )
+    in_degree: int = Field(title="Number of stored links to the article", example=42)
+    out_degree: int = Field(title="Number of stored links of the article", example=310)
+    pagerank: float = Field(title="PageRank of the article", example=0.0012)
+
+
+class GraphTopResponse(BaseModel):
+    """Схема для ответа с самыми важными статьями графа"""
+
+    metric: str = Field(title="Ranking metric", example="pagerank")
+    nodes: List[GraphNode] = Field(title="Articles, best first")
+
+
+class GraphPathResponse(BaseModel):
+    """Схема для ответа с кратчайшим путем по ссылкам"""
+
+    source: str = Field(
+        title="URL of the first article",
+        example="https://en.wikipedia.org/wiki/Python_(programming_language)",
+    )
+    target: str = Field(
+        title="URL of the last article",
+        example="https://en.wikipedia.org/wiki/Guido_van_Rossum",
+    )
+    length: int = Field(title="Number of links on the path", example=1)
+    path: List[str] = Field(
+        title="URLs of the articles on the path",
+        example=[
+            "https://en.wikipedia.org/wiki/Python_(programming_language)",
+            "https://en.wikipedia.org/wiki/Guido_van_Rossum",
+        ],
+    )
+
+
+class GraphStatsResponse(BaseModel):
+    """Схема для ответа со статистикой графа ссылок"""
+
+    nodes: int = Field(title="Number of articles in the graph", example=120000)
+    edges: int = Field(title="Number of links in the graph", example=2500000)
+    version: Optional[int] = Field(title="Version of article_links", example=2500314)
+    built_at: Optional[datetime] = Field(
+        title="Date and time of the last rebuild", example="2024-01-15T10:30:00Z"
+    )
+    build_seconds: float = Field(title="Duration of the last rebuild", example=3.2)
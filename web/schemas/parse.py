@@ -1,3 +1,4 @@
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, HttpUrl, Field
@@ -10,11 +11,17 @@ class ParseRequest(BaseModel):
         title="URL of the article to parse",
         example="https://en.wikipedia.org/wiki/Python_(programming_language)",
     )
+    refresh: bool = Field(
+        default=False,
+        title="Refresh an already parsed article and its crawl tree",
+        example=False,
+    )
 
     model_config = {
         "json_schema_extra": {
             "example": {
-                "url": "https://en.wikipedia.org/wiki/Python_(programming_language)"
+                "url": "https://en.wikipedia.org/wiki/Python_(programming_language)",
+                "refresh": False,
             }
         }
     }
@@ -23,7 +30,9 @@ class ParseRequest(BaseModel):
 class ParseResponse(BaseModel):
     """Схема для ответа на запрос парсинга"""
 
-    task_id: str = Field(title="ID of the task", example="parse_task_123")
+    task_id: str = Field(
+        title="ID of the task", example="0b5cf9ce-6c4e-4b8f-a7a5-0d9e5c1f6f38"
+    )
     article_id: UUID = Field(
         title="ID of the article", example="123e4567-e89b-12d3-a456-426614174000"
     )
@@ -36,10 +45,66 @@ class ParseResponse(BaseModel):
     model_config = {
         "json_schema_extra": {
             "example": {
-                "task_id": "parse_task_123",
+                "task_id": "0b5cf9ce-6c4e-4b8f-a7a5-0d9e5c1f6f38",
                 "article_id": "123e4567-e89b-12d3-a456-426614174000",
                 "url": "https://en.wikipedia.org/wiki/Python_(programming_language)",
                 "status": "pending",
             }
         }
     }
+
+
+class ParseBatchRequest(BaseModel):
+    """Схема для пакетного запроса на парсинг статей"""
+
+    urls: List[str] = Field(
+        title="URLs of the articles to parse",
+        example=["https://en.wikipedia.org/wiki/Python_(programming_language)"],
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "urls": [
+                    "https://en.wikipedia.org/wiki/Python_(programming_language)",
+                    "https://en.m.wikipedia.org/wiki/Rust_(programming_language)",
+                ]
+            }
+        }
+    }
+
+
+class ParseBatchResponse(BaseModel):
+    """Схема для ответа на пакетный запрос парсинга"""
+
+    group_id: Optional[str] = Field(
+        title="ID of the job group, null when no article was queued",
+        example="5d0f3c2e-8a51-4d2b-9f0e-3b7c1a2e4d6f",
+    )
+    accepted: int = Field(title="Articles queued for parsing", example=2)
+    duplicates: int = Field(
+        title="URLs dropped as duplicates of another URL in the batch", example=0
+    )
+    existing: List[str] = Field(
+        title="Canonical URLs of articles that are already in the database",
+        example=[],
+    )
+    invalid: List[str] = Field(
+        title="Submitted URLs that are not Wikipedia articles", example=[]
+    )
+    status: str = Field(title="Status of the job group", example="pending")
+
+
+class GroupProgressResponse(BaseModel):
+    """Схема для ответа с прогрессом группы задач"""
+
+    group_id: str = Field(
+        title="ID of the job group", example="5d0f3c2e-8a51-4d2b-9f0e-3b7c1a2e4d6f"
+    )
+    total: int = Field(title="Number of tasks in the group", example=2)
+    pending: int = Field(title="Tasks waiting in the queue", example=1)
+    running: int = Field(title="Tasks being processed", example=1)
+    completed: int = Field(title="Completed tasks", example=0)
+    failed: int = Field(title="Tasks out of attempts", example=0)
+    progress: float = Field(title="Share of finished tasks, 0 to 1", example=0.0)
+    finished: bool = Field(title="Whether every task is finished", example=False)
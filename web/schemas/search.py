@@ -0,0 +1,38 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class SearchResult(BaseModel):
+    """Схема для найденной статьи"""
+
+    article_id: UUID = Field(
+        title="ID of the article", example="123e4567-e89b-12d3-a456-426614174000"
+    )
+    url: str = Field(
+        title="URL of the article",
+        example="https://en.wikipedia.org/wiki/Python_(programming_language)",
+    )
+    title: str = Field(
+        title="Title of the article", example="Python (programming language)"
+    )
+    rank: float = Field(title="Relevance of the article", example=0.4213)
+    headline: Optional[str] = Field(
+        title="Fragment of the content with the matches in <b> tags",
+        example="<b>Python</b> is a high-level, general-purpose programming language",
+    )
+    summary_headline: Optional[str] = Field(
+        title="Fragment of the summary with the matches in <b> tags", example=None
+    )
+
+
+class SearchResponse(BaseModel):
+    """Схема для ответа на поисковый запрос"""
+
+    query: str = Field(title="Search query", example="python programming")
+    results: List[SearchResult] = Field(title="Articles of the page, best first")
+    next_cursor: Optional[str] = Field(
+        title="Cursor of the next page, null on the last page",
+        example="0.4213:123e4567-e89b-12d3-a456-426614174000",
+    )
@@ -0,0 +1,156 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class WorkerStats(BaseModel):
+    """Схема для статистики одного воркера"""
+
+    name: str = Field(title="Name of the worker", example="parse-worker-0")
+    current_job: Optional[str] = Field(
+        title="Task type running right now", example="parse"
+    )
+    processed: int = Field(title="Number of completed jobs", example=42)
+    failed: int = Field(title="Number of failed jobs", example=1)
+    utilization: float = Field(
+        title="Share of uptime spent running jobs", example=0.75
+    )
+
+
+class WorkerPoolStats(BaseModel):
+    """Схема для статистики пула воркеров одной стадии"""
+
+    name: str = Field(title="Name of the pipeline stage", example="parse")
+    task_types: List[str] = Field(title="Task types of the stage", example=["parse"])
+    worker_count: int = Field(title="Number of workers", example=4)
+    queue_depth: int = Field(title="Pending tasks of the stage", example=10)
+    workers: List[WorkerStats] = Field(title="Per-worker statistics")
+
+
+class WorkerPoolStatsResponse(BaseModel):
+    """Схема для ответа со статистикой пулов воркеров"""
+
+    queue_depth: int = Field(title="Number of pending tasks in the queue", example=10)
+    pools: List[WorkerPoolStats] = Field(title="One pool per pipeline stage")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "queue_depth": 10,
+                "pools": [
+                    {
+                        "name": "parse",
+                        "task_types": ["parse"],
+                        "worker_count": 4,
+                        "queue_depth": 10,
+                        "workers": [
+                            {
+                                "name": "parse-worker-0",
+                                "current_job": "parse",
+                                "processed": 42,
+                                "failed": 1,
+                                "utilization": 0.75,
+                            }
+                        ],
+                    }
+                ],
+            }
+        }
+    }
+
+
+class DatabasePoolStats(BaseModel):
+    """Схема для статистики пула соединений одного event loop"""
+
+    pool_size: int = Field(title="Size of the pool", example=15)
+    max_overflow: int = Field(title="Connections allowed above pool_size", example=5)
+    checked_out: int = Field(title="Connections in use", example=3)
+    idle: int = Field(title="Idle connections in the pool", example=12)
+    saturation: float = Field(
+        title="checked_out / (pool_size + max_overflow)", example=0.15
+    )
+    checkouts: int = Field(title="Number of checkouts", example=1024)
+    checkout_timeouts: int = Field(title="Checkouts that failed", example=0)
+    checkout_wait_avg_ms: float = Field(
+        title="Average wait for a connection, ms", example=0.12
+    )
+    checkout_wait_max_ms: float = Field(
+        title="Longest wait for a connection, ms", example=8.5
+    )
+
+
+class BulkLoadStats(BaseModel):
+    """Схема для статистики COPY-загрузки одной таблицы"""
+
+    table: str = Field(title="Target table", example="articles")
+    loads: int = Field(title="Number of COPY batches", example=12)
+    rows: int = Field(title="Rows written", example=6000)
+    rows_per_second: float = Field(title="Write throughput", example=15000.0)
+
+
+class DatabaseStatsResponse(BaseModel):
+    """Схема для ответа со статистикой пулов соединений"""
+
+    pools: List[DatabasePoolStats] = Field(title="One pool per event loop")
+    bulk_loads: List[BulkLoadStats] = Field(title="COPY bulk loads per table")
+
+
+class CacheStats(BaseModel):
+    """Схема для статистики in-process кэша"""
+
+    size: int = Field(title="Number of entries", example=120)
+    max_size: int = Field(title="Maximum number of entries", example=1024)
+    hits: int = Field(title="Number of hits", example=300)
+    misses: int = Field(title="Number of misses", example=100)
+    evictions: int = Field(title="Entries evicted by size", example=0)
+    hit_rate: float = Field(title="hits / (hits + misses)", example=0.75)
+
+
+class SummaryCacheStatsResponse(BaseModel):
+    """Схема для ответа со статистикой кэша summary"""
+
+    memory: CacheStats = Field(title="In-process LRU tier")
+    db_hits: int = Field(title="Hits of the Postgres tier", example=40)
+    db_misses: int = Field(title="Misses of the Postgres tier", example=60)
+    db_hit_rate: float = Field(title="Hit rate of the Postgres tier", example=0.4)
+    hit_rate: float = Field(title="Hit rate of both tiers", example=0.85)
+
+
+class CodecStats(BaseModel):
+    """Схема для статистики хранения тел статей одним кодеком"""
+
+    codec: str = Field(title="Compression codec", example="zstd")
+    articles: int = Field(title="Number of stored bodies", example=3000)
+    raw_bytes: int = Field(title="Size of the UTF-8 content", example=90000000)
+    stored_bytes: int = Field(title="Size of the compressed data", example=25000000)
+
+
+class ContentStorageStatsResponse(BaseModel):
+    """Схема для ответа со статистикой хранения тел статей"""
+
+    articles: int = Field(title="Number of stored bodies", example=3000)
+    raw_bytes: int = Field(title="Size of the UTF-8 content", example=90000000)
+    stored_bytes: int = Field(title="Size of the compressed data", example=25000000)
+    ratio: float = Field(title="raw_bytes / stored_bytes", example=3.6)
+    savings: float = Field(title="Share of bytes saved", example=0.7222)
+    codecs: List[CodecStats] = Field(title="Per-codec statistics")
+
+
+class ResponseCacheStatsResponse(BaseModel):
+    """Схема для ответа со статистикой кэша ответов GET /summary"""
+
+    memory: CacheStats = Field(title="In-process LRU tier")
+    shared_enabled: bool = Field(title="Whether the Redis tier is used", example=False)
+    shared_hits: int = Field(title="Hits of the Redis tier", example=0)
+    shared_misses: int = Field(title="Misses of the Redis tier", example=0)
+
+
+class EventStatsResponse(BaseModel):
+    """Схема для ответа со статистикой потока событий прогресса"""
+
+    backend: str = Field(title="Event transport", example="memory")
+    published: int = Field(title="Events published by this replica", example=1200)
+    reconnects: int = Field(title="Reconnects of the LISTEN connection", example=0)
+    watched_roots: int = Field(title="Root articles with watchers", example=3)
+    subscribers: int = Field(title="Connected watchers", example=40)
+    dropped: int = Field(title="Events dropped for slow watchers", example=0)
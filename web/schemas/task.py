@@ -1,16 +1,36 @@
 from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 
 class TaskResponse(BaseModel):
     """Схема для ответа с информацией о задаче"""
 
-    task_id: str = Field(title="ID of the task", example="parse_task_123")
+    task_id: str = Field(
+        title="ID of the task", example="0b5cf9ce-6c4e-4b8f-a7a5-0d9e5c1f6f38"
+    )
+    task_type: str = Field(
+        title="Type of the task",
+        example="parse",
+        description="parse, generate_summary",
+    )
+    article_id: Optional[UUID] = Field(
+        title="ID of the article", example="123e4567-e89b-12d3-a456-426614174000"
+    )
+    group_id: Optional[str] = Field(
+        default=None,
+        title="ID of the job group of a batch submission",
+        example=None,
+    )
     status: str = Field(
         title="Status of the task",
         example="pending",
-        description="pending, processing, completed, failed",
+        description="pending, running, completed, failed",
     )
+    attempts: int = Field(title="Number of started attempts", example=1)
+    error: Optional[str] = Field(title="Error of the last attempt", example=None)
     created_at: datetime = Field(
         title="Date and time of creation", example="2024-01-15T10:30:00Z"
     )
@@ -21,8 +41,13 @@ class TaskResponse(BaseModel):
     model_config = {
         "json_schema_extra": {
             "example": {
-                "task_id": "parse_task_123",
+                "task_id": "0b5cf9ce-6c4e-4b8f-a7a5-0d9e5c1f6f38",
+                "task_type": "parse",
+                "article_id": "123e4567-e89b-12d3-a456-426614174000",
+                "group_id": None,
                 "status": "pending",
+                "attempts": 1,
+                "error": None,
                 "created_at": "2024-01-15T10:30:00Z",
                 "updated_at": "2024-01-15T10:30:00Z",
             }
@@ -9,10 +9,16 @@ setup(
         "uvicorn[standard]==0.34.3",
         "pydantic-settings==2.9.1",
         "groq==0.28.0",
-        "wikipedia-api==0.8.1",
+        "httpx==0.28.1",
         "sqlalchemy[asyncio]==2.0.41",
         "asyncpg==0.30.0",
         "alembic==1.16.2",
         "psycopg2-binary==2.9.10",
+        "numpy==2.2.6",
     ],
+    extras_require={
+        "redis": ["redis==5.2.1"],
+        "zstd": ["zstandard==0.23.0"],
+        "test": ["pytest==8.4.1"],
+    },
 )
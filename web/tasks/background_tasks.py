@@ -1,12 +1,34 @@
 import asyncio
-from typing import Optional
+from functools import partial
+from typing import List, Optional
+
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from web.db.models import ArticleStorage, ArticleSummaryStorage
 from web.db.connection.session import SessionManager
+from web.config.utils import get_settings
 from web.utils.groq_summary import get_summary
-from web.utils.wikiparse import get_article_text, get_article_title, get_linked_articles
+from web.utils.response_cache import get_summary_response_cache
+from web.utils.summary_cache import get_summary_cache
+from web.db.repositories import (
+    delete_summaries,
+    get_article_tree,
+    load_content,
+    save_contents,
+    update_article_pages,
+)
+from web.tasks.crawler import Crawler, CrawlNode
+from web.tasks.queue import enqueue
+from web.utils.events import (
+    COMPLETED,
+    FAILED,
+    STORED,
+    SUMMARIZED,
+    make_event,
+    publish_events,
+)
+from web.utils.wikiparse import fetch_page, fetch_revisions
 
 
 def _get_session_maker():
@@ -19,6 +41,7 @@ async def parse_article_background(
 ) -> None:
     """
     Background task для парсинга статьи Wikipedia с рекурсивным парсингом связанных статей
+    (обход в ширину до CRAWL_MAX_DEPTH уровней)
     """
     try:
         session_maker = _get_session_maker()
@@ -31,53 +54,29 @@ async def parse_article_background(
             await session.execute(update_query)
             await session.commit()
 
-            article_text = get_article_text(url)
-            article_title = get_article_title(url)
-
-            if not article_text:
-                raise Exception(f"Could not parse article content for {url}")
+            crawler = Crawler(
+                on_level_stored=partial(
+                    enqueue_summaries_background, root_id=article_id
+                )
+            )
+            visited = await crawler.run(article_id, url, level)
 
             update_query = (
                 update(ArticleStorage)
                 .where(ArticleStorage.id == article_id)
-                .values(
-                    title=article_title or "Unknown Title",
-                    content=article_text,
-                    status="completed",
-                )
+                .values(status="completed")
             )
             await session.execute(update_query)
             await session.commit()
 
-            await generate_summary_background(article_id, article_text)
-
-            if level < 5:
-                linked_articles = get_linked_articles(url, max_links=5)
-
-                for linked_article in linked_articles:
-                    existing_query = select(ArticleStorage).where(
-                        ArticleStorage.url == linked_article["url"]
-                    )
-                    existing = await session.scalar(existing_query)
-
-                    if not existing:
-                        new_linked_article = ArticleStorage(
-                            url=linked_article["url"],
-                            title=linked_article["title"],
-                            content=linked_article["content"],
-                            status="completed",
-                            level=level + 1,
-                            parent_id=article_id,
-                        )
-                        session.add(new_linked_article)
-                        await session.commit()
-                        await session.refresh(new_linked_article)
-
-                        await generate_summary_background(
-                            new_linked_article.id, linked_article["content"]
-                        )
-
-            print(f"Article {url} parsed successfully (level: {level})")
+            print(
+                f"Article {url} parsed successfully "
+                f"(level: {level}, visited: {visited})"
+            )
+            detail = f"visited: {visited}"
+            await publish_events(
+                [make_event(COMPLETED, article_id, article_id, url, level, detail)]
+            )
 
     except Exception as e:
         session_maker = _get_session_maker()
@@ -91,17 +90,31 @@ async def parse_article_background(
             await session.commit()
 
         print(f"Error parsing article {url}: {str(e)}")
+        await publish_events(
+            [make_event(FAILED, article_id, article_id, url, level, str(e))]
+        )
         raise
 
 
-async def generate_summary_background(article_id: int, content: str) -> None:
+async def generate_summary_background(
+    article_id: int, content: Optional[str] = None, root_id: Optional[str] = None
+) -> None:
     """
-    Background task для генерации summary статьи
+    Background task для генерации summary статьи.
+    Если content не передан, текст статьи берется из БД.
+    Одинаковый текст не суммаризуется повторно: результат берется из кэша.
+    Событие публикуется для корневой статьи дерева root_id.
     """
+    root_id = root_id or article_id
     try:
         session_maker = _get_session_maker()
         async with session_maker() as session:
-            existing_summary_query = select(ArticleSummaryStorage).where(
+            if content is None:
+                content = await load_content(session, article_id)
+            if not content:
+                raise Exception(f"Article {article_id} has no content")
+
+            existing_summary_query = select(ArticleSummaryStorage.id).where(
                 ArticleSummaryStorage.article_id == article_id
             )
             existing_summary = await session.scalar(existing_summary_query)
@@ -110,47 +123,133 @@ async def generate_summary_background(article_id: int, content: str) -> None:
                 print(f"Summary for article {article_id} already exists")
                 return
 
-            summary_text = get_summary(content)
+            model = get_settings().SUMMARY_MODEL
+            summary_cache = get_summary_cache()
+            summary_text = await summary_cache.get(content, model, session)
+            if summary_text is None:
+                summary_text = await get_summary(
+                    content, model, chunk_cache=summary_cache
+                )
+                await summary_cache.put(content, model, summary_text, session)
 
             new_summary = ArticleSummaryStorage(
                 article_id=article_id,
                 text=summary_text,
-                model_used="groq-gemma2-9b-it",
+                model_used=f"groq-{model}",
             )
             session.add(new_summary)
             await session.commit()
             await session.refresh(new_summary)
 
+            url = await session.scalar(
+                select(ArticleStorage.url).where(ArticleStorage.id == article_id)
+            )
+            await get_summary_response_cache().invalidate([url])
+
             print(f"Summary generated for article {article_id}")
+            await publish_events([make_event(SUMMARIZED, root_id, article_id, url)])
 
     except Exception as e:
         print(f"Error generating summary for article {article_id}: {str(e)}")
+        await publish_events(
+            [make_event(FAILED, root_id, article_id, detail=f"summary: {str(e)}")]
+        )
         raise
 
 
-def parse_article_background_sync(
-    article_id: int, url: str, parent_id: Optional[int] = None, level: int = 0
-) -> None:
+async def refresh_article_background(article_id: int, url: str) -> str:
     """
-    Синхронная обертка для parse_article_background
+    Background task для инкрементального обновления дерева статей.
+    Сначала одним дешевым запросом на 50 статей узнаем текущие ревизии,
+    полный текст скачиваем и summary пересоздаем только для измененных статей.
     """
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(
-            parse_article_background(article_id, url, parent_id, level)
+    session_maker = _get_session_maker()
+    async with session_maker() as session:
+        tree = await get_article_tree(session, article_id)
+
+    revisions = await fetch_revisions(row.url for row in tree)
+    changed = [
+        row
+        for row in tree
+        if revisions.get(row.url) is not None
+        and revisions[row.url] != row.revision_id
+    ]
+
+    pages = await asyncio.gather(*(fetch_page(row.url) for row in changed))
+    updated = [(row, page) for row, page in zip(changed, pages) if page]
+
+    async with session_maker() as session:
+        await update_article_pages(
+            session,
+            [
+                {
+                    "id": row.id,
+                    "title": page.title,
+                    "revision_id": page.revision_id,
+                    "last_modified": page.last_modified,
+                }
+                for row, page in updated
+            ],
         )
-    finally:
-        loop.close()
+        await save_contents(session, {row.id: page.text for row, page in updated})
+        await delete_summaries(session, [row.id for row, _ in updated])
+        for row, _ in updated:
+            if should_summarize(row.level):
+                enqueue(
+                    session,
+                    "generate_summary",
+                    article_id=row.id,
+                    payload={"root_id": str(article_id)},
+                )
+        await session.commit()
+    await get_summary_response_cache().invalidate(row.url for row, _ in updated)
+
+    result = f"checked: {len(tree)}, updated: {len(updated)}"
+    print(f"Article {url} refreshed ({result})")
+    await publish_events(
+        [
+            make_event(STORED, article_id, row.id, row.url, row.level)
+            for row, _ in updated
+        ]
+        + [make_event(COMPLETED, article_id, article_id, url, 0, result)]
+    )
+    return result
+
+
+def should_summarize(level: int) -> bool:
+    """
+    Политика генерации summary (SUMMARY_POLICY):
+    root — только исходная статья, levels — уровни до SUMMARY_MAX_LEVEL, all — все.
+    """
+    settings = get_settings()
+    if settings.SUMMARY_POLICY == "all":
+        return True
+    if settings.SUMMARY_POLICY == "levels":
+        return level <= settings.SUMMARY_MAX_LEVEL
+    return level == 0
 
 
-def generate_summary_background_sync(article_id: int, content: str) -> None:
+async def enqueue_summaries_background(
+    nodes: List[CrawlNode], root_id: Optional[int] = None
+) -> None:
     """
-    Синхронная обертка для generate_summary_background
+    Ставит генерацию summary сохраненных статей уровня в очередь задач.
+    Обход не ждет LLM: summary выполняет отдельный пул воркеров.
     """
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(generate_summary_background(article_id, content))
-    finally:
-        loop.close()
+    payload = {"root_id": str(root_id)} if root_id else None
+    article_ids = [node.article_id for node in nodes if should_summarize(node.level)]
+    if not article_ids:
+        return
+
+    session_maker = _get_session_maker()
+    async with session_maker() as session:
+        for article_id in article_ids:
+            enqueue(session, "generate_summary", article_id=article_id, payload=payload)
+        await session.commit()
+
+
+TASK_HANDLERS = {
+    "parse": parse_article_background,
+    "refresh": refresh_article_background,
+    "generate_summary": generate_summary_background,
+}
@@ -0,0 +1,443 @@
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from sqlalchemy import and_, select
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleStorage, ArticleLinkStorage
+from web.db.repositories import (
+    get_existing_urls,
+    insert_articles,
+    insert_links,
+    mark_links_parsed,
+    save_contents,
+    update_article_pages,
+)
+from web.utils.canonical import get_canonical_keys, get_lang
+from web.utils.events import FAILED, FETCHED, STORED, make_event, publish_events
+from web.utils.link_rank import LinkScorer, get_link_scorer, rank_links
+from web.utils.wikidump import DumpSource
+from web.utils.wikiparse import (
+    TITLES_PER_QUERY,
+    WikiPage,
+    WikipediaSource,
+    get_article_url,
+)
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class CrawlNode:
+    """Article waiting in the crawl frontier"""
+
+    article_id: UUID
+    url: str
+    level: int
+    parent_id: Optional[UUID] = None
+    is_parsed: bool = False
+    is_stored: bool = False
+    page: Optional[WikiPage] = None
+    # Ids of the ancestors from the crawl root
+    path: Tuple[UUID, ...] = ()
+
+
+LevelCallback = Callable[[List[CrawlNode]], Awaitable[None]]
+
+
+class PageSource(Protocol):
+    async def fetch_page(self, url: str) -> Optional[WikiPage]: ...
+
+    async def resolve_articles(self, urls: List[str]) -> Dict[str, Optional[str]]: ...
+
+
+def get_page_source() -> PageSource:
+    """Live MediaWiki API, or articles imported from a dump (CRAWL_SOURCE=dump)"""
+    if get_settings().CRAWL_SOURCE == "dump":
+        return DumpSource()
+    return WikipediaSource()
+
+
+class Crawler:
+    """
+    Breadth-first Wikipedia crawler.
+
+    The frontier is expanded one level at a time by a fixed number of worker
+    coroutines, so the number of coroutines does not grow with the tree size.
+    Every visited URL is remembered in memory, so duplicates are dropped before
+    any database lookup or HTTP request. The links of a page are taken from a
+    priority queue ranked by a LinkScorer, so the max_links budget of a page
+    goes to its most relevant links rather than the first ones alphabetically.
+
+    Each level is persisted in one transaction: one `url = ANY(:urls)` lookup
+    for the whole level, one bulk insert of the new articles and their edges.
+
+    Every outgoing link of a stored page is kept in `article_links` for the
+    link graph. Crawl edges are the rows whose target article has the
+    source as its parent. An edge is marked `is_parsed` once its target
+    article has been expanded, so an interrupted crawl can be restarted from
+    the root: expanded articles are walked through the stored edges and only
+    the rest are fetched again.
+
+    Pages come from a PageSource: the live MediaWiki API, or articles imported
+    from a dump for fully offline crawls.
+
+    Fetched, stored and failed articles are published as progress events of
+    the root article.
+    """
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_links: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        on_level_stored: Optional[LevelCallback] = None,
+        source: Optional[PageSource] = None,
+        scorer: Optional[LinkScorer] = None,
+    ) -> None:
+        settings = get_settings()
+        self.max_depth = settings.CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.max_links = settings.CRAWL_MAX_LINKS if max_links is None else max_links
+        self.concurrency = concurrency or settings.CRAWL_CONCURRENCY
+        self.on_level_stored = on_level_stored
+        self.source = source or get_page_source()
+        self.scorer = scorer or get_link_scorer()
+        self.session_maker = SessionManager().get_session_maker()
+        self.seen: Set[str] = set()
+        self.root_id: Optional[UUID] = None
+
+    async def run(self, article_id: UUID, url: str, level: int = 0) -> int:
+        """Crawl the tree under the article, return the number of visited URLs"""
+        self.root_id = article_id
+        root = CrawlNode(
+            article_id=article_id,
+            url=url,
+            level=level,
+            is_parsed=await self._has_links(article_id),
+        )
+        self.seen.add(url)
+
+        # The root is fetched outside the workers so that its errors propagate
+        if not root.is_parsed:
+            root.page = await self._get_page(root)
+
+        frontier = [root]
+        while frontier:
+            frontier = await self._crawl_level(frontier)
+
+        return len(self.seen)
+
+    async def _crawl_level(self, frontier: List[CrawlNode]) -> List[CrawlNode]:
+        next_frontier = await self._load_children(
+            [node for node in frontier if node.is_parsed]
+        )
+
+        pending = [node for node in frontier if not node.is_parsed]
+        pages = await self._run_workers(pending, self._get_page)
+        expanded = [node for node in pending if node.article_id in pages]
+        await self._publish(FETCHED, expanded)
+        await self._publish(
+            FAILED,
+            [node for node in pending if node.article_id not in pages],
+            "Could not fetch the article",
+        )
+
+        candidates = {
+            node.article_id: self._get_candidates(pages[node.article_id])
+            for node in expanded
+            if node.level < self.max_depth
+        }
+        async with self.session_maker() as session:
+            stored = await get_existing_urls(
+                session, (url for urls in candidates.values() for url in urls)
+            )
+
+        children = await self._run_workers(
+            [node for node in expanded if node.article_id in candidates],
+            lambda node: self._fetch_children(
+                pages[node.article_id], candidates[node.article_id], stored
+            ),
+        )
+
+        next_frontier.extend(await self._store_level(expanded, pages, children))
+        return next_frontier
+
+    async def _run_workers(
+        self,
+        nodes: List[CrawlNode],
+        func: Callable[[CrawlNode], Awaitable[T]],
+    ) -> Dict[UUID, T]:
+        """Apply func to the nodes with a fixed number of worker coroutines"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for node in nodes:
+            queue.put_nowait(node)
+
+        results: Dict[UUID, T] = {}
+
+        async def worker() -> None:
+            while not queue.empty():
+                node = queue.get_nowait()
+                try:
+                    results[node.article_id] = await func(node)
+                except Exception as e:
+                    print(f"Error crawling article {node.url}: {str(e)}")
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.concurrency, len(nodes))))
+        )
+        return results
+
+    async def _get_page(self, node: CrawlNode) -> WikiPage:
+        if node.page is not None:
+            return node.page
+        page = await self.source.fetch_page(node.url)
+        if not page:
+            raise Exception(f"Could not parse article content for {node.url}")
+        return page
+
+    @staticmethod
+    def _get_link_urls(page: WikiPage) -> Dict[str, str]:
+        """
+        Canonical urls of the page links mapped to the link titles. Known
+        redirects are replaced by their target before any request is made.
+        """
+        lang = get_lang(page.url)
+        canonical_keys = get_canonical_keys()
+        link_urls: Dict[str, str] = {}
+        for title in page.links:
+            url = canonical_keys.canonicalize(get_article_url(title, lang))
+            if url and url not in link_urls:
+                link_urls[url] = title
+        return link_urls
+
+    def _get_candidates(self, page: WikiPage) -> Dict[str, str]:
+        """Canonical urls of the page links that were not seen yet, with titles"""
+        return {
+            url: title
+            for url, title in self._get_link_urls(page).items()
+            if url not in self.seen
+        }
+
+    async def _fetch_children(
+        self, page: WikiPage, candidates: Dict[str, str], stored: Set[str]
+    ) -> List[WikiPage]:
+        """
+        Fetch up to max_links new children, best ranked links first.
+        Candidates are popped from the frontier and resolved in batches of
+        TITLES_PER_QUERY titles, so only existing articles that are not
+        redirects to already seen pages are downloaded.
+        """
+        frontier = await rank_links(
+            page.text,
+            {url: title for url, title in candidates.items() if url not in stored},
+            self.scorer,
+        )
+
+        children: List[WikiPage] = []
+        while frontier and len(children) < self.max_links:
+            batch = [
+                url for url in frontier.pop(TITLES_PER_QUERY) if url not in self.seen
+            ]
+            resolved = await self.source.resolve_articles(batch)
+
+            # Resolved in the order of the batch, so targets stay best first
+            targets: Dict[str, str] = {}
+            for url in batch:
+                target = resolved.get(url)
+                if target is None or target in self.seen or target in stored:
+                    self.seen.add(url)
+                elif target not in targets:
+                    targets[target] = url
+
+            while targets and len(children) < self.max_links:
+                # Other workers of the level may have taken a target meanwhile
+                for target in [target for target in targets if target in self.seen]:
+                    targets.pop(target)
+                window = list(targets)[: self.max_links - len(children)]
+                for url in window:
+                    self.seen.update((url, targets.pop(url)))
+
+                pages = await asyncio.gather(
+                    *(self.source.fetch_page(url) for url in window)
+                )
+                children.extend(page for page in pages if page)
+
+        return children
+
+    async def _publish(
+        self, event: str, nodes: List[CrawlNode], detail: Optional[str] = None
+    ) -> None:
+        await publish_events(
+            make_event(
+                event, self.root_id, node.article_id, node.url, node.level, detail
+            )
+            for node in nodes
+        )
+
+    async def _has_links(self, article_id: UUID) -> bool:
+        """Whether the article was already expanded by a crawl"""
+        async with self.session_maker() as session:
+            query = (
+                select(ArticleStorage.id)
+                .where(ArticleStorage.parent_id == article_id)
+                .limit(1)
+            )
+            return await session.scalar(query) is not None
+
+    async def _load_children(self, nodes: List[CrawlNode]) -> List[CrawlNode]:
+        """Restore the children of already expanded articles from stored edges"""
+        nodes = [node for node in nodes if node.level + 1 < self.max_depth]
+        if not nodes:
+            return []
+
+        levels = {node.article_id: node.level for node in nodes}
+        paths = {node.article_id: node.path + (node.article_id,) for node in nodes}
+        async with self.session_maker() as session:
+            query = (
+                select(
+                    ArticleStorage.id,
+                    ArticleStorage.url,
+                    ArticleLinkStorage.source_article_id,
+                    ArticleLinkStorage.is_parsed,
+                )
+                .join(
+                    ArticleLinkStorage,
+                    and_(
+                        ArticleLinkStorage.target_url == ArticleStorage.url,
+                        ArticleLinkStorage.source_article_id
+                        == ArticleStorage.parent_id,
+                    ),
+                )
+                .where(ArticleLinkStorage.source_article_id.in_(list(levels)))
+            )
+            rows = (await session.execute(query)).all()
+
+        children = []
+        for article_id, url, source_id, is_parsed in rows:
+            if url in self.seen:
+                continue
+            self.seen.add(url)
+            children.append(
+                CrawlNode(
+                    article_id=article_id,
+                    url=url,
+                    level=levels[source_id] + 1,
+                    parent_id=source_id,
+                    is_parsed=is_parsed,
+                    is_stored=True,
+                    path=paths[source_id],
+                )
+            )
+        return children
+
+    async def _store_level(
+        self,
+        nodes: List[CrawlNode],
+        pages: Dict[UUID, WikiPage],
+        children: Dict[UUID, List[WikiPage]],
+    ) -> List[CrawlNode]:
+        """Persist a whole crawl level in one transaction"""
+        refetched = [node for node in nodes if not node.is_stored]
+        stored_nodes: List[CrawlNode] = []
+
+        async with self.session_maker() as session:
+            await update_article_pages(
+                session,
+                [
+                    {
+                        "id": node.article_id,
+                        "title": pages[node.article_id].title or "Unknown Title",
+                        "revision_id": pages[node.article_id].revision_id,
+                        "last_modified": pages[node.article_id].last_modified,
+                    }
+                    for node in refetched
+                ],
+            )
+
+            child_nodes = [
+                CrawlNode(
+                    article_id=node.article_id,
+                    url=page.url,
+                    level=node.level + 1,
+                    parent_id=node.article_id,
+                    is_parsed=node.level + 1 >= self.max_depth,
+                    is_stored=True,
+                    page=page,
+                    path=node.path + (node.article_id,),
+                )
+                for node in nodes
+                for page in children.get(node.article_id, [])
+            ]
+            inserted = await insert_articles(
+                session,
+                [
+                    {
+                        "url": child.url,
+                        "title": child.page.title,
+                        "revision_id": child.page.revision_id,
+                        "last_modified": child.page.last_modified,
+                        "status": "completed",
+                        "level": child.level,
+                        "parent_id": child.parent_id,
+                        "path": list(child.path),
+                    }
+                    for child in child_nodes
+                ],
+            )
+
+            for child in child_nodes:
+                if child.url in inserted:
+                    child.article_id = inserted[child.url]
+                    stored_nodes.append(child)
+            contents = {node.article_id: node.page.text for node in stored_nodes}
+            for node in refetched:
+                contents[node.article_id] = pages[node.article_id].text
+            await save_contents(session, contents)
+
+            # Every outgoing link of a page is recorded once, when the page is
+            # stored; crawl edges to the stored children override them
+            edges: Dict[Tuple[UUID, str], dict] = {}
+            new_pages = [(node, pages[node.article_id]) for node in refetched]
+            new_pages.extend((child, child.page) for child in stored_nodes)
+            for node, page in new_pages:
+                for url, title in self._get_link_urls(page).items():
+                    edges[(node.article_id, url)] = {
+                        "source_article_id": node.article_id,
+                        "target_url": url,
+                        "target_title": title,
+                        "is_parsed": False,
+                    }
+            for child in stored_nodes:
+                edges[(child.parent_id, child.url)] = {
+                    "source_article_id": child.parent_id,
+                    "target_url": child.url,
+                    "target_title": child.page.title,
+                    "is_parsed": child.is_parsed,
+                }
+            await insert_links(session, list(edges.values()))
+
+            await mark_links_parsed(
+                session,
+                [(node.parent_id, node.url) for node in nodes if node.parent_id],
+            )
+            await session.commit()
+
+        await self._publish(STORED, refetched + stored_nodes)
+        if self.on_level_stored:
+            await self.on_level_stored(refetched + stored_nodes)
+
+        return [node for node in stored_nodes if not node.is_parsed]
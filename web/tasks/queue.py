@@ -0,0 +1,228 @@
+import random
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.utils import get_settings
+from web.db.models import TaskStorage
+
+
+ENQUEUE_CHUNK_SIZE = 1000
+
+
+def enqueue(
+    session: AsyncSession,
+    task_type: str,
+    article_id: Optional[UUID] = None,
+    payload: Optional[dict] = None,
+) -> TaskStorage:
+    """
+    Add a task to the queue. The task is visible to workers after the caller
+    commits, so it can be created in the same transaction as the article.
+    """
+    task = TaskStorage(
+        task_id=str(uuid4()),
+        task_type=task_type,
+        article_id=article_id,
+        status="pending",
+        payload=payload or {},
+        max_attempts=get_settings().TASK_MAX_ATTEMPTS,
+    )
+    session.add(task)
+    return task
+
+
+async def enqueue_many(
+    session: AsyncSession,
+    task_type: str,
+    tasks: Iterable[Tuple[Optional[UUID], dict]],
+    group_id: Optional[str] = None,
+) -> int:
+    """
+    Add many tasks of one type, given as (article_id, payload) pairs, with
+    one multi-row INSERT per ENQUEUE_CHUNK_SIZE tasks. Like `enqueue`, the
+    tasks become visible when the caller commits. Returns the task count.
+    """
+    max_attempts = get_settings().TASK_MAX_ATTEMPTS
+    rows = [
+        {
+            "task_id": str(uuid4()),
+            "task_type": task_type,
+            "article_id": article_id,
+            "group_id": group_id,
+            "status": "pending",
+            "payload": payload,
+            "max_attempts": max_attempts,
+        }
+        for article_id, payload in tasks
+    ]
+    for start in range(0, len(rows), ENQUEUE_CHUNK_SIZE):
+        chunk = rows[start : start + ENQUEUE_CHUNK_SIZE]
+        await session.execute(insert(TaskStorage).values(chunk))
+    return len(rows)
+
+
+async def claim(
+    session: AsyncSession, task_types: Iterable[str], worker_id: str
+) -> Optional[TaskStorage]:
+    """
+    Take the oldest due task and lease it to the worker.
+    `FOR UPDATE SKIP LOCKED` lets any number of workers poll the table at once
+    without ever handing the same task to two of them.
+    A task whose lease expired after its last attempt crashed or stalled
+    every worker that ran it, so it is marked failed instead of reclaimed.
+    """
+    now = func.now()
+    await session.execute(
+        update(TaskStorage)
+        .where(
+            TaskStorage.task_type.in_(list(task_types)),
+            TaskStorage.status == "running",
+            TaskStorage.lease_expires_at < now,
+            TaskStorage.attempts >= TaskStorage.max_attempts,
+        )
+        .values(
+            status="failed",
+            error="Lease expired on the last attempt",
+            locked_by=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    query = (
+        select(TaskStorage)
+        .where(
+            TaskStorage.task_type.in_(list(task_types)),
+            or_(
+                and_(TaskStorage.status == "pending", TaskStorage.run_at <= now),
+                and_(
+                    TaskStorage.status == "running",
+                    TaskStorage.lease_expires_at < now,
+                    TaskStorage.attempts < TaskStorage.max_attempts,
+                ),
+            ),
+        )
+        .order_by(TaskStorage.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    task = await session.scalar(query)
+    if task is None:
+        await session.commit()
+        return None
+
+    task.status = "running"
+    task.locked_by = worker_id
+    task.attempts = TaskStorage.attempts + 1
+    task.lease_expires_at = now + _seconds(get_settings().TASK_LEASE_SECONDS)
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+async def extend_lease(session: AsyncSession, task_id: UUID, worker_id: str) -> bool:
+    """
+    Keep a long running task from being reclaimed by another worker.
+    Returns False when the worker no longer holds the lease.
+    """
+    update_query = (
+        update(TaskStorage)
+        .where(
+            TaskStorage.id == task_id,
+            TaskStorage.locked_by == worker_id,
+            TaskStorage.status == "running",
+        )
+        .values(
+            lease_expires_at=func.now() + _seconds(get_settings().TASK_LEASE_SECONDS)
+        )
+    )
+    result = await session.execute(update_query)
+    await session.commit()
+    return result.rowcount > 0
+
+
+async def complete(
+    session: AsyncSession,
+    task_id: UUID,
+    worker_id: str,
+    result: Optional[str] = None,
+) -> bool:
+    """
+    Store the result of a task. Only the worker holding the lease may do so:
+    returns False when the task was reclaimed by another worker meanwhile.
+    """
+    update_query = (
+        update(TaskStorage)
+        .where(TaskStorage.id == task_id, TaskStorage.locked_by == worker_id)
+        .values(
+            status="completed",
+            result=result,
+            error=None,
+            locked_by=None,
+            lease_expires_at=None,
+        )
+    )
+    updated = await session.execute(update_query)
+    await session.commit()
+    return updated.rowcount > 0
+
+
+async def fail(
+    session: AsyncSession, task: TaskStorage, worker_id: str, error: str
+) -> bool:
+    """
+    Return the task to the queue with exponential backoff and jitter,
+    or mark it failed when it is out of attempts. Like `complete`, returns
+    False when the worker no longer holds the lease.
+    """
+    values = {"error": error, "locked_by": None, "lease_expires_at": None}
+    if task.attempts >= task.max_attempts:
+        values["status"] = "failed"
+    else:
+        values["status"] = "pending"
+        values["run_at"] = func.now() + _seconds(_backoff(task.attempts))
+
+    update_query = (
+        update(TaskStorage)
+        .where(TaskStorage.id == task.id, TaskStorage.locked_by == worker_id)
+        .values(**values)
+    )
+    result = await session.execute(update_query)
+    await session.commit()
+    return result.rowcount > 0
+
+
+async def queue_depth(
+    session: AsyncSession, task_types: Optional[Iterable[str]] = None
+) -> int:
+    """Number of tasks waiting to be claimed"""
+    query = select(func.count(TaskStorage.id)).where(TaskStorage.status == "pending")
+    if task_types is not None:
+        query = query.where(TaskStorage.task_type.in_(list(task_types)))
+    return await session.scalar(query)
+
+
+async def group_progress(session: AsyncSession, group_id: str) -> Dict[str, int]:
+    """Number of tasks of a job group per status"""
+    query = (
+        select(TaskStorage.status, func.count(TaskStorage.id))
+        .where(TaskStorage.group_id == group_id)
+        .group_by(TaskStorage.status)
+    )
+    return dict((await session.execute(query)).all())
+
+
+def _backoff(attempt: int) -> float:
+    settings = get_settings()
+    delay = min(
+        settings.TASK_RETRY_BACKOFF * 2 ** (attempt - 1),
+        settings.TASK_RETRY_BACKOFF_MAX,
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _seconds(seconds: float) -> timedelta:
+    return timedelta(seconds=seconds)
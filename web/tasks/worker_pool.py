@@ -0,0 +1,261 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import TaskStorage
+from web.tasks import queue
+from web.tasks.background_tasks import TASK_HANDLERS
+from web.utils.groq_summary import close_summary_client
+from web.utils.response_cache import get_summary_response_cache
+from web.utils.wikifetch import close_fetcher
+
+
+TaskHandler = Callable[..., Awaitable[Optional[str]]]
+
+
+class Worker(threading.Thread):
+    """
+    Thread that owns one long-lived event loop and runs tasks claimed from
+    the `tasks` table on it. Connections and HTTP clients created by the tasks
+    stay bound to this loop and are reused by every following task.
+    """
+
+    def __init__(
+        self, handlers: Dict[str, TaskHandler], pool_name: str, index: int
+    ) -> None:
+        super().__init__(name=f"{pool_name}-worker-{index}", daemon=True)
+        self.handlers = handlers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{self.name}"
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stopping = threading.Event()
+        self._wakeup: Optional[asyncio.Event] = None
+        self.started_at = time.monotonic()
+        self.busy_seconds = 0.0
+        self.processed = 0
+        self.failed = 0
+        self.current_job: Optional[str] = None
+        self._job_started_at: Optional[float] = None
+
+    def run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        finally:
+            self.loop.run_until_complete(close_fetcher())
+            self.loop.run_until_complete(close_summary_client())
+            self.loop.run_until_complete(get_summary_response_cache().close())
+            self.loop.run_until_complete(SessionManager().dispose())
+            self.loop.close()
+
+    def wakeup(self) -> None:
+        """Interrupt the poll sleep, called from any thread"""
+        if self.loop is not None and self._wakeup is not None:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _serve(self) -> None:
+        self._wakeup = asyncio.Event()
+        poll_interval = get_settings().WORKER_POLL_INTERVAL
+        session_maker = SessionManager().get_session_maker()
+
+        while not self.stopping.is_set():
+            try:
+                async with session_maker() as session:
+                    task = await queue.claim(session, self.handlers, self.worker_id)
+            except Exception as e:
+                print(f"Could not claim a task in {self.name}: {str(e)}")
+                task = None
+
+            if task is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run_task(task, session_maker)
+            except Exception as e:
+                print(f"Could not run task {task.task_id} in {self.name}: {str(e)}")
+
+    async def _run_task(self, task: TaskStorage, session_maker) -> None:
+        self.current_job = task.task_type
+        self._job_started_at = time.monotonic()
+        job = asyncio.ensure_future(self._call_handler(task))
+        heartbeat = asyncio.create_task(self._heartbeat(task, session_maker, job))
+        try:
+            result = await job
+            async with session_maker() as session:
+                if await queue.complete(session, task.id, self.worker_id, result):
+                    self.processed += 1
+                else:
+                    print(f"Task {task.task_id} was reclaimed, result dropped")
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise
+            print(f"Task {task.task_id} abandoned by {self.name}: lease lost")
+        except Exception as e:
+            self.failed += 1
+            print(f"Task {task.task_id} failed in {self.name}: {str(e)}")
+            try:
+                async with session_maker() as session:
+                    await queue.fail(session, task, self.worker_id, str(e))
+            except Exception as error:
+                # The lease expires and the task is claimed again
+                print(f"Could not mark task {task.task_id} failed: {str(error)}")
+        finally:
+            heartbeat.cancel()
+            job.cancel()
+            self.busy_seconds += time.monotonic() - self._job_started_at
+            self.current_job = None
+            self._job_started_at = None
+
+    async def _call_handler(self, task: TaskStorage) -> Optional[str]:
+        handler = self.handlers[task.task_type]
+        return await handler(article_id=task.article_id, **task.payload)
+
+    async def _heartbeat(
+        self, task: TaskStorage, session_maker, job: asyncio.Future
+    ) -> None:
+        """
+        Extend the lease every third of TASK_LEASE_SECONDS. Failed extensions
+        are retried until the lease would run out; once it is lost another
+        worker may claim the task, so the job is cancelled.
+        """
+        lease_seconds = get_settings().TASK_LEASE_SECONDS
+        interval = lease_seconds / 3
+        extended_at = time.monotonic()
+        delay = interval
+        while True:
+            await asyncio.sleep(delay)
+            if time.monotonic() - extended_at >= lease_seconds:
+                print(f"Lease of task {task.task_id} expired in {self.name}")
+                break
+            sent_at = time.monotonic()
+            try:
+                async with session_maker() as session:
+                    if not await queue.extend_lease(session, task.id, self.worker_id):
+                        print(f"Lease of task {task.task_id} taken from {self.name}")
+                        break
+            except Exception as e:
+                print(f"Could not extend the lease of task {task.task_id}: {str(e)}")
+                delay = min(interval, 1.0)
+                continue
+            extended_at = sent_at
+            delay = interval
+        job.cancel()
+
+    @property
+    def utilization(self) -> float:
+        busy = self.busy_seconds
+        if self._job_started_at is not None:
+            busy += time.monotonic() - self._job_started_at
+        uptime = time.monotonic() - self.started_at
+        return busy / uptime if uptime > 0 else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "current_job": self.current_job,
+            "processed": self.processed,
+            "failed": self.failed,
+            "utilization": round(self.utilization, 4),
+        }
+
+
+class WorkerPool:
+    """
+    Fixed set of worker threads, each with its own event loop, that poll the
+    durable task queue for the task types of one pipeline stage. Any number
+    of API and worker replicas can run pools against the same database.
+    """
+
+    def __init__(
+        self, name: str, worker_count: int, handlers: Dict[str, TaskHandler]
+    ) -> None:
+        self.name = name
+        self.worker_count = worker_count
+        self.handlers = handlers
+        self.workers: List[Worker] = []
+
+    def start(self) -> None:
+        if self.workers:
+            return
+        self.workers = [
+            Worker(self.handlers, self.name, index)
+            for index in range(self.worker_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def notify(self) -> None:
+        """Wake idle workers after new tasks were committed"""
+        for worker in self.workers:
+            worker.wakeup()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Let running tasks finish and stop the workers. Tasks still running after
+        the timeout keep their lease and are claimed again once it expires.
+        """
+        for worker in self.workers:
+            worker.stopping.set()
+        self.notify()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self.workers:
+            if deadline is None:
+                worker.join()
+            else:
+                worker.join(max(0.0, deadline - time.monotonic()))
+        self.workers = []
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "task_types": list(self.handlers),
+            "worker_count": self.worker_count,
+            "workers": [worker.stats() for worker in self.workers],
+        }
+
+
+# Pipeline stages: the crawl finishes at fetch/DB speed and summaries
+# drain independently with their own number of workers
+POOL_TASK_TYPES = {
+    "parse": ("parse", "refresh"),
+    "summary": ("generate_summary",),
+}
+
+_worker_pools: Optional[Dict[str, WorkerPool]] = None
+
+
+def get_worker_pools() -> Dict[str, WorkerPool]:
+    """Get the process-wide worker pools, one per pipeline stage"""
+    global _worker_pools
+    if _worker_pools is None:
+        settings = get_settings()
+        worker_counts = {
+            "parse": settings.WORKER_COUNT,
+            "summary": settings.SUMMARY_WORKER_COUNT,
+        }
+        _worker_pools = {
+            name: WorkerPool(
+                name,
+                worker_counts[name],
+                {task_type: TASK_HANDLERS[task_type] for task_type in task_types},
+            )
+            for name, task_types in POOL_TASK_TYPES.items()
+        }
+    return _worker_pools
+
+
+def notify_workers() -> None:
+    """Wake idle workers of every pool after new tasks were committed"""
+    for pool in get_worker_pools().values():
+        pool.notify()
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from web.db.connection.session import SessionManager
+
+
+async def _ping() -> bool:
+    try:
+        async with SessionManager().engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+    finally:
+        await SessionManager().dispose()
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    """Skip tests that need PostgreSQL with the schema when it is not reachable"""
+    if not asyncio.run(_ping()):
+        pytest.skip("PostgreSQL is not available")
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from web.utils.wikifetch import FetchLimits, WikiFetcher
+
+
+class FakeWikipedia:
+    """
+    Local stand-in for the MediaWiki API: answers the page queries of
+    fetch_page and the info queries of resolve_articles from a dict of
+    pages, and counts the requests it served.
+    """
+
+    def __init__(
+        self,
+        pages: Dict[str, dict],
+        redirects: Optional[Dict[str, str]] = None,
+        links_per_response: int = 500,
+        latency: float = 0.0,
+    ) -> None:
+        self.pages = pages
+        self.redirects = redirects or {}
+        self.links_per_response = links_per_response
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.titles_per_request: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.requests[params["prop"]] += 1
+            self.titles_per_request.append(len(params["titles"].split("|")))
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if params["prop"] == "info|pageprops":
+                return httpx.Response(200, json=self._info(params["titles"]))
+            return httpx.Response(200, json=self._page(params))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _resolve(self, titles: str) -> dict:
+        query: dict = {"redirects": [], "pages": []}
+        for title in titles.split("|"):
+            target = self.redirects.get(title, title)
+            if target != title:
+                query["redirects"].append({"from": title, "to": target})
+            page = self.pages.get(target)
+            if page is None:
+                query["pages"].append({"title": target, "missing": True})
+            else:
+                query["pages"].append({"title": target, "ns": 0, **page})
+        return query
+
+    def _info(self, titles: str) -> dict:
+        query = self._resolve(titles)
+        for page in query["pages"]:
+            page.pop("extract", None)
+            page.pop("links", None)
+        return {"query": query}
+
+    def _page(self, params) -> dict:
+        query = self._resolve(params["titles"])
+        page = query["pages"][0]
+        if page.get("missing"):
+            return {"query": query}
+        start = int(params.get("plcontinue", 0))
+        end = start + self.links_per_response
+        page["links"] = [{"ns": 0, "title": link} for link in page["links"][start:end]]
+        if start:
+            page.pop("extract")
+        data = {"query": query}
+        if end < len(self.pages[page["title"]]["links"]):
+            data["continue"] = {"plcontinue": str(end), "continue": "||"}
+        return data
+
+    def fetcher(
+        self, concurrency: int = 10, limits: Optional[FetchLimits] = None
+    ) -> WikiFetcher:
+        """Fetcher whose requests are served by this fake, unlimited by default"""
+        limits = limits or FetchLimits(concurrency=concurrency, rate_per_host=0)
+        fetcher = WikiFetcher(concurrency=concurrency, limits=limits)
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return fetcher
+
+
+def make_page(title: str, links: List[str], text: str = "", **extra) -> dict:
+    """Page of FakeWikipedia with an extract mentioning every link"""
+    return {
+        "extract": text or f"{title} is linked to " + ", ".join(links) + ".",
+        "links": links,
+        "lastrevid": 1000 + len(title),
+        "touched": "2024-01-31T12:00:00Z",
+        **extra,
+    }
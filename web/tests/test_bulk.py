@@ -0,0 +1,46 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleStorage
+from web.db.repositories import insert_articles
+
+
+async def _insert_and_count(prefix: str, count: int):
+    session_maker = SessionManager().get_session_maker()
+    try:
+        # insert_articles is the first statement of a fresh session
+        async with session_maker() as session:
+            inserted = await insert_articles(
+                session,
+                [
+                    {"url": f"{prefix}{index}", "title": f"Bulk {index}"}
+                    for index in range(count)
+                ],
+            )
+            await session.commit()
+
+        async with session_maker() as session:
+            stored = await session.scalar(
+                select(func.count()).where(ArticleStorage.url.startswith(prefix))
+            )
+            await session.execute(
+                delete(ArticleStorage).where(ArticleStorage.url.startswith(prefix))
+            )
+            await session.commit()
+        return inserted, stored
+    finally:
+        await SessionManager().dispose()
+
+
+def test_copy_in_fresh_session_is_persisted(database):
+    count = get_settings().BULK_COPY_MIN_ROWS
+    prefix = f"https://en.wikipedia.org/wiki/Bulk_test_{uuid4().hex}_"
+
+    inserted, stored = asyncio.run(_insert_and_count(prefix, count))
+
+    assert len(inserted) == count
+    assert stored == count
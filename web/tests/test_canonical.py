@@ -0,0 +1,31 @@
+import pytest
+
+from web.utils.canonical import WikiKey, parse_url
+from web.utils.wikiparse import get_article_name, get_article_url
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Who Wants to Be a Millionaire?",
+        "100% Pure Love",
+        "Python (programming language)",
+    ],
+)
+def test_title_round_trip(title):
+    url = get_article_url(title)
+
+    assert parse_url(url) == WikiKey("en", title)
+    assert get_article_name(url) == title
+
+
+def test_special_characters_are_encoded():
+    url = get_article_url("Who Wants to Be a Millionaire?")
+
+    assert url == "https://en.wikipedia.org/wiki/Who_Wants_to_Be_a_Millionaire%3F"
+
+
+def test_fragment_is_dropped():
+    key = parse_url("https://en.wikipedia.org/wiki/Python#History")
+
+    assert key == WikiKey("en", "Python")
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import delete, event, func, select
+
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleLinkStorage, ArticleStorage
+from web.tasks.crawler import Crawler
+from web.utils.link_rank import OrderScorer
+from web.utils.wikiparse import WikiPage, get_article_url
+
+
+class FakeSource:
+    """PageSource serving the pages of a dict, keyed by url"""
+
+    def __init__(self, pages: Dict[str, WikiPage]) -> None:
+        self.pages = pages
+
+    async def fetch_page(self, url: str) -> Optional[WikiPage]:
+        return self.pages.get(url)
+
+    async def resolve_articles(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        return {url: url if url in self.pages else None for url in urls}
+
+
+def _page(title: str, links: List[str]) -> WikiPage:
+    return WikiPage(
+        title=title,
+        url=get_article_url(title),
+        text=f"{title} links to " + ", ".join(links),
+        links=tuple(links),
+        revision_id=1,
+        last_modified=datetime(2024, 1, 31, tzinfo=timezone.utc),
+    )
+
+
+async def _crawl_one_level(prefix: str, children: int):
+    """Crawl a root with `children` links, return statements and stored rows"""
+    titles = [f"{prefix} {index}" for index in range(children)]
+    root = _page(prefix, titles)
+    pages = {page.url: page for page in [root] + [_page(t, []) for t in titles]}
+
+    engine = SessionManager().engine
+    session_maker = SessionManager().get_session_maker()
+    statements: List[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with session_maker() as session:
+            article = ArticleStorage(url=root.url, title=root.title)
+            session.add(article)
+            await session.commit()
+            root_id = article.id
+
+        crawler = Crawler(
+            max_depth=1,
+            max_links=children,
+            concurrency=4,
+            source=FakeSource(pages),
+            scorer=OrderScorer(),
+        )
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        try:
+            await crawler.run(root_id, root.url)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+        url_prefix = get_article_url(prefix)
+        async with session_maker() as session:
+            stored = await session.scalar(
+                select(func.count()).where(
+                    ArticleStorage.parent_id == root_id,
+                    ArticleStorage.url.startswith(url_prefix),
+                )
+            )
+            await session.execute(
+                delete(ArticleLinkStorage).where(
+                    ArticleLinkStorage.source_article_id.in_(
+                        select(ArticleStorage.id).where(
+                            ArticleStorage.url.startswith(url_prefix)
+                        )
+                    )
+                )
+            )
+            await session.execute(
+                delete(ArticleStorage).where(ArticleStorage.url.startswith(url_prefix))
+            )
+            await session.commit()
+        return statements, stored
+    finally:
+        await SessionManager().dispose()
+
+
+def test_level_is_stored_in_a_constant_number_of_statements(database):
+    prefix = f"Crawl test {uuid4().hex}"
+
+    few, stored_few = asyncio.run(_crawl_one_level(f"{prefix} a", 5))
+    many, stored_many = asyncio.run(_crawl_one_level(f"{prefix} b", 60))
+
+    assert (stored_few, stored_many) == (5, 60)
+    # The number of round trips does not depend on the size of the level
+    assert len(many) == len(few)
+    inserts = [s for s in many if s.startswith("INSERT INTO articles ")]
+    assert len(inserts) == 1
@@ -0,0 +1,51 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleLinkStorage, ArticleStorage
+from web.utils.graph import LinkGraphCache
+
+
+async def _edges_before_and_after_a_crawl(prefix: str):
+    cache = LinkGraphCache(check_interval=0)
+    session_maker = SessionManager().get_session_maker()
+    try:
+        before = (await cache.get()).edge_count
+
+        async with session_maker() as session:
+            article = ArticleStorage(url=f"{prefix}Source", title="Source")
+            session.add(article)
+            await session.flush()
+            session.add(
+                ArticleLinkStorage(
+                    source_article_id=article.id, target_url=f"{prefix}Target"
+                )
+            )
+            await session.commit()
+        after = (await cache.get()).edge_count
+
+        async with session_maker() as session:
+            await session.execute(
+                delete(ArticleLinkStorage).where(
+                    ArticleLinkStorage.target_url.startswith(prefix)
+                )
+            )
+            await session.execute(
+                delete(ArticleStorage).where(ArticleStorage.url.startswith(prefix))
+            )
+            await session.commit()
+        removed = (await cache.get()).edge_count
+        return before, after, removed
+    finally:
+        await SessionManager().dispose()
+
+
+def test_committed_links_rebuild_the_graph(database):
+    prefix = f"https://en.wikipedia.org/wiki/Graph_test_{uuid4().hex}_"
+
+    before, after, removed = asyncio.run(_edges_before_and_after_a_crawl(prefix))
+
+    assert after == before + 1
+    assert removed == before
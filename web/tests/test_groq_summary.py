@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+import groq
+import httpx
+import pytest
+
+from web.utils.common import RequestSlots
+from web.utils.groq_summary import SummaryClient, TokenBucket
+
+
+def _completion(content: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test-model",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        },
+    )
+
+
+def _client(handler, slots: RequestSlots, max_retries: int = 0) -> SummaryClient:
+    """Summary client whose requests are answered by a fake Groq handler"""
+    client = SummaryClient(
+        requests_bucket=TokenBucket(0),
+        tokens_bucket=TokenBucket(0),
+        slots=slots,
+        max_retries=max_retries,
+        timeout=5,
+    )
+    client.client = groq.AsyncGroq(
+        api_key="test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return client
+
+
+def test_worker_loops_share_the_in_flight_cap():
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return _completion("summary")
+
+    slots = RequestSlots(2)
+
+    async def worker() -> None:
+        client = _client(handler, slots)
+        await asyncio.gather(
+            *(client.summarize("text", "test-model") for _ in range(6))
+        )
+        await client.close()
+
+    threads = [threading.Thread(target=asyncio.run, args=(worker(),)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert in_flight["max"] == 2
+
+
+def _rate_limited_then_ok(failures: int, headers=None):
+    """Fake Groq handler that answers 429 failures times, then a summary"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(
+                429,
+                headers=headers or {},
+                json={"error": {"message": "Rate limit reached"}},
+            )
+        return _completion("summary")
+
+    return handler, calls
+
+
+def test_rate_limited_requests_are_retried(monkeypatch):
+    monkeypatch.setenv("SUMMARY_RETRY_BACKOFF", "0.01")
+    handler, calls = _rate_limited_then_ok(2)
+    client = _client(handler, RequestSlots(1), max_retries=3)
+
+    assert asyncio.run(client.summarize("text", "test-model")) == "summary"
+    assert len(calls) == 3
+
+
+def test_retry_after_is_respected():
+    handler, calls = _rate_limited_then_ok(1, headers={"retry-after": "0.2"})
+    client = _client(handler, RequestSlots(1), max_retries=3)
+
+    started = time.perf_counter()
+    asyncio.run(client.summarize("text", "test-model"))
+
+    assert time.perf_counter() - started >= 0.2
+    assert len(calls) == 2
+
+
+def test_retries_give_up(monkeypatch):
+    monkeypatch.setenv("SUMMARY_RETRY_BACKOFF", "0.01")
+    handler, calls = _rate_limited_then_ok(10)
+    client = _client(handler, RequestSlots(1), max_retries=2)
+
+    with pytest.raises(groq.RateLimitError):
+        asyncio.run(client.summarize("text", "test-model"))
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"error": {"message": "Bad request"}})
+
+    client = _client(handler, RequestSlots(1), max_retries=3)
+
+    with pytest.raises(groq.BadRequestError):
+        asyncio.run(client.summarize("text", "test-model"))
+    assert len(calls) == 1
+
+
+def test_bucket_paces_requests_after_the_burst():
+    # 600 per minute: a burst of 600, then one every 0.1 s
+    bucket = TokenBucket(600)
+
+    async def drain_and_wait() -> float:
+        await bucket.acquire(600)
+        started = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(drain_and_wait())
+
+    assert 0.25 <= elapsed < 0.6
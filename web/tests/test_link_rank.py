@@ -0,0 +1,97 @@
+import asyncio
+import random
+import re
+import time
+
+from web.utils.link_rank import (
+    ProminenceScorer,
+    _mention_positions,
+    is_skipped_title,
+    rank_links,
+)
+
+
+TEXT = """Python is a programming language created by Guido van Rossum. Its name
+is a tribute to Monty Python. It is widely used in science and education.
+
+== History ==
+Guido van Rossum began working on Python in the late 1980s."""
+
+LINKS = {
+    "https://en.wikipedia.org/wiki/I": "I",
+    "https://en.wikipedia.org/wiki/E_(mathematical_constant)": (
+        "E (mathematical constant)"
+    ),
+    "https://en.wikipedia.org/wiki/Guido_van_Rossum": "Guido van Rossum",
+    "https://en.wikipedia.org/wiki/ISBN_(identifier)": "ISBN (identifier)",
+    "https://en.wikipedia.org/wiki/Monty_Python": "Monty Python",
+}
+
+
+def _score(links):
+    return asyncio.run(ProminenceScorer(2, 1, 20000).score(TEXT, links))
+
+
+def test_short_unmentioned_titles_do_not_score():
+    scores = _score(LINKS)
+
+    assert "https://en.wikipedia.org/wiki/I" not in scores
+    assert "https://en.wikipedia.org/wiki/E_(mathematical_constant)" not in scores
+    assert scores["https://en.wikipedia.org/wiki/Guido_van_Rossum"] > 0
+
+
+def test_mentions_are_whole_words():
+    scores = _score({"https://en.wikipedia.org/wiki/Cat": "Cat"})
+
+    # "education" contains "cat" but does not mention it
+    assert scores == {}
+
+
+def test_mentioned_links_come_first():
+    frontier = asyncio.run(rank_links(TEXT, LINKS, ProminenceScorer(2, 1, 20000)))
+
+    assert frontier.pop(2) == [
+        "https://en.wikipedia.org/wiki/Guido_van_Rossum",
+        "https://en.wikipedia.org/wiki/Monty_Python",
+    ]
+    assert len(frontier) == 2
+
+
+def test_maintenance_titles_are_skipped():
+    assert is_skipped_title("ISBN (identifier)")
+    assert is_skipped_title("1st century")
+    assert is_skipped_title("Category:Programming languages")
+    assert not is_skipped_title("Guido van Rossum")
+
+
+def test_positions_match_whole_word_regex():
+    text = "c++ and c+++ x.net .net net, aa aa aa, python_3 python 3 Python."
+    mentions = ["c++", ".net", "aa aa", "python", "python 3", "net", "3 python"]
+
+    positions = _mention_positions(text.lower(), mentions)
+
+    for mention in mentions:
+        pattern = re.compile(rf"(?<!\w){re.escape(mention)}(?!\w)")
+        expected = [match.start() for match in pattern.finditer(text.lower())]
+        assert positions.get(mention, []) == expected, mention
+
+
+def test_large_link_sets_are_scored_in_one_pass():
+    rng = random.Random(0)
+    vocabulary = [f"word{index}" for index in range(3000)]
+    text = " ".join(rng.choice(vocabulary) for _ in range(2500))[:20000]
+    links = {
+        f"https://en.wikipedia.org/wiki/Link_{index}": (
+            f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}"
+            if index % 2
+            else rng.choice(vocabulary)
+        )
+        for index in range(1500)
+    }
+
+    started = time.perf_counter()
+    scores = asyncio.run(ProminenceScorer(2, 1, 20000).score(text, links))
+
+    # A regex scan of the whole text per link took over a second here
+    assert time.perf_counter() - started < 0.2
+    assert scores
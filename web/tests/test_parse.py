@@ -0,0 +1,68 @@
+import asyncio
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from web.__main__ import app
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleStorage, TaskStorage
+
+
+async def _post_batches(batches, prefix: str):
+    settings = get_settings()
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = [
+                await client.post(
+                    f"{settings.PATH_PREFIX}/parse/batch", json={"urls": urls}
+                )
+                for urls in batches
+            ]
+
+        session_maker = SessionManager().get_session_maker()
+        async with session_maker() as session:
+            for response in responses:
+                group_id = response.json().get("group_id")
+                if group_id:
+                    await session.execute(
+                        delete(TaskStorage).where(TaskStorage.group_id == group_id)
+                    )
+            await session.execute(
+                delete(ArticleStorage).where(ArticleStorage.url.startswith(prefix))
+            )
+            await session.commit()
+        return responses
+    finally:
+        await SessionManager().dispose()
+
+
+def test_large_batch_is_accepted(database):
+    # Large enough for the COPY path of insert_articles
+    count = max(200, get_settings().BULK_COPY_MIN_ROWS)
+    prefix = f"https://en.wikipedia.org/wiki/Batch_test_{uuid4().hex}_"
+    urls = [f"{prefix}{index}" for index in range(count)]
+
+    (response,) = asyncio.run(_post_batches([urls], prefix))
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["accepted"] == count
+    assert body["existing"] == []
+    assert body["status"] == "pending"
+
+
+def test_batch_of_existing_articles_has_no_group(database):
+    prefix = f"https://en.wikipedia.org/wiki/Batch_test_{uuid4().hex}_"
+    urls = [f"{prefix}{index}" for index in range(3)]
+
+    first, second = asyncio.run(_post_batches([urls, urls], prefix))
+
+    assert first.json()["group_id"]
+    body = second.json()
+    assert body["group_id"] is None
+    assert body["accepted"] == 0
+    assert body["existing"] == urls
+    assert body["status"] == "completed"
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from web.utils import response_cache
+from web.utils.response_cache import SummaryResponseCache
+
+
+URL = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+
+
+class FakeRedis:
+    """Shared tier of several replicas: a dict behind the redis client calls"""
+
+    def __init__(self) -> None:
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+
+def _replicas(monkeypatch, memory_ttl: float):
+    """Response caches of two replicas sharing one Redis"""
+    shared = FakeRedis()
+    monkeypatch.setattr(
+        response_cache, "redis_asyncio", SimpleNamespace(from_url=lambda url: shared)
+    )
+    return [
+        SummaryResponseCache(
+            max_size=16, ttl=3600, redis_url="redis://fake", memory_ttl=memory_ttl
+        )
+        for _ in range(2)
+    ]
+
+
+def test_other_replica_is_stale_for_memory_ttl_at_most(monkeypatch):
+    writer, reader = _replicas(monkeypatch, memory_ttl=0.2)
+
+    async def run():
+        await writer.set(URL, {"summary": "old"})
+        first = await reader.get(URL)
+
+        # The writer invalidates both of its tiers and caches the new response,
+        # the memory tier of the reader still holds the old one
+        await writer.invalidate([URL])
+        await writer.set(URL, {"summary": "new"})
+        stale = await reader.get(URL)
+
+        await asyncio.sleep(0.25)
+        fresh = await reader.get(URL)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(run())
+
+    assert first["body"] == {"summary": "old"}
+    assert stale["body"] == {"summary": "old"}
+    assert fresh["body"] == {"summary": "new"}
+    assert reader.stats()["shared_hits"] == 2
+
+
+def test_invalidated_entry_is_not_served_by_any_replica(monkeypatch):
+    writer, reader = _replicas(monkeypatch, memory_ttl=0.2)
+
+    async def run():
+        await writer.set(URL, {"summary": "old"})
+        await writer.invalidate([URL])
+        return await writer.get(URL), await reader.get(URL)
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_memory_ttl_applies_only_with_a_shared_tier():
+    cache = SummaryResponseCache(max_size=16, ttl=3600, memory_ttl=0.05)
+
+    async def run():
+        await cache.set(URL, {"summary": "old"})
+        time.sleep(0.1)
+        return await cache.get(URL)
+
+    # A single process invalidates its own memory tier on every write
+    assert asyncio.run(run())["body"] == {"summary": "old"}
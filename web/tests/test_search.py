@@ -0,0 +1,114 @@
+import asyncio
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from web.__main__ import app
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleStorage
+from web.db.repositories import save_contents
+
+
+async def _search(prefix: str, word: str, queries):
+    """Store three articles, run GET /search for every params dict"""
+    settings = get_settings()
+    articles = {
+        "Title": (f"The {word} article", "Nothing to see in the body."),
+        "Body": ("Plain title", f"The body tells about the {word} at length."),
+        "Other": ("Unrelated title", "An unrelated body."),
+    }
+    session_maker = SessionManager().get_session_maker()
+    try:
+        async with session_maker() as session:
+            stored = {
+                name: ArticleStorage(url=f"{prefix}{name}", title=title)
+                for name, (title, _) in articles.items()
+            }
+            session.add_all(stored.values())
+            await session.flush()
+            await save_contents(
+                session,
+                {
+                    stored[name].id: content
+                    for name, (_, content) in articles.items()
+                },
+            )
+            await session.commit()
+        names = {str(article.id): name for name, article in stored.items()}
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = []
+            for params in queries:
+                if callable(params):
+                    params = params(responses)
+                responses.append(
+                    await client.get(f"{settings.PATH_PREFIX}/search", params=params)
+                )
+
+        async with session_maker() as session:
+            await session.execute(
+                delete(ArticleStorage).where(ArticleStorage.url.startswith(prefix))
+            )
+            await session.commit()
+        return names, responses
+    finally:
+        await SessionManager().dispose()
+
+
+def _word() -> str:
+    """A word no other article contains, letters only"""
+    return "zq" + "".join(chr(ord("a") + int(char, 16)) for char in uuid4().hex[:12])
+
+
+def test_title_matches_rank_above_body_matches(database):
+    prefix = f"https://en.wikipedia.org/wiki/Search_test_{uuid4().hex}_"
+    word = _word()
+
+    names, (response,) = asyncio.run(_search(prefix, word, [{"q": word}]))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [names[result["article_id"]] for result in results] == ["Title", "Body"]
+    assert f"<b>{word}</b>" in results[1]["headline"]
+    assert response.json()["next_cursor"] is None
+
+
+def test_pages_follow_the_cursor(database):
+    prefix = f"https://en.wikipedia.org/wiki/Search_test_{uuid4().hex}_"
+    word = _word()
+
+    names, (first, second) = asyncio.run(
+        _search(
+            prefix,
+            word,
+            [
+                {"q": word, "limit": 1},
+                lambda responses: {
+                    "q": word,
+                    "limit": 1,
+                    "cursor": responses[0].json()["next_cursor"],
+                },
+            ],
+        )
+    )
+
+    assert [names[result["article_id"]] for result in first.json()["results"]] == [
+        "Title"
+    ]
+    assert [names[result["article_id"]] for result in second.json()["results"]] == [
+        "Body"
+    ]
+    assert second.json()["next_cursor"] is None
+
+
+def test_invalid_cursor_is_rejected(database):
+    prefix = f"https://en.wikipedia.org/wiki/Search_test_{uuid4().hex}_"
+
+    _, (response,) = asyncio.run(
+        _search(prefix, _word(), [{"q": "python", "cursor": "page-two"}])
+    )
+
+    assert response.status_code == 400
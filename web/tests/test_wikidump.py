@@ -0,0 +1,79 @@
+import bz2
+import os
+import re
+from datetime import datetime, timezone
+
+from web.utils.wikidump import iter_dump_pages, wikitext_to_text
+
+
+SAMPLE_DUMP = os.path.join(
+    os.path.dirname(__file__), "fixtures", "enwiki-sample-pages-articles.xml.bz2"
+)
+
+
+def _multistream_dump(directory) -> tuple:
+    """
+    Multistream copy of the sample dump: <siteinfo> and every <page> in a
+    bz2 stream of its own, with the `offset:page_id:title` index.
+    """
+    with bz2.open(SAMPLE_DUMP, "rt", encoding="utf-8") as dump:
+        xml = dump.read()
+    head, _, rest = xml.partition("<page>")
+    pages = ["<page>" + page for page in rest.split("<page>")]
+    pages[-1], tail = pages[-1].split("</mediawiki>")
+    pages[-1] += "</mediawiki>" + tail
+
+    path = os.path.join(directory, "enwiki-sample-pages-articles-multistream.xml.bz2")
+    index_path = os.path.join(directory, "enwiki-sample-index.txt.bz2")
+    with open(path, "wb") as dump, bz2.open(index_path, "wt") as index:
+        dump.write(bz2.compress(head.encode()))
+        for page in pages:
+            page_id = re.search(r"<id>(\d+)</id>", page).group(1)
+            title = re.search(r"<title>(.*?)</title>", page).group(1)
+            index.write(f"{dump.tell()}:{page_id}:{title}\n")
+            dump.write(bz2.compress(page.encode()))
+    return path, index_path
+
+
+def test_sample_dump_yields_articles():
+    pages = list(iter_dump_pages(SAMPLE_DUMP, processes=1))
+
+    # Redirects, other namespaces and pages without text are skipped
+    assert [page.title for page in pages] == [
+        "Python (programming language)",
+        "Monty Python",
+    ]
+    python, monty = pages
+    assert python.url == "https://en.wikipedia.org/wiki/Python_(programming_language)"
+    assert python.revision_id == 1201234567
+    assert python.last_modified == datetime(2024, 1, 31, 12, tzinfo=timezone.utc)
+    assert python.text.startswith(
+        "Python is a high-level language created by Guido van Rossum.\n\n"
+        "== History ==\n"
+    )
+    assert python.links == (
+        "High-level programming language",
+        "Guido van Rossum",
+        "ABC (programming language)",
+    )
+    assert monty.text == "Monty Python were a British comedy troupe."
+    assert monty.links == ()
+
+
+def test_multistream_dump_matches_single_stream(tmp_path):
+    path, index_path = _multistream_dump(str(tmp_path))
+
+    pages = list(iter_dump_pages(path, index_path, processes=2))
+
+    assert pages == list(iter_dump_pages(SAMPLE_DUMP, processes=1))
+
+
+def test_wikitext_to_text_drops_markup():
+    text, links = wikitext_to_text(
+        "{{Infobox|name={{Nested}}}}'''Bold''' [[Target page#Section|label]]"
+        "<ref name=a>note</ref> [[File:Logo.svg|thumb|[[Inner]]]]"
+        " [https://example.org site] [[Category:Things]] [[de:Ziel]]"
+    )
+
+    assert text == "Bold label site"
+    assert links == ("Target page",)
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+
+from web.tests.fake_wikipedia import FakeWikipedia, make_page
+from web.utils.wikifetch import FetchLimits
+
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+PARAMS = {"action": "query", "prop": "extracts|links|info", "titles": "Python"}
+
+
+def _fetch_from_loops(wiki: FakeWikipedia, limits: FetchLimits, loops: int, count: int):
+    """Fetch count pages concurrently on each of several worker loops"""
+
+    async def worker() -> None:
+        fetcher = wiki.fetcher(limits=limits)
+        try:
+            await asyncio.gather(
+                *(fetcher.get_json(API_URL, PARAMS) for _ in range(count))
+            )
+        finally:
+            await fetcher.close()
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=asyncio.run, args=(worker(),)) for _ in range(loops)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def test_loops_share_the_in_flight_cap():
+    wiki = FakeWikipedia({"Python": make_page("Python", [])}, latency=0.02)
+
+    _fetch_from_loops(wiki, FetchLimits(concurrency=4, rate_per_host=0), 3, 10)
+
+    assert sum(wiki.requests.values()) == 30
+    assert wiki.max_in_flight == 4
+
+
+def test_loops_share_the_host_rate():
+    wiki = FakeWikipedia({"Python": make_page("Python", [])})
+
+    elapsed = _fetch_from_loops(
+        wiki, FetchLimits(concurrency=10, rate_per_host=50), 2, 5
+    )
+
+    # 10 requests at 50 per second are spread over at least 9 intervals
+    assert elapsed >= 9 / 50 * 0.9
+
+
+def test_requests_run_in_parallel():
+    wiki = FakeWikipedia({"Python": make_page("Python", [])}, latency=0.05)
+
+    elapsed = _fetch_from_loops(
+        wiki, FetchLimits(concurrency=10, rate_per_host=0), 1, 20
+    )
+
+    # One at a time this takes a second
+    assert elapsed < 0.5
+    assert wiki.max_in_flight == 10
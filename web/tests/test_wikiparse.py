@@ -0,0 +1,135 @@
+import asyncio
+
+from web.tests.fake_wikipedia import FakeWikipedia, make_page
+from web.utils import wikiparse
+from web.utils.wikiparse import (
+    TITLES_PER_QUERY,
+    fetch_page,
+    get_linked_articles,
+    resolve_articles,
+)
+
+
+URL = "https://en.wikipedia.org/wiki/Python_(programming_language)"
+TITLE = "Python (programming language)"
+
+
+def _run(wiki: FakeWikipedia, monkeypatch, call):
+    async def main():
+        fetcher = wiki.fetcher()
+        monkeypatch.setattr(wikiparse, "get_fetcher", lambda: fetcher)
+        try:
+            return await call()
+        finally:
+            await fetcher.close()
+
+    return asyncio.run(main())
+
+
+def test_page_is_fetched_in_one_request(monkeypatch):
+    links = ["Guido van Rossum", "Monty Python", "CPython"]
+    wiki = FakeWikipedia({TITLE: make_page(TITLE, links)})
+
+    page = _run(wiki, monkeypatch, lambda: fetch_page(URL))
+
+    assert sum(wiki.requests.values()) == 1
+    assert page.title == TITLE
+    assert page.url == URL
+    assert page.links == tuple(links)
+    assert "Guido van Rossum" in page.text
+    assert page.revision_id == wiki.pages[TITLE]["lastrevid"]
+    assert page.last_modified.year == 2024
+
+
+def test_long_link_lists_are_continued(monkeypatch):
+    links = [f"Link {index}" for index in range(1200)]
+    wiki = FakeWikipedia({TITLE: make_page(TITLE, links)}, links_per_response=500)
+
+    page = _run(wiki, monkeypatch, lambda: fetch_page(URL))
+
+    # One request per 500 links, the text comes with the first one
+    assert sum(wiki.requests.values()) == 3
+    assert page.links == tuple(links)
+    assert page.text == wiki.pages[TITLE]["extract"]
+
+
+def test_redirect_is_followed_in_the_same_request(monkeypatch):
+    wiki = FakeWikipedia(
+        {TITLE: make_page(TITLE, ["CPython"])}, redirects={"Python (language)": TITLE}
+    )
+
+    page = _run(
+        wiki,
+        monkeypatch,
+        lambda: fetch_page("https://en.wikipedia.org/wiki/Python_(language)"),
+    )
+
+    assert sum(wiki.requests.values()) == 1
+    assert page.url == URL
+
+
+def test_missing_page(monkeypatch):
+    wiki = FakeWikipedia({})
+
+    assert _run(wiki, monkeypatch, lambda: fetch_page(URL)) is None
+    assert sum(wiki.requests.values()) == 1
+
+
+def _linked_wiki(missing: int) -> FakeWikipedia:
+    """
+    A root page linking to 120 articles: the first `missing` do not exist,
+    the next five are disambiguation pages and one redirects to the next.
+    """
+    links = [f"Article {index}" for index in range(120)]
+    pages = {"Root": make_page("Root", links)}
+    for index, title in enumerate(links[missing:], missing):
+        extra = {}
+        if index < missing + 5:
+            extra["pageprops"] = {"disambiguation": ""}
+        pages[title] = make_page(title, [], **extra)
+    redirects = {links[missing + 5]: links[missing + 6]}
+    return FakeWikipedia(pages, redirects=redirects)
+
+
+def _linked_titles(wiki: FakeWikipedia, monkeypatch, max_links: int = 5):
+    monkeypatch.setenv("LINK_SCORERS", "prominence")
+
+    async def crawl():
+        root = await fetch_page("https://en.wikipedia.org/wiki/Root")
+        return await get_linked_articles(root, max_links=max_links)
+
+    return [page.title for page in _run(wiki, monkeypatch, crawl)]
+
+
+def test_links_are_resolved_fifty_at_a_time(monkeypatch):
+    wiki = _linked_wiki(missing=10)
+
+    titles = _linked_titles(wiki, monkeypatch)
+
+    # One info query for the first 50 links, then only the 5 bodies
+    assert titles == [f"Article {index}" for index in range(16, 21)]
+    assert wiki.requests["info|pageprops"] == 1
+    assert wiki.requests["extracts|links|info"] == 1 + 5
+    assert wiki.titles_per_request[1] == TITLES_PER_QUERY
+
+
+def test_next_batch_is_resolved_when_the_first_runs_short(monkeypatch):
+    wiki = _linked_wiki(missing=40)
+
+    titles = _linked_titles(wiki, monkeypatch)
+
+    assert titles == [f"Article {index}" for index in range(46, 51)]
+    assert wiki.requests["info|pageprops"] == 2
+    assert wiki.requests["extracts|links|info"] == 1 + 5
+
+
+def test_resolve_articles_batches_titles(monkeypatch):
+    wiki = _linked_wiki(missing=10)
+    urls = [f"https://en.wikipedia.org/wiki/Article_{index}" for index in range(120)]
+
+    resolved = _run(wiki, monkeypatch, lambda: resolve_articles(urls))
+
+    assert wiki.requests["info|pageprops"] == 3
+    assert max(wiki.titles_per_request) == TITLES_PER_QUERY
+    assert sum(url is None for url in resolved.values()) == 10 + 5
+    assert resolved[urls[15]] == resolved[urls[16]] == urls[16]
@@ -0,0 +1,150 @@
+import re
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from web.config.utils import get_settings
+from web.utils.common import TTLCache
+
+
+DEFAULT_LANG = "en"
+WIKIPEDIA_API_URL = "https://{lang}.wikipedia.org/w/api.php"
+WIKIPEDIA_ARTICLE_URL = "https://{lang}.wikipedia.org/wiki/{title}"
+
+# Namespaces and interwiki prefixes whose links are not articles
+NON_ARTICLE_PREFIXES = {
+    "category",
+    "draft",
+    "file",
+    "help",
+    "image",
+    "media",
+    "mediawiki",
+    "module",
+    "portal",
+    "special",
+    "talk",
+    "template",
+    "user",
+    "wikipedia",
+    "wikt",
+    "wiktionary",
+    "wp",
+}
+
+# en.wikipedia.org, en.m.wikipedia.org, www.wikipedia.org
+_host = re.compile(r"^(?P<lang>[a-z][a-z0-9-]*)(?:\.m)?\.wikipedia\.org$")
+_whitespace = re.compile(r"[\s_]+")
+# Characters left as is in the path, everything else is percent-encoded so
+# that titles with ? or % survive a round trip through the url. A # never
+# reaches it: MediaWiki titles cannot contain one, it starts a section
+_path_safe = "()_,:'!-."
+
+
+class WikiKey(NamedTuple):
+    """Canonical identity of an article: language edition and title"""
+
+    lang: str
+    title: str
+
+    @property
+    def url(self) -> str:
+        title = quote(self.title.replace(" ", "_"), safe=_path_safe)
+        return WIKIPEDIA_ARTICLE_URL.format(lang=self.lang, title=title)
+
+
+def normalize_title(title: str) -> str:
+    """
+    MediaWiki title normalization: underscores are spaces, runs of
+    whitespace collapse, fragments are dropped and the first letter is
+    upper case.
+    """
+    return _normalize(title.split("#")[0])
+
+
+def _normalize(title: str) -> str:
+    title = _whitespace.sub(" ", title).strip()
+    return title[:1].upper() + title[1:]
+
+
+def parse_url(url: str) -> Optional[WikiKey]:
+    """
+    Map any form of a Wikipedia article URL to its key: desktop and mobile
+    hosts, percent-encoding, `/w/index.php?title=` and `?oldid=` variants,
+    fragments. Returns None for URLs that do not name an article.
+    """
+    parts = urlsplit(url.strip())
+    match = _host.match((parts.hostname or "").lower())
+    if not match:
+        return None
+    lang = match.group("lang")
+    if lang == "www":
+        lang = DEFAULT_LANG
+
+    # The fragment was split off before decoding, an encoded # is part of
+    # the title
+    path = unquote(parts.path)
+    if path.startswith("/wiki/"):
+        title = path[len("/wiki/") :]
+    elif path in ("/w/index.php", "/index.php"):
+        title = parse_qs(parts.query).get("title", [""])[0]
+    else:
+        return None
+
+    title = _normalize(title)
+    return WikiKey(lang, title) if title else None
+
+
+def get_lang(url: str) -> str:
+    key = parse_url(url)
+    return key.lang if key else DEFAULT_LANG
+
+
+class CanonicalKeyCache:
+    """
+    In-process cache of canonical article URLs.
+
+    Maps every URL form seen so far to the canonical URL, including
+    redirects learned while crawling, so aliases of known articles are
+    recognised before any network I/O.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    def canonicalize(self, url: str) -> Optional[str]:
+        canonical = self.cache.get(url)
+        if canonical is not None:
+            return canonical
+        key = parse_url(url)
+        if key is None:
+            return None
+        canonical = self.cache.get(key.url) or key.url
+        self.cache.set(url, canonical)
+        return canonical
+
+    def remember_redirect(self, url: str, target: str) -> None:
+        """Record that url redirects to the canonical target"""
+        key = parse_url(url)
+        if key is not None and key.url != target:
+            self.cache.set(key.url, target)
+            self.cache.set(url, target)
+
+
+_canonical_keys: Optional[CanonicalKeyCache] = None
+
+
+def get_canonical_keys() -> CanonicalKeyCache:
+    """Get the process-wide canonical key cache"""
+    global _canonical_keys
+    if _canonical_keys is None:
+        settings = get_settings()
+        _canonical_keys = CanonicalKeyCache(
+            max_size=settings.CANONICAL_CACHE_SIZE,
+            ttl=settings.CANONICAL_CACHE_TTL,
+        )
+    return _canonical_keys
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Canonical URL of a Wikipedia article, None if url is not one"""
+    return get_canonical_keys().canonicalize(url)
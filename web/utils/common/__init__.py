@@ -1,4 +1,6 @@
+from .cache import TTLCache
 from .hostname import get_hostname
+from .slots import RequestSlots
 
 
-__all__ = ["get_hostname"]
+__all__ = ["RequestSlots", "TTLCache", "get_hostname"]
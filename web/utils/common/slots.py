@@ -0,0 +1,59 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Tuple
+
+
+class RequestSlots:
+    """
+    Semaphore of in-flight requests shared by every event loop of the process.
+    A released slot is handed to the oldest waiter on that waiter's own loop.
+    """
+
+    def __init__(self, value: int) -> None:
+        self._value = value
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = (
+            deque()
+        )
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0:
+                self._value -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was granted as the waiter was cancelled: pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+            self._value += 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
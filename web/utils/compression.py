@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleContentStorage
+
+try:
+    import zstandard
+except ImportError:  # zlib is used when the zstd extra is not installed
+    zstandard = None
+
+
+ZSTD = "zstd"
+ZSTD_DICT = "zstd-dict"
+ZLIB = "zlib"
+
+
+class ContentCodec:
+    """
+    Compression of article bodies.
+
+    Uses zstd when `zstandard` is installed, with a shared dictionary trained
+    on Wikipedia text if CONTENT_ZSTD_DICTIONARY points to one, and zlib
+    otherwise. The codec and the id of the dictionary are stored next to
+    every body, so rows written with any codec stay readable as long as
+    their dictionary is kept in CONTENT_ZSTD_DICTIONARY_DIR. zstd contexts
+    are not thread safe and are kept per thread.
+    """
+
+    def __init__(
+        self,
+        level: int,
+        dictionary_path: Optional[str] = None,
+        dictionary_dir: Optional[str] = None,
+    ) -> None:
+        self.level = level
+        self.dictionary = None
+        self.dictionaries: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        if zstandard is None:
+            if dictionary_path:
+                raise RuntimeError(
+                    "CONTENT_ZSTD_DICTIONARY is set, but zstandard is not installed"
+                )
+            print("zstandard is not installed, article bodies are compressed with zlib")
+        else:
+            if dictionary_dir:
+                for name in sorted(os.listdir(dictionary_dir)):
+                    self._load(os.path.join(dictionary_dir, name))
+            if dictionary_path:
+                self.dictionary = self._load(dictionary_path)
+                self.dictionary.precompute_compress(level=level)
+        self._local = threading.local()
+
+    def _load(self, path: str) -> "zstandard.ZstdCompressionDict":
+        with open(path, "rb") as dictionary_file:
+            dictionary = zstandard.ZstdCompressionDict(dictionary_file.read())
+        if not dictionary.dict_id():
+            raise ValueError(f"{path} is not a trained zstd dictionary")
+        self.dictionaries[dictionary.dict_id()] = dictionary
+        return dictionary
+
+    @property
+    def name(self) -> str:
+        if zstandard is None:
+            return ZLIB
+        return ZSTD_DICT if self.dictionary is not None else ZSTD
+
+    @property
+    def dictionary_id(self) -> Optional[int]:
+        """Id of the dictionary that compress uses, None without one"""
+        return self.dictionary.dict_id() if self.dictionary is not None else None
+
+    def _compressor(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self.dictionary
+            )
+        return self._local.compressor
+
+    def _decompressor(self, dictionary_id: int):
+        if not hasattr(self._local, "decompressors"):
+            self._local.decompressors = {}
+        decompressors = self._local.decompressors
+        if dictionary_id not in decompressors:
+            decompressors[dictionary_id] = zstandard.ZstdDecompressor(
+                dict_data=self.dictionaries.get(dictionary_id)
+            )
+        return decompressors[dictionary_id]
+
+    def compress(self, text: str) -> bytes:
+        data = text.encode("utf-8")
+        if zstandard is None:
+            return zlib.compress(data, min(self.level, 9))
+        return self._compressor().compress(data)
+
+    def decompress(
+        self, codec: str, data: bytes, dictionary_id: Optional[int] = None
+    ) -> str:
+        """
+        Decompress a stored body. Rows written before the dictionary id was
+        stored have it read from the zstd frame header.
+        """
+        if codec == ZLIB:
+            return zlib.decompress(data).decode("utf-8")
+        if zstandard is None:
+            raise RuntimeError(f"Content compressed with {codec} needs zstandard")
+        if codec != ZSTD_DICT:
+            dictionary_id = 0
+        elif dictionary_id is None:
+            dictionary_id = zstandard.get_frame_parameters(data).dict_id
+        if dictionary_id and dictionary_id not in self.dictionaries:
+            raise RuntimeError(
+                f"Content compressed with dictionary {dictionary_id} needs it "
+                "in CONTENT_ZSTD_DICTIONARY_DIR"
+            )
+        return self._decompressor(dictionary_id).decompress(data).decode("utf-8")
+
+
+def train_dictionary(samples: List[str], size: int = 112640) -> bytes:
+    """Train a zstd dictionary on sample article texts"""
+    if zstandard is None:
+        raise RuntimeError("Training a dictionary needs zstandard")
+    dictionary = zstandard.train_dictionary(
+        size, [sample.encode("utf-8") for sample in samples]
+    )
+    return dictionary.as_bytes()
+
+
+_codec_lock = threading.Lock()
+_codec: Optional[ContentCodec] = None
+
+
+def get_codec() -> ContentCodec:
+    """Get the process-wide content codec"""
+    global _codec
+    with _codec_lock:
+        if _codec is None:
+            settings = get_settings()
+            _codec = ContentCodec(
+                settings.CONTENT_COMPRESSION_LEVEL,
+                settings.CONTENT_ZSTD_DICTIONARY or None,
+                settings.CONTENT_ZSTD_DICTIONARY_DIR or None,
+            )
+        return _codec
+
+
+async def _train_from_database(output: str, samples: int, size: int) -> None:
+    codec = get_codec()
+    session_maker = SessionManager().get_session_maker()
+    async with session_maker() as session:
+        query = (
+            select(
+                ArticleContentStorage.codec,
+                ArticleContentStorage.data,
+                ArticleContentStorage.dictionary_id,
+            )
+            .order_by(func.random())
+            .limit(samples)
+        )
+        rows = (await session.execute(query)).all()
+    await SessionManager().dispose()
+
+    dictionary = train_dictionary([codec.decompress(*row) for row in rows], size)
+    with open(output, "wb") as dictionary_file:
+        dictionary_file.write(dictionary)
+    dictionary_id = zstandard.ZstdCompressionDict(dictionary).dict_id()
+    print(
+        f"Trained dictionary {dictionary_id} of {size} bytes on {len(rows)} "
+        f"articles: {output}. Keep the previous dictionary in "
+        "CONTENT_ZSTD_DICTIONARY_DIR, rows compressed with it still need it"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train a zstd dictionary on stored articles"
+    )
+    parser.add_argument("output", help="dictionary file, see CONTENT_ZSTD_DICTIONARY")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=112640)
+    args = parser.parse_args()
+    asyncio.run(_train_from_database(args.output, args.samples, args.size))
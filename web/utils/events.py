@@ -0,0 +1,269 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import TEXT, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+
+
+CHANNEL = "article_events"
+# NOTIFY payloads must be shorter than 8000 bytes
+NOTIFY_MAX_BYTES = 7999
+DETAIL_MAX_CHARS = 1000
+
+# Crawl and summary stages of an article tree
+FETCHED = "fetched"
+STORED = "stored"
+SUMMARIZED = "summarized"
+FAILED = "failed"
+COMPLETED = "completed"
+
+
+def make_event(
+    event: str,
+    root_id: UUID,
+    article_id: UUID,
+    url: Optional[str] = None,
+    level: Optional[int] = None,
+    detail: Optional[str] = None,
+) -> dict:
+    """Progress event of an article in the tree under root_id"""
+    return {
+        "event": event,
+        "root_id": str(root_id),
+        "article_id": str(article_id),
+        "url": url,
+        "level": level,
+        "detail": detail[:DETAIL_MAX_CHARS] if detail else detail,
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _notify_payload(event: dict) -> str:
+    """JSON of an event that fits into a NOTIFY payload, detail dropped if needed"""
+    payload = json.dumps(event)
+    if len(payload.encode()) > NOTIFY_MAX_BYTES:
+        payload = json.dumps({**event, "detail": None})
+    return payload
+
+
+class Subscription:
+    """
+    Events of one root article for one watcher, buffered in an asyncio queue
+    on the loop that subscribed. A watcher that falls behind by more than
+    the queue size loses the oldest events instead of slowing publishers.
+    """
+
+    def __init__(self, root_id: str, queue_size: int) -> None:
+        self.root_id = root_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def put(self, event: dict) -> None:
+        """Called on the subscriber loop"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None when nothing arrived within the timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """
+    Pub/sub of crawl and summary progress, keyed by root article.
+
+    Workers publish from their own event loops, watchers subscribe on the
+    server loop; delivery hands events over with `call_soon_threadsafe`, so
+    watching costs no database queries. With EVENTS_BACKEND=postgres events
+    go through `pg_notify` instead and every replica fans out what its
+    LISTEN connection receives, so watchers see events of workers anywhere.
+    A lost LISTEN connection is opened again with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        queue_size: int,
+        check_interval: float = 10,
+        reconnect_max: float = 30,
+    ) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self.check_interval = check_interval
+        self.reconnect_max = reconnect_max
+        self.published = 0
+        self.reconnects = 0
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listen_task: Optional[asyncio.Task] = None
+
+    def subscribe(self, root_id: UUID) -> Subscription:
+        subscription = Subscription(str(root_id), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(subscription.root_id, set()).add(
+                subscription
+            )
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.root_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.root_id, None)
+
+    async def publish(self, events: Iterable[dict]) -> None:
+        """Publish events from any event loop, errors are only logged"""
+        events = list(events)
+        if not events:
+            return
+        self.published += len(events)
+        if self.backend == "postgres":
+            try:
+                await self._notify(events)
+                return
+            except Exception as e:
+                print(f"Could not notify article events: {str(e)}")
+        self._deliver(events)
+
+    async def _notify(self, events: List[dict]) -> None:
+        """One `pg_notify` statement for the whole batch of events"""
+        query = text(
+            "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+        ).bindparams(bindparam("payloads", type_=ARRAY(TEXT)))
+        session_maker = SessionManager().get_session_maker()
+        async with session_maker() as session:
+            await session.execute(
+                query,
+                {
+                    "channel": CHANNEL,
+                    "payloads": [_notify_payload(event) for event in events],
+                },
+            )
+            await session.commit()
+
+    def _deliver(self, events: List[dict]) -> None:
+        with self._lock:
+            targets = [
+                (subscription, event)
+                for event in events
+                for subscription in self._subscribers.get(event["root_id"], ())
+            ]
+        for subscription, event in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:  # the watcher loop is closed
+                self.unsubscribe(subscription)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        self._deliver([json.loads(payload)])
+
+    async def start(self) -> None:
+        """LISTEN for events of all replicas, on the server loop"""
+        if self.backend != "postgres" or self._listen_task is not None:
+            return
+        self._listen_task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._listen_task is None:
+            return
+        self._listen_task.cancel()
+        try:
+            await self._listen_task
+        except asyncio.CancelledError:
+            pass
+        self._listen_task = None
+
+    async def _listen_forever(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._listen()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Article events LISTEN failed: {str(e)}")
+            self.reconnects += 1
+            print(f"Reconnecting article events LISTEN in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max)
+
+    async def _listen(self) -> None:
+        """
+        Hold one LISTEN connection until it is lost. Termination is reported
+        by asyncpg; a dropped network is noticed by a periodic `SELECT 1`.
+        """
+        lost = asyncio.Event()
+        connection = await SessionManager().engine.connect()
+        try:
+            raw_connection = await connection.get_raw_connection()
+            driver = raw_connection.driver_connection
+            driver.add_termination_listener(lambda _: lost.set())
+            await driver.add_listener(CHANNEL, self._on_notification)
+            print("Listening for article events")
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), self.check_interval)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(
+                        driver.fetchval("SELECT 1"), self.check_interval
+                    )
+        finally:
+            try:
+                await connection.invalidate()
+                await connection.close()
+            except Exception as e:
+                print(f"Could not close the article events connection: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscriptions = [
+                subscription
+                for subscribers in self._subscribers.values()
+                for subscription in subscribers
+            ]
+        return {
+            "backend": self.backend,
+            "published": self.published,
+            "reconnects": self.reconnects,
+            "watched_roots": len({sub.root_id for sub in subscriptions}),
+            "subscribers": len(subscriptions),
+            "dropped": sum(sub.dropped for sub in subscriptions),
+        }
+
+
+_event_broker_lock = threading.Lock()
+_event_broker: Optional[EventBroker] = None
+
+
+def get_event_broker() -> EventBroker:
+    """Get the process-wide event broker"""
+    global _event_broker
+    with _event_broker_lock:
+        if _event_broker is None:
+            settings = get_settings()
+            _event_broker = EventBroker(
+                backend=settings.EVENTS_BACKEND,
+                queue_size=settings.EVENTS_QUEUE_SIZE,
+                check_interval=settings.EVENTS_LISTEN_CHECK_INTERVAL,
+                reconnect_max=settings.EVENTS_RECONNECT_MAX,
+            )
+        return _event_broker
+
+
+async def publish_events(events: Iterable[dict]) -> None:
+    await get_event_broker().publish(events)
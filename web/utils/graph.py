@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleLinkStorage, ArticleStorage
+
+
+class LinkGraph:
+    """
+    Directed link graph of articles in compressed sparse row form.
+
+    Nodes are article urls, including link targets that were never crawled.
+    The out-links of node i are `indices[indptr[i]:indptr[i + 1]]`, so the
+    graph costs two int arrays instead of a Python object per edge, and
+    every algorithm is a handful of vectorized NumPy operations per step.
+    """
+
+    def __init__(self, urls: List[str], sources: np.ndarray, targets: np.ndarray):
+        self.urls = urls
+        self.node_ids: Dict[str, int] = {url: index for index, url in enumerate(urls)}
+        order = np.argsort(sources, kind="stable")
+        self.sources = sources[order].astype(np.int32)
+        self.indices = targets[order].astype(np.int32)
+        self.indptr = np.zeros(len(urls) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(urls)), out=self.indptr[1:])
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> "LinkGraph":
+        """Build the graph from (source url, target url) pairs"""
+        node_ids: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for source, target in edges:
+            sources.append(node_ids.setdefault(source, len(node_ids)))
+            targets.append(node_ids.setdefault(target, len(node_ids)))
+        return cls(
+            list(node_ids),
+            np.array(sources, dtype=np.int64),
+            np.array(targets, dtype=np.int64),
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.urls)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    @cached_property
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    @cached_property
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.node_count)
+
+    @cached_property
+    def pagerank(self) -> np.ndarray:
+        """PageRank with GRAPH_PAGERANK_DAMPING, dangling nodes spread evenly"""
+        settings = get_settings()
+        damping = settings.GRAPH_PAGERANK_DAMPING
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+
+        out_degree = self.out_degree
+        dangling = out_degree == 0
+        rank = np.full(n, 1.0 / n)
+        for _ in range(settings.GRAPH_PAGERANK_MAX_ITERATIONS):
+            share = np.where(dangling, 0.0, rank / np.maximum(out_degree, 1))
+            incoming = np.bincount(
+                self.indices, weights=share[self.sources], minlength=n
+            )
+            new_rank = (1.0 - damping) / n + damping * (
+                incoming + rank[dangling].sum() / n
+            )
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < settings.GRAPH_PAGERANK_TOLERANCE:
+                break
+        return rank
+
+    def top(self, scores: np.ndarray, limit: int) -> List[int]:
+        """Nodes with the highest scores, best first"""
+        limit = min(limit, self.node_count)
+        if limit <= 0:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        return best[np.argsort(-scores[best], kind="stable")].tolist()
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """
+        Shortest chain of links from source to target, None if there is none.
+        Breadth-first search that expands a whole frontier per step: the
+        out-links of all frontier nodes are gathered from the CSR arrays at
+        once and the unvisited ones become the next frontier.
+        """
+        if source not in self.node_ids or target not in self.node_ids:
+            return None
+        start, goal = self.node_ids[source], self.node_ids[target]
+        parents = np.full(self.node_count, -1, dtype=np.int64)
+        parents[start] = start
+        frontier = np.array([start], dtype=np.int64)
+
+        while frontier.size and parents[goal] < 0:
+            starts = self.indptr[frontier]
+            lengths = self.indptr[frontier + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            neighbours = self.indices[offsets + np.arange(lengths.sum())]
+            via = np.repeat(frontier, lengths)
+
+            unvisited = parents[neighbours] < 0
+            frontier, first = np.unique(neighbours[unvisited], return_index=True)
+            parents[frontier] = via[unvisited][first]
+
+        if parents[goal] < 0:
+            return None
+        path = [goal]
+        while path[-1] != start:
+            path.append(int(parents[path[-1]]))
+        return [self.urls[node] for node in reversed(path)]
+
+    def node_stats(self, node: int) -> dict:
+        return {
+            "url": self.urls[node],
+            "in_degree": int(self.in_degree[node]),
+            "out_degree": int(self.out_degree[node]),
+            "pagerank": float(self.pagerank[node]),
+        }
+
+
+class LinkGraphCache:
+    """
+    The link graph of `article_links`, rebuilt only when the table changed.
+
+    The table version is its row count, checked at most every
+    GRAPH_CHECK_INTERVAL seconds: crawls only add links, and upserts that
+    flip `is_parsed` do not change it. The count is read from the table
+    itself, so a committed crawl is seen on the next check, unlike the
+    asynchronous and resettable statistics counters.
+    """
+
+    def __init__(self, check_interval: float) -> None:
+        self.check_interval = check_interval
+        self.graph: Optional[LinkGraph] = None
+        self.version: Optional[int] = None
+        self.built_at: Optional[datetime] = None
+        self.build_seconds = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._build_lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> LinkGraph:
+        """Current graph, rebuilt first if the edges changed"""
+        if self._build_lock is None:
+            self._build_lock = asyncio.Lock()
+        async with self._build_lock:
+            if (
+                self.graph is not None
+                and time.monotonic() - self._checked_at < self.check_interval
+            ):
+                return self.graph
+
+            session_maker = SessionManager().get_session_maker()
+            async with session_maker() as session:
+                version = await session.scalar(
+                    select(func.count()).select_from(ArticleLinkStorage)
+                )
+                self._checked_at = time.monotonic()
+                if self.graph is not None and version == self.version:
+                    return self.graph
+
+                started_at = time.monotonic()
+                query = select(ArticleStorage.url, ArticleLinkStorage.target_url).join(
+                    ArticleStorage,
+                    ArticleStorage.id == ArticleLinkStorage.source_article_id,
+                )
+                edges = (await session.execute(query)).all()
+
+            graph = await asyncio.to_thread(LinkGraph.from_edges, edges)
+            # Warm the cached metrics off the event loop
+            await asyncio.to_thread(lambda: (graph.in_degree, graph.pagerank))
+            with self._lock:
+                self.graph, self.version = graph, version
+                self.built_at = datetime.now(timezone.utc)
+                self.build_seconds = time.monotonic() - started_at
+            print(
+                f"Link graph rebuilt: {graph.node_count} nodes, "
+                f"{graph.edge_count} edges in {self.build_seconds:.2f}s"
+            )
+            return graph
+
+    def stats(self) -> dict:
+        with self._lock:
+            graph = self.graph
+            return {
+                "nodes": graph.node_count if graph else 0,
+                "edges": graph.edge_count if graph else 0,
+                "version": self.version,
+                "built_at": self.built_at,
+                "build_seconds": round(self.build_seconds, 3),
+            }
+
+
+_link_graph_cache: Optional[LinkGraphCache] = None
+
+
+def get_link_graph_cache() -> LinkGraphCache:
+    """Get the process-wide link graph cache"""
+    global _link_graph_cache
+    if _link_graph_cache is None:
+        _link_graph_cache = LinkGraphCache(get_settings().GRAPH_CHECK_INTERVAL)
+    return _link_graph_cache
@@ -1,17 +1,315 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import List, Optional, Protocol, Tuple
+from weakref import WeakKeyDictionary
+
 import groq
 
 from web.config.utils import get_settings
+from web.utils.common import RequestSlots
+
+
+# Rough size of a completion, used to reserve tokens before the request
+COMPLETION_TOKENS_ESTIMATE = 512
+
+SUMMARY_PROMPT = "Summarize the following text: {text}"
+CHUNK_PROMPT = (
+    "Summarize the following part of a Wikipedia article. "
+    "Keep names, dates and numbers: {text}"
+)
+REDUCE_PROMPT = (
+    "Combine the following summaries of consecutive parts of one Wikipedia "
+    "article into a single coherent summary: {text}"
+)
+
+# Section headings of `exsectionformat=wiki` extracts, e.g. "== History =="
+_heading = re.compile(r"^(={2,6})\s*(.+?)\s*\1\s*$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, about four characters per token"""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every event loop of the process.
+
+    `acquire` reserves tokens immediately and sleeps for the deficit, so
+    concurrent callers are queued fairly without holding the lock while waiting.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, amount: float = 1) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= min(amount, self.capacity)
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class SummaryClient:
+    """
+    Async Groq client shared by all summaries of one event loop.
+
+    Caps in-flight requests with slots shared by every summary worker loop,
+    paces requests and tokens with process-wide token buckets matched to the
+    provider limits, and retries 429, 5xx and connection errors with jittered
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        requests_bucket: TokenBucket,
+        tokens_bucket: TokenBucket,
+        slots: RequestSlots,
+        max_retries: int,
+        timeout: float,
+    ) -> None:
+        settings = get_settings()
+        self.client = groq.AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            base_url=settings.GROQ_BASE_URL or None,
+            timeout=timeout,
+            max_retries=0,
+        )
+        self.requests_bucket = requests_bucket
+        self.tokens_bucket = tokens_bucket
+        self.slots = slots
+        self.max_retries = max_retries
+
+    async def summarize(
+        self, text: str, model: Optional[str] = None, template: str = SUMMARY_PROMPT
+    ) -> str:
+        model = model or get_settings().SUMMARY_MODEL
+        prompt = template.format(text=text)
+        tokens = estimate_tokens(prompt) + COMPLETION_TOKENS_ESTIMATE
+
+        attempt = 0
+        while True:
+            async with self.slots:
+                await self.requests_bucket.acquire()
+                await self.tokens_bucket.acquire(tokens)
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=model,
+                        messages=[{"role": "user", "content": prompt}],
+                    )
+                    return response.choices[0].message.content
+                except (groq.APIStatusError, groq.APIConnectionError) as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    error = str(e)
+                    delay = _retry_delay(e, attempt)
+            attempt += 1
+            print(f"Summary request failed ({error}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return True
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    if isinstance(error, groq.APIStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    settings = get_settings()
+    cap = min(
+        settings.SUMMARY_RETRY_BACKOFF_MAX,
+        settings.SUMMARY_RETRY_BACKOFF * 2**attempt,
+    )
+    return random.uniform(0, cap)
+
+
+_limits_lock = threading.Lock()
+_limits: Optional[tuple] = None
+_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, SummaryClient]" = (
+    WeakKeyDictionary()
+)
+
+
+def _get_limits() -> tuple:
+    """Request and token buckets and in-flight slots of the whole process"""
+    global _limits
+    with _limits_lock:
+        if _limits is None:
+            settings = get_settings()
+            _limits = (
+                TokenBucket(settings.SUMMARY_REQUESTS_PER_MINUTE),
+                TokenBucket(settings.SUMMARY_TOKENS_PER_MINUTE),
+                RequestSlots(settings.SUMMARY_CONCURRENCY),
+            )
+        return _limits
+
+
+def get_summary_client() -> SummaryClient:
+    """Get the summary client bound to the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        settings = get_settings()
+        requests_bucket, tokens_bucket, slots = _get_limits()
+        client = SummaryClient(
+            requests_bucket=requests_bucket,
+            tokens_bucket=tokens_bucket,
+            slots=slots,
+            max_retries=settings.SUMMARY_MAX_RETRIES,
+            timeout=settings.SUMMARY_TIMEOUT,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_summary_client() -> None:
+    """Close the summary client bound to the running event loop, if any"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+class ChunkCache(Protocol):
+    async def get(self, content: str, model: str) -> Optional[str]: ...
+
+    async def put(self, content: str, model: str, text: str) -> None: ...
+
+
+def split_sections(text: str) -> List[Tuple[int, str]]:
+    """
+    Split an extract into (heading level, text) sections. The lead section
+    has level 1, each section text starts with its own heading line.
+    """
+    sections = []
+    level, start = 1, 0
+    for match in _heading.finditer(text):
+        if text[start : match.start()].strip():
+            sections.append((level, text[start : match.start()].strip()))
+        level, start = len(match.group(1)), match.start()
+    if text[start:].strip():
+        sections.append((level, text[start:].strip()))
+    return sections
+
+
+def _split_by_budget(text: str, budget: int) -> List[str]:
+    """Split text into pieces under the token budget, by paragraphs first"""
+    limit = budget * 4
+    pieces, current = [], ""
+    for paragraph in text.split("\n"):
+        candidate = f"{current}\n{paragraph}" if current else paragraph
+        if len(candidate) > limit and len(paragraph) <= limit:
+            pieces.append(current)
+            candidate = paragraph
+        while len(candidate) > limit:
+            pieces.append(candidate[:limit])
+            candidate = candidate[limit:]
+        current = candidate
+    pieces.append(current)
+    return [piece for piece in pieces if piece.strip()]
+
+
+def chunk_article(text: str, budget: int) -> List[str]:
+    """
+    Pack sections into chunks under the token budget.
+
+    Chunks never cross a top-level (==) section, so an edit of one section
+    changes only the chunks of that section and the other chunk summaries
+    are served from the cache.
+    """
+    groups: List[List[str]] = []
+    for level, section in split_sections(text):
+        if level <= 2 or not groups:
+            groups.append([])
+        groups[-1].append(section)
+
+    chunks = []
+    for group in groups:
+        current = ""
+        for section in group:
+            for piece in _split_by_budget(section, budget):
+                candidate = f"{current}\n\n{piece}" if current else piece
+                if current and estimate_tokens(candidate) > budget:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = candidate
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+async def _summarize_cached(
+    text: str,
+    model: str,
+    template: str,
+    chunk_cache: Optional[ChunkCache],
+) -> str:
+    cache_model = f"{model}:chunk"
+    if chunk_cache is not None:
+        summary = await chunk_cache.get(text, cache_model)
+        if summary is not None:
+            return summary
+    summary = await get_summary_client().summarize(text, model, template)
+    if chunk_cache is not None:
+        await chunk_cache.put(text, cache_model, summary)
+    return summary
+
+
+async def get_summary(
+    text: str,
+    model: Optional[str] = None,
+    chunk_cache: Optional[ChunkCache] = None,
+) -> str:
+    """
+    Summarize an article. Texts over SUMMARY_CHUNK_TOKENS are summarized
+    map-reduce: chunks by section concurrently, then the partial summaries
+    are reduced (recursively, if they are still too long) into one.
+    """
+    settings = get_settings()
+    model = model or settings.SUMMARY_MODEL
+    budget = settings.SUMMARY_CHUNK_TOKENS
+    client = get_summary_client()
 
+    if estimate_tokens(text) <= budget:
+        return await client.summarize(text, model)
 
-def get_summary(text: str) -> str:
-    client = groq.Client(api_key=get_settings().GROQ_API_KEY)
-    response = client.chat.completions.create(
-        model="gemma2-9b-it",
-        messages=[
-            {
-                "role": "user",
-                "content": f"Summarize the following text: {text}",
-            }
-        ],
+    partials = await asyncio.gather(
+        *(
+            _summarize_cached(chunk, model, CHUNK_PROMPT, chunk_cache)
+            for chunk in chunk_article(text, budget)
+        )
     )
-    return response.choices[0].message.content
+    while True:
+        combined = "\n\n".join(partials)
+        if estimate_tokens(combined) <= budget or len(partials) == 1:
+            return await client.summarize(combined, model, REDUCE_PROMPT)
+        partials = await asyncio.gather(
+            *(
+                client.summarize(piece, model, REDUCE_PROMPT)
+                for piece in _split_by_budget(combined, budget)
+            )
+        )
@@ -0,0 +1,266 @@
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Protocol
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.repositories import count_inbound_links
+from web.utils.canonical import NON_ARTICLE_PREFIXES
+from web.utils.common import TTLCache
+
+
+# Link targets that exist on almost every page and say nothing about it:
+# citation identifiers, dates, years, centuries and lists
+_maintenance_title = re.compile(
+    r".+ \(identifier\)"
+    r"|(AD )?\d{1,4}s?( BCE?| AD| CE)?"
+    r"|\d+(st|nd|rd|th) (century|millennium)( BCE?| AD| CE)?"
+    r"|(January|February|March|April|May|June|July|August|September|October"
+    r"|November|December) \d{1,2}"
+    r"|Lists? of .+"
+)
+# Shorter surface forms, like "I" or "E", match all over unrelated text
+MIN_MENTION_CHARS = 3
+
+# `== Heading ==` of the first section, the lead ends there
+_section_heading = re.compile(r"^==[^=\n].*==\s*$", re.MULTILINE)
+_disambiguator = re.compile(r"\s*\([^()]*\)$")
+_word = re.compile(r"\w+")
+
+
+def is_skipped_title(title: str) -> bool:
+    """Whether a link leads to another namespace or to a maintenance page"""
+    prefix = title.split(":", 1)[0].strip().lower() if ":" in title else None
+    if prefix in NON_ARTICLE_PREFIXES:
+        return True
+    return _maintenance_title.fullmatch(title) is not None
+
+
+class LinkScorer(Protocol):
+    async def score(self, text: str, links: Dict[str, str]) -> Dict[str, float]: ...
+
+
+class OrderScorer:
+    """Scores every link the same, so links keep the order of the page"""
+
+    async def score(self, text: str, links: Dict[str, str]) -> Dict[str, float]:
+        return {}
+
+
+class ProminenceScorer:
+    """
+    Scores links by how the page itself uses them: a mention in the lead
+    section and the number of mentions in the first `text_chars` characters.
+    Titles are matched as whole words without their disambiguator, "Python
+    (programming language)" is mentioned as "python"; surface forms shorter
+    than MIN_MENTION_CHARS are not looked for.
+    """
+
+    def __init__(
+        self, lead_weight: float, frequency_weight: float, text_chars: int
+    ) -> None:
+        self.lead_weight = lead_weight
+        self.frequency_weight = frequency_weight
+        self.text_chars = text_chars
+
+    async def score(self, text: str, links: Dict[str, str]) -> Dict[str, float]:
+        text = text[: self.text_chars].lower()
+        heading = _section_heading.search(text)
+        lead_end = heading.start() if heading else len(text)
+
+        mentions = {
+            url: _disambiguator.sub("", title).lower() for url, title in links.items()
+        }
+        positions = _mention_positions(text, set(mentions.values()))
+
+        scores = {}
+        for url, mention in mentions.items():
+            found = positions.get(mention)
+            if not found:
+                continue
+            scores[url] = self.frequency_weight * math.log1p(len(found))
+            if found[0] < lead_end:
+                scores[url] += self.lead_weight
+        return scores
+
+
+def _is_word_char(char: str) -> bool:
+    """The same characters as \\w of re"""
+    return char.isalnum() or char == "_"
+
+
+def _mention_positions(text: str, mentions: Iterable[str]) -> Dict[str, List[int]]:
+    """
+    Start positions of the whole-word, non-overlapping occurrences of every
+    mention in the text. The text is split into words once, and a mention is
+    only compared at the positions of its first word, so the cost does not
+    grow with the number of mentions times the length of the text.
+    """
+    words: Dict[str, List[int]] = {}
+    for match in _word.finditer(text):
+        words.setdefault(match.group(), []).append(match.start())
+
+    positions: Dict[str, List[int]] = {}
+    for mention in mentions:
+        first = _word.search(mention)
+        if len(mention) < MIN_MENTION_CHARS or first is None:
+            continue
+        found = []
+        end = 0
+        # Mentions may start or end in a non-word character, as in "c++"
+        for word_start in words.get(first.group(), ()):
+            start = word_start - first.start()
+            if (
+                start < end
+                or not text.startswith(mention, start)
+                or (start > 0 and _is_word_char(text[start - 1]))
+            ):
+                continue
+            stop = start + len(mention)
+            if stop < len(text) and _is_word_char(text[stop]):
+                continue
+            found.append(start)
+            end = stop
+        if found:
+            positions[mention] = found
+    return positions
+
+
+class PopularityCache:
+    """
+    Number of stored links to an article, cached per process. Misses of a
+    call are counted in one query through a session of the current event
+    loop, so the cache is shared by the API and every worker loop.
+    """
+
+    def __init__(self, max_size: int, ttl: float, cap: int) -> None:
+        self.cap = cap
+        self.cache = TTLCache(max_size, ttl)
+
+    async def get_many(self, urls: Iterable[str]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        missing: List[str] = []
+        for url in urls:
+            count = self.cache.get(url)
+            if count is None:
+                missing.append(url)
+            else:
+                counts[url] = count
+
+        if missing:
+            session_maker = SessionManager().get_session_maker()
+            async with session_maker() as session:
+                found = await count_inbound_links(session, missing, self.cap)
+            for url in missing:
+                counts[url] = found.get(url, 0)
+                self.cache.set(url, counts[url])
+        return counts
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+class PopularityScorer:
+    """Scores links by the log of their in-degree in `article_links`"""
+
+    def __init__(self, weight: float, cache: PopularityCache) -> None:
+        self.weight = weight
+        self.cache = cache
+
+    async def score(self, text: str, links: Dict[str, str]) -> Dict[str, float]:
+        counts = await self.cache.get_many(links)
+        return {url: self.weight * math.log1p(count) for url, count in counts.items()}
+
+
+class CombinedScorer:
+    """Sum of the scores of several scorers"""
+
+    def __init__(self, scorers: List[LinkScorer]) -> None:
+        self.scorers = scorers
+
+    async def score(self, text: str, links: Dict[str, str]) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for scorer in self.scorers:
+            for url, score in (await scorer.score(text, links)).items():
+                scores[url] = scores.get(url, 0.0) + score
+        return scores
+
+
+class LinkFrontier:
+    """
+    Max-priority queue of link urls, equal scores keep the page order.
+    Only the links that are actually taken are ordered: building the heap
+    is linear, and each pop costs a logarithm of the remaining links.
+    """
+
+    def __init__(self, scores: Dict[str, float]) -> None:
+        self._heap = [
+            (-score, order, url) for order, (url, score) in enumerate(scores.items())
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def pop(self, count: int) -> List[str]:
+        """Up to count best urls, best first"""
+        return [heapq.heappop(self._heap)[2] for _ in range(min(count, len(self)))]
+
+
+async def rank_links(
+    text: str, links: Dict[str, str], scorer: Optional[LinkScorer] = None
+) -> LinkFrontier:
+    """
+    Frontier of the links of a page worth crawling, keyed by url with the
+    link title as value. Other namespaces and maintenance pages are dropped.
+    """
+    links = {url: title for url, title in links.items() if not is_skipped_title(title)}
+    scores = await (scorer or get_link_scorer()).score(text, links)
+    return LinkFrontier({url: scores.get(url, 0.0) for url in links})
+
+
+_popularity_cache: Optional[PopularityCache] = None
+
+
+def get_popularity_cache() -> PopularityCache:
+    """Get the process-wide in-degree cache"""
+    global _popularity_cache
+    if _popularity_cache is None:
+        settings = get_settings()
+        _popularity_cache = PopularityCache(
+            settings.LINK_POPULARITY_CACHE_SIZE,
+            settings.LINK_POPULARITY_CACHE_TTL,
+            settings.LINK_POPULARITY_CAP,
+        )
+    return _popularity_cache
+
+
+def get_link_scorer() -> LinkScorer:
+    """
+    Scorer built from LINK_SCORERS, a comma separated list of "prominence"
+    and "popularity"; "order" or an empty list keeps the page order.
+    """
+    settings = get_settings()
+    scorers: List[LinkScorer] = []
+    for name in settings.LINK_SCORERS.split(","):
+        name = name.strip()
+        if name == "prominence":
+            scorers.append(
+                ProminenceScorer(
+                    settings.LINK_LEAD_WEIGHT,
+                    settings.LINK_FREQUENCY_WEIGHT,
+                    settings.LINK_TEXT_CHARS,
+                )
+            )
+        elif name == "popularity":
+            scorers.append(
+                PopularityScorer(
+                    settings.LINK_POPULARITY_WEIGHT, get_popularity_cache()
+                )
+            )
+        elif name not in ("order", ""):
+            raise ValueError(f"Unknown link scorer '{name}'")
+    if not scorers:
+        return OrderScorer()
+    return scorers[0] if len(scorers) == 1 else CombinedScorer(scorers)
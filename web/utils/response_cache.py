@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import json
+from typing import Iterable, Optional
+from weakref import WeakKeyDictionary
+
+from web.config.utils import get_settings
+from web.utils.common import TTLCache
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # the shared tier needs the redis extra
+    redis_asyncio = None
+
+
+KEY_PREFIX = "summary-response:"
+
+
+def get_etag(body: dict) -> str:
+    """Strong ETag of a JSON response body"""
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the ETag, weak comparison"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
+class SummaryResponseCache:
+    """
+    Cache of GET /summary responses keyed by article url.
+
+    The in-process LRU tier answers hot urls without touching Postgres.
+    When REDIS_URL is set and `redis` is installed, a shared tier lets
+    replicas reuse each other's responses. Entries are dropped from both
+    tiers when a summary is written or deleted; only found summaries are
+    cached, so a new summary is visible at once.
+
+    An invalidation only reaches the memory tier of the writing process, so
+    with a shared tier the memory tier keeps entries for `memory_ttl`
+    seconds at most: other replicas serve a changed summary for no longer
+    than that.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        redis_url: str = "",
+        memory_ttl: Optional[float] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.redis_url = redis_url if redis_asyncio is not None else ""
+        if self.redis_url and memory_ttl is not None:
+            memory_ttl = min(ttl, memory_ttl)
+        else:
+            memory_ttl = ttl
+        self.memory = TTLCache(max_size=max_size, ttl=memory_ttl)
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self._clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = (
+            WeakKeyDictionary()
+        )
+
+    def _get_client(self):
+        """Redis client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = redis_asyncio.from_url(self.redis_url)
+            self._clients[loop] = client
+        return client
+
+    async def get(self, url: str) -> Optional[dict]:
+        """Cached entry with `body` and `etag`, or None"""
+        entry = self.memory.get(url)
+        if entry is not None or not self.redis_url:
+            return entry
+
+        try:
+            payload = await self._get_client().get(KEY_PREFIX + url)
+        except Exception as e:
+            print(f"Shared response cache is unavailable: {str(e)}")
+            return None
+        if payload is None:
+            self.shared_misses += 1
+            return None
+        self.shared_hits += 1
+        entry = json.loads(payload)
+        self.memory.set(url, entry)
+        return entry
+
+    async def set(self, url: str, body: dict) -> dict:
+        entry = {"body": body, "etag": get_etag(body)}
+        self.memory.set(url, entry)
+        if self.redis_url:
+            try:
+                await self._get_client().set(
+                    KEY_PREFIX + url, json.dumps(entry), ex=int(self.ttl)
+                )
+            except Exception as e:
+                print(f"Shared response cache is unavailable: {str(e)}")
+        return entry
+
+    async def invalidate(self, urls: Iterable[str]) -> None:
+        urls = list(urls)
+        for url in urls:
+            self.memory.delete(url)
+        if self.redis_url and urls:
+            try:
+                await self._get_client().delete(*(KEY_PREFIX + url for url in urls))
+            except Exception as e:
+                print(f"Shared response cache is unavailable: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the shared tier client of the running event loop, if any"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "shared_enabled": bool(self.redis_url),
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+        }
+
+
+_summary_response_cache: Optional[SummaryResponseCache] = None
+
+
+def get_summary_response_cache() -> SummaryResponseCache:
+    """Get the process-wide GET /summary response cache"""
+    global _summary_response_cache
+    if _summary_response_cache is None:
+        settings = get_settings()
+        _summary_response_cache = SummaryResponseCache(
+            max_size=settings.SUMMARY_RESPONSE_CACHE_SIZE,
+            ttl=settings.SUMMARY_RESPONSE_CACHE_TTL,
+            redis_url=settings.REDIS_URL,
+            memory_ttl=settings.SUMMARY_RESPONSE_MEMORY_TTL,
+        )
+    return _summary_response_cache
@@ -0,0 +1,158 @@
+import hashlib
+import re
+import time
+import unicodedata
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import SummaryCacheStorage
+from web.utils.common import TTLCache
+
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """Normalize unicode and whitespace so that cosmetic changes keep the same key"""
+    return _whitespace.sub(" ", unicodedata.normalize("NFC", content)).strip()
+
+
+def get_cache_key(content: str, model: str) -> str:
+    """Content address of a summary: sha256 of the model and the normalized text"""
+    digest = hashlib.sha256()
+    digest.update(model.encode())
+    digest.update(b"\0")
+    digest.update(normalize_content(content).encode())
+    return digest.hexdigest()
+
+
+@asynccontextmanager
+async def _use_session(session: Optional[AsyncSession]) -> AsyncIterator[AsyncSession]:
+    if session is not None:
+        yield session
+        return
+    async with SessionManager().get_session_maker()() as own_session:
+        yield own_session
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache keyed by content hash and model.
+
+    The in-process LRU tier answers repeated content without a query,
+    the Postgres tier is shared by all replicas and survives restarts.
+    Entries of both tiers expire after `ttl` seconds.
+
+    Methods use the given session or open their own, so the cache can also
+    be handed to the chunked summarization pipeline.
+    """
+
+    def __init__(self, max_size: int, ttl: float, purge_interval: float) -> None:
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self.memory = TTLCache(max_size=max_size, ttl=ttl)
+        self.db_hits = 0
+        self.db_misses = 0
+        self._last_purge = 0.0
+
+    async def get(
+        self, content: str, model: str, session: Optional[AsyncSession] = None
+    ) -> Optional[str]:
+        key = get_cache_key(content, model)
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        query = (
+            update(SummaryCacheStorage)
+            .where(
+                SummaryCacheStorage.key == key,
+                SummaryCacheStorage.created_at
+                > func.now() - timedelta(seconds=self.ttl),
+            )
+            .values(hits=SummaryCacheStorage.hits + 1, last_hit_at=func.now())
+            .returning(SummaryCacheStorage.text)
+        )
+        async with _use_session(session) as session:
+            text = await session.scalar(query)
+            await session.commit()
+
+        if text is None:
+            self.db_misses += 1
+            return None
+
+        self.db_hits += 1
+        self.memory.set(key, text)
+        return text
+
+    async def put(
+        self,
+        content: str,
+        model: str,
+        text: str,
+        session: Optional[AsyncSession] = None,
+    ) -> None:
+        key = get_cache_key(content, model)
+        self.memory.set(key, text)
+
+        query = (
+            insert(SummaryCacheStorage)
+            .values(key=key, model_used=model, text=text)
+            .on_conflict_do_update(
+                index_elements=[SummaryCacheStorage.key],
+                set_={"text": text, "created_at": func.now()},
+            )
+        )
+        async with _use_session(session) as session:
+            await session.execute(query)
+            await session.commit()
+            await self._purge_expired(session)
+
+    async def _purge_expired(self, session: AsyncSession) -> None:
+        """Delete expired rows, at most once per purge interval"""
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+
+        query = delete(SummaryCacheStorage).where(
+            SummaryCacheStorage.created_at < func.now() - timedelta(seconds=self.ttl)
+        )
+        await session.execute(query)
+        await session.commit()
+
+    def stats(self) -> dict:
+        db_total = self.db_hits + self.db_misses
+        memory = self.memory.stats()
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + self.db_hits
+        return {
+            "memory": memory,
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+            "db_hit_rate": round(self.db_hits / db_total, 4) if db_total else 0.0,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get the process-wide summary cache"""
+    global _summary_cache
+    if _summary_cache is None:
+        settings = get_settings()
+        _summary_cache = SummaryCache(
+            max_size=settings.SUMMARY_CACHE_SIZE,
+            ttl=settings.SUMMARY_CACHE_TTL,
+            purge_interval=settings.SUMMARY_CACHE_PURGE_INTERVAL,
+        )
+    return _summary_cache
@@ -0,0 +1,423 @@
+import argparse
+import asyncio
+import bz2
+import io
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from xml.etree import ElementTree
+
+from sqlalchemy import TEXT, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.utils import get_settings
+from web.db.connection.session import SessionManager
+from web.db.models import ArticleContentStorage, ArticleLinkStorage, ArticleStorage
+from web.db.repositories import (
+    BulkLoader,
+    bulk_load_stats,
+    load_content,
+    save_contents,
+    url_matches,
+)
+from web.db.repositories.article import links_loader
+from web.utils.canonical import DEFAULT_LANG, NON_ARTICLE_PREFIXES, get_lang
+from web.utils.wikiparse import WikiPage, get_article_url, parse_timestamp
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# (title, revision id, timestamp, wikitext) of an article in the dump
+PageRecord = Tuple[str, Optional[int], Optional[str], str]
+
+_comment = re.compile(r"<!--.*?-->", re.DOTALL)
+_ref = re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_block_tags = re.compile(
+    r"<(gallery|math|score|syntaxhighlight|timeline)[^>]*>.*?</\1>",
+    re.DOTALL | re.IGNORECASE,
+)
+_tag = re.compile(r"<[^>]+>")
+_template = re.compile(r"\{\{[^{}]*\}\}")
+_table = re.compile(r"\{\|[^{}]*?\|\}", re.DOTALL)
+_media_link = re.compile(
+    r"\[\[(?:file|image|category):(?:[^\[\]]|\[\[[^\[\]]*\]\])*\]\]", re.IGNORECASE
+)
+_link = re.compile(r"\[\[([^\[\]|]+)(?:\|([^\[\]]*))?\]\]")
+_external_link = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+_emphasis = re.compile(r"'{2,}")
+_magic_word = re.compile(r"__[A-Z]+__")
+_list_marker = re.compile(r"^[*#:;]+\s*", re.MULTILINE)
+_spaces = re.compile(r"[ \t]{2,}")
+_blank_lines = re.compile(r"\n{3,}")
+_interwiki = re.compile(r"[a-z]{2,3}(-[a-z]+)?")
+
+
+def _strip_nested(pattern: re.Pattern, wikitext: str) -> str:
+    """Remove nested constructs innermost first, e.g. templates in templates"""
+    while True:
+        wikitext, count = pattern.subn("", wikitext)
+        if not count:
+            return wikitext
+
+
+def _link_title(target: str) -> Optional[str]:
+    """Normalize a link target to an article title, None for other namespaces"""
+    target = target.split("#")[0].replace("_", " ").strip()
+    if not target:
+        return None
+    if ":" in target:
+        prefix = target.split(":", 1)[0].strip().lower()
+        if prefix in NON_ARTICLE_PREFIXES or _interwiki.fullmatch(prefix):
+            return None
+    return target[0].upper() + target[1:]
+
+
+def wikitext_to_text(wikitext: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Convert wikitext to plain text and the list of linked article titles.
+    Section headings are kept in the `== Heading ==` form of `exsectionformat=wiki`
+    extracts, so dump and API texts are chunked for summaries the same way.
+    """
+    wikitext = _comment.sub("", wikitext)
+    wikitext = _ref.sub("", wikitext)
+    wikitext = _block_tags.sub("", wikitext)
+    wikitext = _strip_nested(_template, wikitext)
+    wikitext = _strip_nested(_table, wikitext)
+    wikitext = _media_link.sub("", wikitext)
+
+    links: Dict[str, None] = {}
+
+    def replace_link(match: re.Match) -> str:
+        title = _link_title(match.group(1))
+        if title is None:
+            return ""
+        links[title] = None
+        label = match.group(2)
+        return label if label is not None else match.group(1).split("#")[0]
+
+    wikitext = _link.sub(replace_link, wikitext)
+    wikitext = _external_link.sub(r"\1", wikitext)
+    wikitext = _tag.sub("", wikitext)
+    wikitext = _emphasis.sub("", wikitext)
+    wikitext = _magic_word.sub("", wikitext)
+    wikitext = _list_marker.sub("", wikitext)
+    wikitext = _spaces.sub(" ", wikitext)
+    wikitext = _blank_lines.sub("\n\n", wikitext)
+    return wikitext.strip(), tuple(links)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find(element: ElementTree.Element, name: str) -> Optional[ElementTree.Element]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child
+    return None
+
+
+def _page_record(page: ElementTree.Element) -> Optional[PageRecord]:
+    """Pick the fields of a main namespace, non redirect <page> element"""
+    ns = _find(page, "ns")
+    if ns is None or ns.text != "0" or _find(page, "redirect") is not None:
+        return None
+    title = _find(page, "title")
+    revision = _find(page, "revision")
+    if title is None or revision is None:
+        return None
+    revision_id = _find(revision, "id")
+    timestamp = _find(revision, "timestamp")
+    wikitext = _find(revision, "text")
+    return (
+        title.text,
+        int(revision_id.text) if revision_id is not None else None,
+        timestamp.text if timestamp is not None else None,
+        (wikitext.text or "") if wikitext is not None else "",
+    )
+
+
+def _iter_records(dump: io.BufferedIOBase) -> Iterator[PageRecord]:
+    """
+    Stream <page> elements with iterparse in constant memory: every page is
+    cleared from the tree as soon as its fields are read.
+    """
+    context = ElementTree.iterparse(dump, events=("start", "end"))
+    _, root = next(context)
+    for event, element in context:
+        if event == "end" and _local_name(element.tag) == "page":
+            record = _page_record(element)
+            if record is not None:
+                yield record
+            root.clear()
+
+
+def dump_lang(path: str) -> str:
+    """Language edition of a dump from its file name, e.g. enwiki-latest-..."""
+    match = re.match(r"([a-z][a-z0-9_]*?)wiki-", os.path.basename(path))
+    return match.group(1).replace("_", "-") if match else DEFAULT_LANG
+
+
+def _convert(records: List[PageRecord], lang: str = DEFAULT_LANG) -> List[WikiPage]:
+    pages = []
+    for title, revision_id, timestamp, wikitext in records:
+        content, links = wikitext_to_text(wikitext)
+        if content:
+            pages.append(
+                WikiPage(
+                    title=title,
+                    url=get_article_url(title, lang),
+                    text=content,
+                    links=links,
+                    revision_id=revision_id,
+                    last_modified=parse_timestamp(timestamp),
+                )
+            )
+    return pages
+
+
+def _parse_stream(job: Tuple[str, str, int, int]) -> List[WikiPage]:
+    """Decompress and parse one bz2 stream of a multistream dump"""
+    path, lang, start, end = job
+    with open(path, "rb") as dump:
+        dump.seek(start)
+        data = bz2.decompress(dump.read(end - start))
+    data = data.replace(b"</mediawiki>", b"")
+    records = _iter_records(io.BytesIO(b"<pages>" + data + b"</pages>"))
+    return _convert(list(records), lang)
+
+
+def _stream_ranges(path: str, index_path: str) -> Iterator[Tuple[int, int]]:
+    """
+    Byte ranges of the page streams of a multistream dump, read from its
+    `offset:page_id:title` index. The first stream holds only <siteinfo>
+    and is skipped because it is not in the index.
+    """
+    offsets = set()
+    with bz2.open(index_path, "rt", encoding="utf-8") as index:
+        for line in index:
+            offsets.add(int(line.split(":", 1)[0]))
+    offsets = sorted(offsets)
+    ends = offsets[1:] + [os.path.getsize(path)]
+    return zip(offsets, ends)
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _bounded_map(
+    pool: Executor, func: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[R]:
+    """Executor.map that keeps at most `window` jobs in flight, in order"""
+    futures: deque = deque()
+    for item in items:
+        futures.append(pool.submit(func, item))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def iter_dump_pages(
+    path: str,
+    index_path: Optional[str] = None,
+    processes: Optional[int] = None,
+    batch_size: int = 500,
+) -> Iterator[WikiPage]:
+    """
+    Stream the articles of a `pages-articles.xml.bz2` dump.
+
+    With the index of a multistream dump every bz2 stream is decompressed
+    and parsed in a separate process. Otherwise the file is decompressed as
+    one stream and only the wikitext conversion runs in the process pool.
+    """
+    processes = processes or os.cpu_count() or 1
+    window = 2 * processes
+    lang = dump_lang(path)
+    with ProcessPoolExecutor(processes) as pool:
+        if index_path:
+            jobs = (
+                (path, lang, start, end)
+                for start, end in _stream_ranges(path, index_path)
+            )
+            results = _bounded_map(pool, _parse_stream, jobs, window)
+            yield from chain.from_iterable(results)
+        else:
+            with bz2.open(path, "rb") as dump:
+                batches = _batched(_iter_records(dump), batch_size)
+                convert = partial(_convert, lang=lang)
+                results = _bounded_map(pool, convert, batches, window)
+                yield from chain.from_iterable(results)
+
+
+# Articles already stored by a crawl keep their content
+dump_articles_loader = BulkLoader(
+    ArticleStorage.__table__,
+    columns=["url", "title", "status", "revision_id", "last_modified"],
+    conflict=["url"],
+    update=["title", "revision_id", "last_modified"],
+    where="articles.status = 'imported'",
+)
+
+
+async def _copy_pages(session: AsyncSession, pages: List[WikiPage]) -> None:
+    """Bulk load a batch of pages into `articles` and `article_links`"""
+    # A batch comes from one dump, so all its pages share a language edition
+    lang = get_lang(pages[0].url)
+    # The loader starts the session transaction before its COPY, so the
+    # staged rows survive until they are merged
+    await dump_articles_loader.load(
+        session,
+        (
+            (page.url, page.title, "imported", page.revision_id, page.last_modified)
+            for page in pages
+        ),
+    )
+    urls = [page.url for page in pages]
+    query = select(
+        ArticleStorage.url, ArticleStorage.id, ArticleStorage.status
+    ).where(ArticleStorage.url == any_(bindparam("urls", urls, type_=ARRAY(TEXT))))
+    rows = (await session.execute(query)).all()
+    article_ids = {url: article_id for url, article_id, _ in rows}
+    imported = {url for url, _, status in rows if status == "imported"}
+
+    stored_pages = [page for page in pages if page.url in article_ids]
+    if len(stored_pages) < len(pages):
+        print(
+            f"Skipped {len(pages) - len(stored_pages)} dump pages "
+            f"missing from articles after the copy"
+        )
+    await save_contents(
+        session,
+        {
+            article_ids[page.url]: page.text
+            for page in stored_pages
+            if page.url in imported
+        },
+    )
+    await links_loader.load(
+        session,
+        (
+            (article_ids[page.url], get_article_url(title, lang), title, False)
+            for page in stored_pages
+            for title in page.links
+        ),
+    )
+
+
+async def load_dump(
+    path: str,
+    index_path: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    processes: Optional[int] = None,
+) -> int:
+    """
+    Import a dump into `articles` (status "imported") and `article_links`
+    with the COPY bulk loader, one transaction per batch. Parsing runs in a
+    thread and the process pool while the previous batch is copied.
+    Returns the number of pages.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.DUMP_BATCH_SIZE
+    processes = processes or settings.DUMP_PROCESSES or None
+    batches = _batched(
+        iter_dump_pages(path, index_path, processes, batch_size), batch_size
+    )
+    session_maker = SessionManager().get_session_maker()
+
+    total, started_at = 0, time.monotonic()
+    while batch := await asyncio.to_thread(next, batches, None):
+        async with session_maker() as session:
+            await _copy_pages(session, batch)
+            await session.commit()
+        total += len(batch)
+        rate = total / (time.monotonic() - started_at)
+        print(f"Imported {total} pages from {path} ({rate:.0f} pages/s)")
+
+    for stats in bulk_load_stats():
+        print(
+            f"Loaded {stats['rows']} rows into {stats['table']} "
+            f"({stats['rows_per_second']:.0f} rows/s)"
+        )
+
+    await SessionManager().dispose()
+    return total
+
+
+class DumpSource:
+    """
+    Page source of the crawler backed by articles and links imported from
+    a dump, so a crawl from a root runs without any network I/O.
+    """
+
+    def __init__(self) -> None:
+        self.session_maker = SessionManager().get_session_maker()
+
+    async def fetch_page(self, url: str) -> Optional[WikiPage]:
+        async with self.session_maker() as session:
+            query = select(
+                ArticleStorage.id,
+                ArticleStorage.title,
+                ArticleStorage.revision_id,
+                ArticleStorage.last_modified,
+            ).where(url_matches(url))
+            row = (await session.execute(query)).first()
+            content = row and await load_content(session, row.id)
+            if not content:
+                return None
+            links_query = (
+                select(ArticleLinkStorage.target_title)
+                .where(ArticleLinkStorage.source_article_id == row.id)
+                .order_by(ArticleLinkStorage.target_title)
+            )
+            links = await session.scalars(links_query)
+            return WikiPage(
+                title=row.title,
+                url=url,
+                text=content,
+                links=tuple(title for title in links if title),
+                revision_id=row.revision_id,
+                last_modified=row.last_modified,
+            )
+
+    async def resolve_articles(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        async with self.session_maker() as session:
+            query = (
+                select(ArticleStorage.url)
+                .join(ArticleContentStorage)
+                .where(
+                    ArticleStorage.url
+                    == any_(bindparam("urls", urls, type_=ARRAY(TEXT)))
+                )
+            )
+            stored = set(await session.scalars(query))
+        return {url: url if url in stored else None for url in urls}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a Wikipedia XML dump")
+    parser.add_argument("path", help="pages-articles(-multistream).xml.bz2 file")
+    parser.add_argument("--index", help="multistream index file (.txt.bz2)")
+    parser.add_argument("--batch-size", type=int, help="pages per transaction")
+    parser.add_argument("--processes", type=int, help="parser processes")
+    args = parser.parse_args()
+    asyncio.run(load_dump(args.path, args.index, args.batch_size, args.processes))
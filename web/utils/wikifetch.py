@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from web.config.utils import get_settings
+from web.utils.common import RequestSlots
+
+
+USER_AGENT = "Wikipedia Parser (example@example.com)"
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to a single host to at most `rate` requests per second,
+    across every event loop of the process.
+
+    `wait` reserves the next slot under a thread lock and sleeps outside of it,
+    like `groq_summary.TokenBucket`.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FetchLimits:
+    """Process-wide cap on in-flight requests and per-host request rates"""
+
+    def __init__(self, concurrency: int, rate_per_host: float) -> None:
+        self.slots = RequestSlots(concurrency)
+        self.rate_per_host = rate_per_host
+        self._limiters: Dict[str, HostRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get_limiter(self, url: str) -> HostRateLimiter:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = HostRateLimiter(self.rate_per_host)
+            return self._limiters[host]
+
+
+class WikiFetcher:
+    """
+    Asyncio HTTP fetcher for the MediaWiki API.
+
+    One instance per event loop owns a keep-alive connection pool. The cap on
+    in-flight requests and the per-host rate limits are shared by the fetchers
+    of all loops, so worker threads do not multiply the configured rate.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        limits: FetchLimits,
+        timeout: float = 30.0,
+    ) -> None:
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+            ),
+        )
+        self.limits = limits
+
+    async def get_json(self, url: str, params: dict) -> dict:
+        async with self.limits.slots:
+            await self.limits.get_limiter(url).wait()
+            response = await self.client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_fetch_limits: Optional[FetchLimits] = None
+_fetch_limits_lock = threading.Lock()
+
+
+def get_fetch_limits() -> FetchLimits:
+    """Get the process-wide request limits"""
+    global _fetch_limits
+    with _fetch_limits_lock:
+        if _fetch_limits is None:
+            settings = get_settings()
+            _fetch_limits = FetchLimits(
+                concurrency=settings.WIKI_FETCH_CONCURRENCY,
+                rate_per_host=settings.WIKI_RATE_LIMIT_PER_HOST,
+            )
+        return _fetch_limits
+
+
+_fetchers: "WeakKeyDictionary[asyncio.AbstractEventLoop, WikiFetcher]" = (
+    WeakKeyDictionary()
+)
+
+
+def get_fetcher() -> WikiFetcher:
+    """Get the fetcher bound to the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    fetcher: Optional[WikiFetcher] = _fetchers.get(loop)
+    if fetcher is None:
+        fetcher = WikiFetcher(
+            concurrency=get_settings().WIKI_FETCH_CONCURRENCY,
+            limits=get_fetch_limits(),
+        )
+        _fetchers[loop] = fetcher
+    return fetcher
+
+
+async def close_fetcher() -> None:
+    """Close the fetcher bound to the running event loop, if any"""
+    fetcher = _fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        await fetcher.close()
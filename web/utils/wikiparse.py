@@ -1,82 +1,281 @@
-from typing import Optional, Dict, List
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, List, Tuple
 
-import wikipediaapi
+from web.utils.canonical import (
+    DEFAULT_LANG,
+    WIKIPEDIA_API_URL,
+    WikiKey,
+    get_canonical_keys,
+    get_lang,
+    normalize_title,
+    parse_url,
+)
+from web.utils.link_rank import rank_links
+from web.utils.wikifetch import get_fetcher
+
+
+# MediaWiki accepts up to 50 titles per query for regular clients
+TITLES_PER_QUERY = 50
+
+
+@dataclass(frozen=True)
+class WikiPage:
+    """Immutable snapshot of a Wikipedia page: title, plain text and outgoing links"""
+
+    title: str
+    url: str
+    text: str
+    links: Tuple[str, ...]
+    revision_id: Optional[int] = None
+    last_modified: Optional[datetime] = None
 
 
 def get_article_name(url: str) -> str:
     """Extract article name from Wikipedia URL"""
-    return url.split("/wiki/")[-1]
+    key = parse_url(url)
+    return key.title if key else url.split("/wiki/")[-1]
 
 
-def _get_wikipedia_client() -> wikipediaapi.Wikipedia:
-    """Get a configured Wikipedia API client"""
-    return wikipediaapi.Wikipedia(
-        user_agent="Wikipedia Parser (example@example.com)", language="en"
-    )
+def get_article_url(title: str, lang: str = DEFAULT_LANG) -> str:
+    """Build the canonical Wikipedia URL for an article title"""
+    return WikiKey(lang, normalize_title(title)).url
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a MediaWiki ISO 8601 timestamp, e.g. 2024-01-31T12:00:00Z"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _page_query_params(article_name: str) -> dict:
+    """
+    Query params that return the extract, the link list and the current
+    revision of a page in one call.
+    Links are paginated by MediaWiki, so pages with more than 500 links
+    need extra `plcontinue` requests.
+    """
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "redirects": 1,
+        "titles": article_name,
+        "prop": "extracts|links|info",
+        "explaintext": 1,
+        "exsectionformat": "wiki",
+        "plnamespace": 0,
+        "pllimit": "max",
+    }
+
+
+async def fetch_page(url: str) -> Optional[WikiPage]:
+    """Fetch title, text and links of a Wikipedia article in a single request"""
+    lang = get_lang(url)
+    api_url = WIKIPEDIA_API_URL.format(lang=lang)
+    params = _page_query_params(get_article_name(url))
+    fetcher = get_fetcher()
 
+    title, text, links, info = None, "", [], {}
+    while True:
+        data = await fetcher.get_json(api_url, params)
 
-def _get_page(url: str) -> Optional[wikipediaapi.WikipediaPage]:
-    """Get Wikipedia page object for a given URL"""
-    article_name = get_article_name(url)
-    wiki_wiki = _get_wikipedia_client()
-    page = wiki_wiki.page(article_name)
+        pages = data.get("query", {}).get("pages", [])
+        if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+            return None
+
+        page = pages[0]
+        title = page["title"]
+        text = page.get("extract") or text
+        if not info:
+            info = {key: page[key] for key in ("lastrevid", "touched") if key in page}
+        links.extend(link["title"] for link in page.get("links", []))
+
+        if "continue" not in data:
+            break
+        params = {**params, **data["continue"]}
 
-    if not page.text:
+    if not text:
         return None
 
-    return page
+    page_url = get_article_url(title, lang)
+    get_canonical_keys().remember_redirect(url, page_url)
+    return WikiPage(
+        title=title,
+        url=page_url,
+        text=text,
+        links=tuple(links),
+        revision_id=info.get("lastrevid"),
+        last_modified=parse_timestamp(info.get("touched")),
+    )
+
+
+async def _query_pages(urls: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    Resolve many articles with `prop=info|pageprops` queries of TITLES_PER_QUERY
+    titles each: no extracts or links are downloaded. Title normalization and
+    redirects are followed, so each requested url maps to the page object of
+    its target article, or None when the article does not exist. Urls of
+    different language editions are queried against their own API.
+    """
+    by_lang: Dict[str, List[str]] = {}
+    for url in dict.fromkeys(urls):
+        by_lang.setdefault(get_lang(url), []).append(url)
+    fetcher = get_fetcher()
+
+    async def fetch_batch(lang: str, batch: List[str]) -> Dict[str, Optional[dict]]:
+        names = {get_article_name(url): url for url in batch}
+        data = await fetcher.get_json(
+            WIKIPEDIA_API_URL.format(lang=lang),
+            {
+                "action": "query",
+                "format": "json",
+                "formatversion": 2,
+                "redirects": 1,
+                "prop": "info|pageprops",
+                "ppprop": "disambiguation",
+                "titles": "|".join(names),
+            },
+        )
+        query = data.get("query", {})
+        pages = {
+            page["title"]: page
+            for page in query.get("pages", [])
+            if not page.get("missing") and not page.get("invalid")
+        }
+        renames = {
+            item["from"]: item["to"]
+            for key in ("normalized", "redirects")
+            for item in query.get(key, [])
+        }
 
+        result = {}
+        for name, url in names.items():
+            title = name
+            for _ in range(len(renames) + 1):
+                if title not in renames:
+                    break
+                title = renames[title]
+            result[url] = pages.get(title)
+        return result
 
-def get_article_text(url: str) -> Optional[str]:
+    batches = await asyncio.gather(
+        *(
+            fetch_batch(lang, lang_urls[start : start + TITLES_PER_QUERY])
+            for lang, lang_urls in by_lang.items()
+            for start in range(0, len(lang_urls), TITLES_PER_QUERY)
+        )
+    )
+    return {url: page for batch in batches for url, page in batch.items()}
+
+
+async def fetch_revisions(urls: Iterable[str]) -> Dict[str, Optional[int]]:
+    """
+    Get the current revision id of many articles, keyed by the requested url.
+    Missing articles map to None.
+    """
+    pages = await _query_pages(urls)
+    return {url: page and page.get("lastrevid") for url, page in pages.items()}
+
+
+async def resolve_articles(urls: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Map requested urls to the canonical url of the article behind them.
+    Redirects are replaced by their target; missing pages, disambiguation
+    pages and non-article namespaces map to None, so no body is downloaded
+    for them.
+    """
+    pages = await _query_pages(urls)
+    canonical_keys = get_canonical_keys()
+    result = {}
+    for url, page in pages.items():
+        if not _is_article(page):
+            result[url] = None
+            continue
+        result[url] = get_article_url(page["title"], get_lang(url))
+        canonical_keys.remember_redirect(url, result[url])
+    return result
+
+
+def _is_article(page: Optional[dict]) -> bool:
+    return (
+        page is not None
+        and page.get("ns", 0) == 0
+        and "disambiguation" not in page.get("pageprops", {})
+    )
+
+
+class WikipediaSource:
+    """Page source of the crawler backed by the live MediaWiki API"""
+
+    fetch_page = staticmethod(fetch_page)
+    resolve_articles = staticmethod(resolve_articles)
+
+
+async def get_article_text(url: str) -> Optional[str]:
     """Get the text content of a Wikipedia article"""
-    page = _get_page(url)
+    page = await fetch_page(url)
     return page.text if page else None
 
 
-def get_article_title(url: str) -> Optional[str]:
+async def get_article_title(url: str) -> Optional[str]:
     """Get the title of a Wikipedia article"""
-    page = _get_page(url)
+    page = await fetch_page(url)
     return page.title if page else None
 
 
-def get_linked_articles(url: str, max_links: int = 5) -> List[Dict[str, str]]:
-    """Get linked articles from a Wikipedia page"""
-    page = _get_page(url)
-    if not page:
-        return []
-
-    linked_articles = []
-    i = 0
-    for title, linked_page in page.links.items():
-        if i >= max_links:
-            break
+async def get_linked_articles(page: WikiPage, max_links: int = 5) -> List[WikiPage]:
+    """
+    Get linked articles from an already fetched Wikipedia page.
+    Links are taken best first from the frontier of rank_links, so the
+    budget is not spent on maintenance pages and the alphabetical order of
+    the API does not decide which links are followed.
+    They are resolved TITLES_PER_QUERY at a time first, so missing,
+    disambiguation and duplicate redirect targets are dropped without
+    downloading them. The rest are downloaded concurrently, in windows of
+    the still missing count, so empty pages are replaced by the next links.
+    """
+    linked_articles: List[WikiPage] = []
+    seen = {page.url}
+    lang = get_lang(page.url)
+    frontier = await rank_links(
+        page.text, {get_article_url(title, lang): title for title in page.links}
+    )
+    while frontier and len(linked_articles) < max_links:
+        batch = frontier.pop(TITLES_PER_QUERY)
+        resolved = await resolve_articles(batch)
+        targets = []
+        for url in batch:
+            target = resolved.get(url)
+            if target is not None and target not in seen:
+                seen.add(target)
+                targets.append(target)
 
-        if linked_page.text:
-            linked_articles.append(
-                {
-                    "title": title,
-                    "url": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
-                    "content": linked_page.text,
-                }
+        while targets and len(linked_articles) < max_links:
+            window = targets[: max_links - len(linked_articles)]
+            targets = targets[len(window) :]
+            linked_pages = await asyncio.gather(*(fetch_page(url) for url in window))
+            linked_articles.extend(
+                linked_page for linked_page in linked_pages if linked_page
             )
-            i += 1
 
     return linked_articles
 
 
-def parse_article(url: str) -> Optional[dict[str, str]]:
+async def parse_article(url: str) -> Optional[dict[str, str]]:
     """
     Parse a Wikipedia article and return a dictionary with title and content.
     This function is kept for backward compatibility but uses the new structure.
     """
-    page = _get_page(url)
+    page = await fetch_page(url)
     if not page:
         return None
 
     pages = {page.title: page.text}
 
-    linked_articles = get_linked_articles(url, max_links=5)
-    for article in linked_articles:
-        pages[article["title"]] = article["content"]
+    for article in await get_linked_articles(page, max_links=5):
+        pages[article.title] = article.text
 
     return pages